@@ -0,0 +1,92 @@
+"""
+Import a directory of TSV/XLSX question files into the SQLite database without the GUI.
+
+    python scripts/batch_import.py --subject Physics --db question_bank.db incoming/
+        [--workers 4] [--batch-size 5000] [--recursive] [--dry-run]
+
+Files are parsed in parallel and written one transaction per batch. Existing
+rows are skipped as duplicates, so the import can be re-run safely, and source
+files are left in place. Exits with status 1 if any file failed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services.batch_import import (  # noqa: E402
+    DEFAULT_BATCH_SIZE,
+    discover_import_files,
+    run_batch_import,
+)
+from services.db_service import DatabaseService  # noqa: E402
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Batch-import TSV/XLSX question files.")
+    parser.add_argument("paths", nargs="+", type=Path, help="Files or directories to import")
+    parser.add_argument("--subject", required=True, help="Subject to import into, e.g. Physics")
+    parser.add_argument("--db", type=Path, required=True, help="Path to question_bank.db")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=min(4, os.cpu_count() or 1),
+        help="Parser processes (1 parses in the main process)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Rows per transaction; files are never split (default: {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument("--recursive", action="store_true", help="Also search subdirectories")
+    parser.add_argument("--dry-run", action="store_true", help="Validate and report duplicates without writing")
+    return parser
+
+
+def _progress(label: str, ok: bool, message: str) -> None:
+    print(f"{'OK ' if ok else 'ERR'} {label}: {message}", flush=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    if not args.db.is_file():
+        parser.error(f"database not found: {args.db}")
+
+    paths = discover_import_files(args.paths, recursive=args.recursive)
+    if not paths:
+        print("No .tsv or .xlsx files found.")
+        return 0
+
+    db = DatabaseService(args.db)
+    try:
+        stats = run_batch_import(
+            db,
+            args.subject,
+            paths,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run,
+            progress_callback=_progress,
+        )
+    finally:
+        db.close()
+
+    action = "Validated" if stats["dry_run"] else "Imported"
+    print(
+        f"{action} {stats['rows']} rows from {stats['files']} files ({stats['units']} sheets/files) "
+        f"in {stats['elapsed']:.1f}s ({stats['rows_per_sec']:.0f} rows/sec). "
+        f"Inserted {stats['inserted']}, duplicates {stats['duplicates']}, errors {stats['errors']}."
+    )
+    for label, message in stats["failures"]:
+        print(f"  {label}: {message}")
+    return 1 if stats["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
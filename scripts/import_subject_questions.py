@@ -0,0 +1,105 @@
+"""
+Import a subject's question workbook (.xlsx) into the SQLite database.
+
+    python scripts/import_subject_questions.py Physics --db PATH [--workbook PATH]
+        [--magazine NAME] [--chunk-size 1000]
+
+Worksheets are streamed with openpyxl in read-only mode, so memory use does
+not grow with workbook size. Columns are found with the same header matching
+as TSV imports, editions are normalized the same way (including issue year and
+month), and rows are inserted in chunks. Existing questions are skipped as
+duplicates, so the import can be re-run safely.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services.db_service import DatabaseService  # noqa: E402
+from services.excel_service import iter_xlsx_records, open_xlsx_workbook  # noqa: E402
+
+# subject -> (workbook, magazine name used when the edition column holds only the issue)
+SUBJECT_WORKBOOKS = {
+    "Physics": (
+        Path(r"G:\My Drive\Aditya\IITJEE\Physics\Physics For You\Physics_Questions.xlsx"),
+        "Physics For You",
+    ),
+    "Chemistry": (
+        Path(r"G:\My Drive\Aditya\IITJEE\Chemistry\Chemistry Today\Chemistry_Questions.xlsx"),
+        "Chemistry Today",
+    ),
+    "Mathematics": (
+        Path(r"G:\My Drive\Aditya\IITJEE\Math\Mathematics Today\Mathematics_Questions.xlsx"),
+        "Mathematics Today",
+    ),
+}
+
+
+def import_workbook(
+    db: DatabaseService,
+    subject_name: str,
+    workbook_path: Path,
+    magazine_name: str,
+    chunk_size: int = 1000,
+) -> tuple[int, int, int]:
+    """Import every worksheet; returns (inserted, duplicates, failed sheets)."""
+    workbook = open_xlsx_workbook(workbook_path)
+    db.snapshot_database(f"Import {workbook_path.name} for subject {subject_name}")
+    total_inserted = total_duplicates = failed = 0
+    try:
+        for worksheet in workbook.worksheets:
+            records = iter_xlsx_records(worksheet, str(workbook_path), magazine_name=magazine_name)
+            try:
+                inserted_ids, duplicates = db.import_question_stream(
+                    subject_name, records, chunk_size=chunk_size, snapshot=False
+                )
+            except Exception as exc:
+                failed += 1
+                print(f"{worksheet.title}: failed ({exc}); rows before the error were kept")
+                continue
+            total_inserted += len(inserted_ids)
+            total_duplicates += len(duplicates)
+            if inserted_ids or duplicates:
+                print(f"{worksheet.title}: inserted {len(inserted_ids)} rows, skipped {len(duplicates)} duplicates")
+    finally:
+        workbook.close()
+    return total_inserted, total_duplicates, failed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Import a subject's question workbook.")
+    parser.add_argument("subject", help=f"Subject name ({', '.join(SUBJECT_WORKBOOKS)} have default workbooks)")
+    parser.add_argument("--workbook", type=Path, help="Workbook path (default: the subject's workbook)")
+    parser.add_argument("--magazine", help="Magazine name (default: the subject's magazine)")
+    parser.add_argument("--db", type=Path, required=True, help="Path to question_bank.db")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows per transaction (default: 1000)")
+    args = parser.parse_args(argv)
+
+    default_workbook, default_magazine = SUBJECT_WORKBOOKS.get(args.subject, (None, None))
+    workbook_path = args.workbook or default_workbook
+    magazine_name = args.magazine or default_magazine
+    if workbook_path is None or not magazine_name:
+        parser.error(f"--workbook and --magazine are required for subject '{args.subject}'")
+    if not workbook_path.exists():
+        parser.error(f"Excel workbook not found: {workbook_path}")
+    if not args.db.is_file():
+        parser.error(f"database not found: {args.db}")
+
+    db = DatabaseService(args.db)
+    try:
+        inserted, duplicates, failed = import_workbook(
+            db, args.subject, workbook_path, magazine_name, chunk_size=args.chunk_size
+        )
+    finally:
+        db.close()
+
+    print(f"Finished. Total inserted: {inserted}, duplicates skipped: {duplicates}, failed sheets: {failed}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+"""
+Re-run the image ingest optimizer over every stored image that has not been through it.
+
+Downscales oversized images, strips metadata and recompresses using the
+ImageOptimization config (or the defaults in services.image_store). A snapshot
+is taken first; the job can be interrupted and re-run safely.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services.db_service import DatabaseService  # noqa: E402
+
+DB_PATH = Path(r"G:\My Drive\Aditya\IITJEE\Database\question_bank.db")
+
+
+def _progress(done: int, total: int) -> None:
+    print(f"\rOptimized {done}/{total} images", end="", flush=True)
+
+
+def main() -> None:
+    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DB_PATH
+    if not db_path.is_file():
+        raise FileNotFoundError(f"Database not found: {db_path}")
+
+    db = DatabaseService(db_path)
+    try:
+        stats = db.reoptimize_images(progress_callback=_progress)
+    finally:
+        db.close()
+
+    if stats["processed"]:
+        print()
+    saved = stats["bytes_before"] - stats["bytes_after"]
+    print(
+        f"Finished. Processed {stats['processed']} images, rewrote {stats['rewritten']}, "
+        f"saved {saved / (1024 * 1024):.1f} MB. Run VACUUM to return the space to the OS."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -33,6 +33,32 @@ MAGAZINE_GROUPING_MAP = {
 }
 
 
+# ============================================================================
+# Question DataFrame Columns
+# ============================================================================
+
+# Ready-made normalize_magazine_edition() key added by DatabaseService.fetch_questions_df
+NORMALIZED_EDITION_COLUMN = "Normalized Edition"
+
+# Low-cardinality columns loaded as pandas categoricals
+CATEGORICAL_QUESTION_COLUMNS = (
+    "Magazine Edition",
+    "Name of Question Set",
+    "High level chapter",
+    NORMALIZED_EDITION_COLUMN,
+)
+
+
+# ============================================================================
+# TSV Import
+# ============================================================================
+
+# Files at least this large are imported in resumable chunks instead of one transaction
+LARGE_TSV_IMPORT_BYTES = 5 * 1024 * 1024
+# Rows committed per chunk (and per checkpoint) in resumable imports
+TSV_IMPORT_CHUNK_ROWS = 2000
+
+
 # ============================================================================
 # Month Name Aliases for Date Parsing
 # ============================================================================
@@ -0,0 +1,111 @@
+"""
+Change sets for the loaded question dataset.
+
+After an import or a chapter reassignment the UI applies a DatasetChanges to
+the DataFrame it already holds instead of re-reading the whole subject.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List
+
+import pandas as pd
+
+from config.constants import CATEGORICAL_QUESTION_COLUMNS
+
+QUESTION_ID_COLUMN = "QuestionID"
+CHAPTER_COLUMN = "High level chapter"
+
+
+class DatasetChanges:
+    """
+    Question rows inserted, updated or moved to another chapter.
+
+    Inserted and updated rows have to be read back from the database; moves
+    carry their new chapter, so they can be applied without a query.
+    Change sets are merged with merge() so several events can be applied at once.
+    """
+
+    def __init__(
+        self,
+        inserted: Iterable[int] = (),
+        updated: Iterable[int] = (),
+        moved: Dict[int, str] | None = None,
+    ):
+        self.inserted: Dict[int, None] = dict.fromkeys(int(qid) for qid in inserted)
+        self.updated: Dict[int, None] = dict.fromkeys(int(qid) for qid in updated if int(qid) not in self.inserted)
+        self.moved: Dict[int, str] = {int(qid): chapter for qid, chapter in (moved or {}).items()}
+
+    @classmethod
+    def chapter_move(cls, question_ids: Iterable[int], chapter: str) -> "DatasetChanges":
+        return cls(moved=dict.fromkeys(question_ids, chapter))
+
+    def merge(self, other: "DatasetChanges") -> None:
+        """Fold a later change set into this one."""
+        self.inserted.update(other.inserted)
+        for qid in other.updated:
+            if qid not in self.inserted:
+                self.updated[qid] = None
+        self.moved.update(other.moved)
+
+    def is_empty(self) -> bool:
+        return not (self.inserted or self.updated or self.moved)
+
+    def fetch_ids(self) -> List[int]:
+        """Ids whose rows must be (re)read from the database."""
+        return [*self.inserted, *self.updated]
+
+    def touched_ids(self) -> set[int]:
+        return set(self.inserted) | set(self.updated) | set(self.moved)
+
+    def __repr__(self) -> str:
+        return (
+            f"DatasetChanges(inserted={len(self.inserted)}, "
+            f"updated={len(self.updated)}, moved={len(self.moved)})"
+        )
+
+
+def _align_categories(base: pd.Series, rows: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """Give both categoricals the same categories without recoding the base column."""
+    extra = rows.cat.categories.difference(base.cat.categories)
+    if len(extra):
+        base = base.cat.add_categories(extra)
+    return base, rows.cat.set_categories(base.cat.categories)
+
+
+def apply_to_frame(df: pd.DataFrame, changes: DatasetChanges, rows: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Return `df` with `changes` applied.
+
+    `rows` holds the freshly fetched inserted/updated rows in the same shape as
+    DatabaseService.fetch_questions_df. Updated rows replace their old version,
+    inserted rows are appended, and moves rewrite the chapter column in place.
+    Categorical columns stay categorical.
+    """
+    result = df
+    if rows is not None and not rows.empty:
+        stale = set(changes.updated) | set(rows[QUESTION_ID_COLUMN].tolist())
+        result = result.loc[~result[QUESTION_ID_COLUMN].isin(stale)].copy()
+        rows = rows.copy()
+        for column in CATEGORICAL_QUESTION_COLUMNS:
+            if column not in result or column not in rows:
+                continue
+            if isinstance(result[column].dtype, pd.CategoricalDtype) and isinstance(rows[column].dtype, pd.CategoricalDtype):
+                result[column], rows[column] = _align_categories(result[column], rows[column])
+        result = pd.concat([result, rows[result.columns]], ignore_index=True)
+        if changes.updated:
+            result = result.sort_values(QUESTION_ID_COLUMN, kind="stable", ignore_index=True)
+    elif changes.moved:
+        result = result.copy()
+
+    if changes.moved and CHAPTER_COLUMN in result:
+        chapters = result[QUESTION_ID_COLUMN].map(changes.moved)
+        mask = chapters.notna()
+        if mask.any():
+            column = result[CHAPTER_COLUMN]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                extra = pd.Index(chapters[mask].unique()).difference(column.cat.categories)
+                if len(extra):
+                    result[CHAPTER_COLUMN] = column.cat.add_categories(extra)
+            result.loc[mask, CHAPTER_COLUMN] = chapters[mask]
+    return result
@@ -0,0 +1,66 @@
+"""
+Lazily hydrated mapping of saved question lists.
+"""
+
+from __future__ import annotations
+
+from collections.abc import MutableMapping
+from typing import Callable, Iterable, Iterator
+
+
+class LazyQuestionLists(MutableMapping):
+    """
+    name -> list[question dict] mapping whose items are fetched on first access.
+
+    Only list names are known up front (from the list summaries). Indexing a
+    list calls the loader once and caches the result, so startup cost does not
+    depend on how many items the saved lists hold. Assigning a list stores it
+    directly, the same as a plain dict.
+    """
+
+    def __init__(self, loader: Callable[[str], list[dict]] | None = None):
+        self._loader = loader
+        self._names: dict[str, None] = {}
+        self._items: dict[str, list[dict]] = {}
+
+    def reset(self, names: Iterable[str], loader: Callable[[str], list[dict]] | None = None) -> None:
+        """Replace the known list names and drop every hydrated list."""
+        self._names = dict.fromkeys(names)
+        self._items.clear()
+        if loader is not None:
+            self._loader = loader
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._items
+
+    def __getitem__(self, name: str) -> list[dict]:
+        items = self._items.get(name)
+        if items is not None:
+            return items
+        if name not in self._names:
+            raise KeyError(name)
+        items = self._loader(name) if self._loader else []
+        self._items[name] = items
+        return items
+
+    def __setitem__(self, name: str, questions: list[dict]) -> None:
+        self._names[name] = None
+        self._items[name] = questions
+
+    def __delitem__(self, name: str) -> None:
+        del self._names[name]
+        self._items.pop(name, None)
+
+    def __contains__(self, name: object) -> bool:
+        # Membership must not trigger a load.
+        return name in self._names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._names))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def clear(self) -> None:
+        self._names.clear()
+        self._items.clear()
@@ -0,0 +1,781 @@
+"""
+Advanced query language for the question list.
+
+    text ~ "roots" AND (magazine ~ "physics" OR NOT tag = revision)
+    text : "second law" AND page >= 10 AND qno ^ 1
+    edition = "Jan 2020".."Mar 2021" AND has_images
+
+A bare word or "quoted phrase" with no operator is free text: on its own
+it means text : word, and a query made only of free text (newton "second
+law" velo*) parses to a SEARCH node. Its words must all match, like
+DatabaseService.search_question_text, and CompiledQuery.search_text hands the
+text to callers that rank results with the FTS index. Only has_images may
+stand alone as a field.
+
+A query is parsed and compiled once: field names, operators and values are
+resolved up front, so evaluating a question does no parsing or lowercasing of
+the query. CompiledQuery.matches tests one question mapping.
+CompiledQuery.filter on a QuestionView evaluates the view column-wise against
+its QuestionStore instead: a term is tested once per distinct value of an
+interned field, equality and prefix terms are answered from lookup tables
+built once per store, text terms go through a word -> rows posting index, and
+AND/OR only evaluate their right side on the rows the left side left
+undecided.
+
+Fields: text, magazine, question_set, chapter, page, qno, edition, tag and
+has_images (aliases in FIELD_ALIASES). Operators: = and != (equals), ~ and !~
+(contains), ^ (starts with), : (text has the words, as a phrase; a trailing *
+matches a word prefix), < <= > >= (page, qno, edition) and low..high ranges
+after = or !=. NOT binds tighter than AND, AND tighter than OR, and
+parentheses group. Comparisons are case-insensitive.
+"""
+
+from __future__ import annotations
+
+import re
+import weakref
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Iterable, List, Mapping, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from models.question_store import QuestionStore, QuestionView
+from utils.normalization import normalize_month_year
+from utils.text_search import SearchTerm, parse_search_terms, phrase_in_words, phrase_term, tokenize_text
+
+QUERY_FIELDS = ("text", "magazine", "question_set", "chapter", "page", "qno", "edition", "tag", "has_images")
+QUERY_OPERATORS = ("=", "!=", "~", "!~", "^", ":", "<", "<=", ">", ">=")
+
+FIELD_ALIASES = {
+    "text": "text",
+    "question": "text",
+    "question_text": "text",
+    "magazine": "magazine",
+    "magazine_name": "magazine",
+    "question_set": "question_set",
+    "question_set_name": "question_set",
+    "set": "question_set",
+    "chapter": "chapter",
+    "group": "chapter",
+    "page": "page",
+    "qno": "qno",
+    "edition": "edition",
+    "issue": "edition",
+    "tag": "tag",
+    "tags": "tag",
+    "has_images": "has_images",
+    "images": "has_images",
+}
+
+_STRING_OPERATORS = ("=", "!=", "~", "!~", "^")
+_ORDER_OPERATORS = ("<", "<=", ">", ">=")
+_FIELD_OPERATORS = {
+    "text": _STRING_OPERATORS + (":",),
+    "magazine": _STRING_OPERATORS,
+    "question_set": _STRING_OPERATORS,
+    "chapter": _STRING_OPERATORS,
+    "tag": _STRING_OPERATORS,
+    "page": _STRING_OPERATORS + _ORDER_OPERATORS,
+    "qno": _STRING_OPERATORS + _ORDER_OPERATORS,
+    "edition": ("=", "!=") + _ORDER_OPERATORS,
+    "has_images": ("=", "!="),
+}
+_RANGE_FIELDS = ("page", "qno", "edition")
+# Question keys read for each field (at most two); the first non-empty one wins.
+_FIELD_SOURCES = {
+    "magazine": ("magazine",),
+    "question_set": ("question_set_name", "question_set"),
+    "chapter": ("group", "question_set"),
+    "page": ("page",),
+    "qno": ("qno",),
+    "edition": ("magazine",),
+    "tag": ("question_set_name", "question_set"),
+}
+_NEGATED = {"!=": "=", "!~": "~"}
+_KEYWORDS = ("AND", "OR", "NOT")
+_TRUE_WORDS = ("true", "yes", "y", "1")
+_FALSE_WORDS = ("false", "no", "n", "0")
+_PREFIX_END = "\U0010ffff"
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<paren>[()])
+    | (?P<op>!=|!~|<=|>=|=|~|\^|:|<|>)
+    | (?P<range>\.\.)
+    | "(?P<dquoted>(?:[^"\\]|\\.)*)"
+    | '(?P<squoted>(?:[^'\\]|\\.)*)'
+    | (?P<word>(?:[^\s()=!~^:<>"'.]|\.(?!\.)|!(?![=~]))+)
+    """,
+    re.VERBOSE,
+)
+_ESCAPE_RE = re.compile(r"\\(.)")
+_FREE_TEXT_RE = re.compile(r"(?:[^()=!~^:<>.]|!(?![=~])|\.(?!\.))*")
+_EDITION_KEY_RE = re.compile(r"(\d{4})(?:-(\d{2}))?")
+
+
+class QuerySyntaxError(ValueError):
+    """The query text could not be parsed or uses a field/operator incorrectly."""
+
+
+# ----------------------------------------------------------------------
+# Parsing
+# ----------------------------------------------------------------------
+def _tokenize(query: str) -> List[Tuple[str, str]]:
+    """Split a query into (kind, text) tokens; kind is paren/op/range/value/word."""
+    tokens: List[Tuple[str, str]] = []
+    pos = 0
+    while True:
+        while pos < len(query) and query[pos].isspace():
+            pos += 1
+        if pos >= len(query):
+            return tokens
+        match = _TOKEN_RE.match(query, pos)
+        if match is None:
+            if query[pos] in "\"'":
+                raise QuerySyntaxError(f"unterminated quote at position {pos + 1}.")
+            raise QuerySyntaxError(f"unexpected character '{query[pos]}' at position {pos + 1}.")
+        kind = match.lastgroup
+        if kind in ("dquoted", "squoted"):
+            tokens.append(("value", _ESCAPE_RE.sub(r"\1", match.group(kind))))
+        else:
+            tokens.append((kind, match.group(kind)))
+        pos = match.end()
+
+
+class _Parser:
+    """Recursive-descent parser producing ("TERM"|"NOT"|"AND"|"OR", ...) tuples."""
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self) -> Tuple[str, str] | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def peek_keyword(self) -> str | None:
+        token = self.peek()
+        if token is not None and token[0] == "word" and token[1].upper() in _KEYWORDS:
+            return token[1].upper()
+        return None
+
+    def take(self) -> Tuple[str, str]:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            return None
+        node = self.parse_or()
+        token = self.peek()
+        if token is not None:
+            raise QuerySyntaxError(f"unexpected '{token[1]}'; join terms with AND or OR.")
+        return node
+
+    def parse_or(self):
+        node = self.parse_and()
+        while self.peek_keyword() == "OR":
+            self.take()
+            node = ("OR", node, self.parse_and())
+        return node
+
+    def parse_and(self):
+        node = self.parse_not()
+        while self.peek_keyword() == "AND":
+            self.take()
+            node = ("AND", node, self.parse_not())
+        return node
+
+    def parse_not(self):
+        if self.peek_keyword() == "NOT":
+            self.take()
+            return ("NOT", self.parse_not())
+        return self.parse_primary()
+
+    def parse_primary(self):
+        token = self.peek()
+        if token is None:
+            raise QuerySyntaxError("query ends where a term was expected.")
+        if token == ("paren", "("):
+            self.take()
+            node = self.parse_or()
+            if self.peek() != ("paren", ")"):
+                raise QuerySyntaxError("missing ')'.")
+            self.take()
+            return node
+        if token[0] == "value":
+            self.take()
+            return ("TERM", "text", ":", token[1])
+        if token[0] != "word" or self.peek_keyword() is not None:
+            raise QuerySyntaxError(f"expected a field name or search word, found '{token[1]}'.")
+        return self.parse_term()
+
+    def parse_term(self):
+        name = self.take()[1]
+        token = self.peek()
+        if token is None or token[0] != "op":
+            # No operator: free text, even when the word is a field alias ("images").
+            if name.lower() == "has_images":
+                return ("TERM", "has_images", "=", "true")
+            return ("TERM", "text", ":", name)
+        field = FIELD_ALIASES.get(name.lower())
+        if field is None:
+            raise QuerySyntaxError(f"unknown field '{name}'. Fields: {', '.join(QUERY_FIELDS)}.")
+        op = self.take()[1]
+        if op not in _FIELD_OPERATORS[field]:
+            allowed = " ".join(_FIELD_OPERATORS[field])
+            raise QuerySyntaxError(f"operator '{op}' cannot be used with '{field}' (use {allowed}).")
+        value = self.parse_value(op)
+        if self.peek() is not None and self.peek()[0] == "range":
+            self.take()
+            if field not in _RANGE_FIELDS or op not in ("=", "!="):
+                raise QuerySyntaxError(f"ranges (low..high) work with = or != on {', '.join(_RANGE_FIELDS)}.")
+            value = (value, self.parse_value(".."))
+        return ("TERM", field, op, value)
+
+    def parse_value(self, after: str) -> str:
+        token = self.peek()
+        if token is None or token[0] not in ("word", "value"):
+            raise QuerySyntaxError(f"expected a value after '{after}'.")
+        return self.take()[1]
+
+
+def parse_query(query: str):
+    """
+    Parse query text into a tuple AST (None for an empty query).
+
+    A query of free text only becomes ("SEARCH", text); see the module docstring.
+    """
+    query = (query or "").strip()
+    if _is_free_text(query):
+        return ("SEARCH", query)
+    return _Parser(_tokenize(query)).parse()
+
+
+def _is_free_text(query: str) -> bool:
+    if not query or query.lower() == "has_images":
+        return False
+    try:
+        tokens = _tokenize(query)
+    except QuerySyntaxError:
+        # An apostrophe ("newton's law") reads as an unterminated quote.
+        return _FREE_TEXT_RE.fullmatch(query) is not None and not any(
+            word.upper() in _KEYWORDS for word in query.split()
+        )
+    return all(kind == "value" or (kind == "word" and text.upper() not in _KEYWORDS) for kind, text in tokens)
+
+
+# ----------------------------------------------------------------------
+# Value tests
+# ----------------------------------------------------------------------
+def _number(text: Any) -> float | None:
+    try:
+        return float(str(text).strip())
+    except ValueError:
+        return None
+
+
+def _edition_interval(text: str) -> Tuple[int, int] | None:
+    """Months covered by an edition ("Jan 2020" -> one month, "2020" -> twelve)."""
+    match = _EDITION_KEY_RE.fullmatch(normalize_month_year(text))
+    if match is None:
+        return None
+    year = int(match.group(1))
+    if match.group(2):
+        month = year * 12 + int(match.group(2)) - 1
+        return month, month
+    return year * 12, year * 12 + 11
+
+
+def _edition_part(magazine: str) -> str:
+    parts = magazine.split("|", 1)
+    return parts[1].strip() if len(parts) > 1 and parts[1].strip() else parts[0]
+
+
+def _string_test(op: str, value: str) -> Callable[[str], bool]:
+    if op == "=":
+        return lambda text: text.lower() == value
+    if op == "~":
+        return lambda text: value in text.lower()
+    return lambda text: text.lower().startswith(value)
+
+
+def _number_test(field: str, op: str, value) -> Callable[[str], bool]:
+    if isinstance(value, tuple):
+        low, high = (_number(bound) for bound in value)
+        if low is None or high is None:
+            raise QuerySyntaxError(f"{field} ranges need numbers, e.g. {field} = 10..20.")
+        return lambda text: (number := _number(text)) is not None and low <= number <= high
+    number_value = _number(value)
+    if op == "=":
+        text_value = value.lower()
+        if number_value is None:
+            return lambda text: text.lower() == text_value
+
+        def equals(text: str) -> bool:
+            number = _number(text)
+            return number == number_value if number is not None else text.lower() == text_value
+
+        return equals
+    if number_value is None:
+        raise QuerySyntaxError(f"'{op}' on {field} needs a number, got '{value}'.")
+    compare = {
+        "<": lambda number: number < number_value,
+        "<=": lambda number: number <= number_value,
+        ">": lambda number: number > number_value,
+        ">=": lambda number: number >= number_value,
+    }[op]
+    return lambda text: (number := _number(text)) is not None and compare(number)
+
+
+def _edition_test(op: str, value) -> Callable[[str], bool]:
+    low_text, high_text = value if isinstance(value, tuple) else (value, value)
+    low, high = _edition_interval(low_text), _edition_interval(high_text)
+    if low is None or high is None:
+        bad = low_text if low is None else high_text
+        raise QuerySyntaxError(f"'{bad}' is not an edition month/year such as \"Jan 2020\" or 2020.")
+    if op == "=":
+        first, last = low[0], high[1]
+        check = lambda span: first <= span[0] and span[1] <= last
+    else:
+        check = {
+            "<": lambda span: span[1] < low[0],
+            "<=": lambda span: span[1] <= low[1],
+            ">": lambda span: span[0] > low[1],
+            ">=": lambda span: span[0] >= low[0],
+        }[op]
+
+    def test(magazine: str) -> bool:
+        span = _edition_interval(_edition_part(magazine)) if magazine else None
+        return span is not None and check(span)
+
+    return test
+
+
+# ----------------------------------------------------------------------
+# Store indexes
+# ----------------------------------------------------------------------
+class _StoreIndex:
+    """Lookup tables over one QuestionStore, rebuilt only when the columns they cover change."""
+
+    def __init__(self, store: QuestionStore):
+        self.store = store
+        self._labels: dict[str, Tuple[int, List[str], dict[str, List[int]], List[str], List[int]]] = {}
+        self._text_revision = -1
+        self._text_lower: np.ndarray | None = None
+        self._text_sorted: Tuple[List[str], np.ndarray] | None = None
+        # words (sorted), rows grouped by word, and each word's slice bounds
+        self._postings: Tuple[List[str], np.ndarray, np.ndarray] | None = None
+
+    def _label_tables(self, field: str):
+        labels = self.store.labels(field)
+        cached = self._labels.get(field)
+        # Labels are only ever appended, so the table count identifies a version.
+        if cached is None or cached[0] != len(labels):
+            lowered = [label.lower() for label in labels]
+            by_value: dict[str, List[int]] = {}
+            for code, label in enumerate(lowered):
+                by_value.setdefault(label, []).append(code)
+            order = sorted(range(len(lowered)), key=lowered.__getitem__)
+            cached = (len(labels), lowered, by_value, [lowered[code] for code in order], order)
+            self._labels[field] = cached
+        return cached
+
+    def label_mask(self, field: str, test: Callable[[str], bool]) -> np.ndarray:
+        """test() applied once per distinct label of `field`."""
+        labels = self.store.labels(field)
+        return np.fromiter((test(label) for label in labels), dtype=bool, count=len(labels))
+
+    def label_equal_mask(self, field: str, value: str) -> np.ndarray:
+        count, _, by_value, _, _ = self._label_tables(field)
+        mask = np.zeros(count, dtype=bool)
+        mask[by_value.get(value, [])] = True
+        return mask
+
+    def label_prefix_mask(self, field: str, prefix: str) -> np.ndarray:
+        count, _, _, sorted_labels, order = self._label_tables(field)
+        start = bisect_left(sorted_labels, prefix)
+        end = bisect_left(sorted_labels, prefix + _PREFIX_END)
+        mask = np.zeros(count, dtype=bool)
+        mask[order[start:end]] = True
+        return mask
+
+    def empty_label_mask(self, field: str) -> np.ndarray:
+        return self.label_equal_mask(field, "")
+
+    def _refresh_text(self) -> None:
+        if self._text_revision != self.store.text_revision or self._text_lower is None:
+            texts = self.store.texts()
+            self._text_lower = np.array([text.lower() for text in texts.tolist()], dtype=object)
+            self._text_sorted = None
+            self._postings = None
+            self._text_revision = self.store.text_revision
+
+    def text_lower(self, handles: np.ndarray) -> np.ndarray:
+        self._refresh_text()
+        return self._text_lower[handles]
+
+    def text_rows(self, value: str, prefix: bool) -> np.ndarray:
+        """Store rows whose lowercased text equals (or starts with) `value`."""
+        self._refresh_text()
+        if self._text_sorted is None:
+            order = np.argsort(self._text_lower, kind="stable")
+            self._text_sorted = (self._text_lower[order].tolist(), order)
+        keys, order = self._text_sorted
+        start = bisect_left(keys, value)
+        end = bisect_left(keys, value + _PREFIX_END) if prefix else bisect_right(keys, value)
+        return order[start:end]
+
+    def _word_postings(self) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        self._refresh_text()
+        if self._postings is None:
+            row_words = [tokenize_text(text) for text in self._text_lower.tolist()]
+            counts = np.fromiter((len(words) for words in row_words), dtype=np.intp, count=len(row_words))
+            rows = np.repeat(np.arange(len(row_words), dtype=np.intp), counts)
+            words = [word for words_of_row in row_words for word in words_of_row]
+            if words:
+                codes, vocabulary = pd.factorize(pd.Index(words, dtype=object), sort=True)
+                order = np.lexsort((rows, codes))
+                codes, rows = codes[order], rows[order]
+                # A word repeated within one question is posted once.
+                first = np.r_[True, (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])]
+                codes, rows = codes[first], rows[first]
+                bounds = np.searchsorted(codes, np.arange(len(vocabulary) + 1))
+                self._postings = ([str(word) for word in vocabulary], rows, bounds)
+            else:
+                self._postings = ([], np.zeros(0, dtype=np.intp), np.zeros(1, dtype=np.intp))
+        return self._postings
+
+    def _mark_words(self, codes: Iterable[int]) -> np.ndarray:
+        """Row mask over the whole store: rows posted under any of the vocabulary `codes`."""
+        _, rows, bounds = self._word_postings()
+        marked = np.zeros(len(self.store), dtype=bool)
+        for code in codes:
+            marked[rows[bounds[code]:bounds[code + 1]]] = True
+        return marked
+
+    def word_mask(self, word: str, prefix: bool = False) -> np.ndarray:
+        """Row mask of texts containing `word` (or a word starting with it)."""
+        vocabulary = self._word_postings()[0]
+        first = bisect_left(vocabulary, word)
+        last = bisect_left(vocabulary, word + _PREFIX_END) if prefix else bisect_right(vocabulary, word)
+        return self._mark_words(range(first, last))
+
+    def fragment_mask(self, fragment: str) -> np.ndarray:
+        """Row mask of texts with a word that contains `fragment` (letters and digits only)."""
+        vocabulary = self._word_postings()[0]
+        return self._mark_words(code for code, word in enumerate(vocabulary) if fragment in word)
+
+    def phrase_mask(self, term: SearchTerm) -> np.ndarray:
+        """Row mask of texts containing the phrase `term`."""
+        words, prefix = term
+        marked = self.word_mask(words[-1], prefix=prefix)
+        for word in words[:-1]:
+            marked &= self.word_mask(word)
+        if len(words) > 1:
+            # The words are all present; check they are adjacent and in order.
+            candidates = np.flatnonzero(marked)
+            texts = self._text_lower[candidates]
+            marked[candidates] = np.fromiter(
+                (phrase_in_words(tokenize_text(text), term) for text in texts), dtype=bool, count=len(texts)
+            )
+        return marked
+
+
+_STORE_INDEXES: "weakref.WeakKeyDictionary[QuestionStore, _StoreIndex]" = weakref.WeakKeyDictionary()
+
+
+def _store_index(store: QuestionStore) -> _StoreIndex:
+    index = _STORE_INDEXES.get(store)
+    if index is None:
+        index = _STORE_INDEXES[store] = _StoreIndex(store)
+    return index
+
+
+# ----------------------------------------------------------------------
+# Compiled nodes
+# ----------------------------------------------------------------------
+def _first_value(question: Mapping, keys: Sequence[str]) -> str:
+    for key in keys:
+        value = question.get(key)
+        if value:
+            return str(value)
+    return ""
+
+
+class _TextTerm:
+    def __init__(self, op: str, value: str, negate: bool):
+        self.op = op
+        self.value = value.lower()
+        self.negate = negate
+        self.test = _string_test(op, self.value)
+
+    def matches(self, question: Mapping) -> bool:
+        text = question.get("question_text") or question.get("text") or ""
+        return self.test(str(text)) != self.negate
+
+    def mask(self, index: _StoreIndex, handles: np.ndarray) -> np.ndarray:
+        if self.op == "~":
+            result = self._contains_mask(index, handles)
+        else:
+            result = np.isin(handles, index.text_rows(self.value, prefix=self.op == "^"))
+        return ~result if self.negate else result
+
+    def _contains_mask(self, index: _StoreIndex, handles: np.ndarray) -> np.ndarray:
+        value = self.value
+        words = tokenize_text(value)
+        if not words:
+            lowered = index.text_lower(handles)
+            return np.fromiter((value in text for text in lowered), dtype=bool, count=len(lowered))
+        # Any text containing the value has a word containing its longest word,
+        # so the posting index narrows the rows that need a substring check.
+        # The check always runs: indexed words are accent-folded, `~` is not.
+        fragment = max(words, key=len)
+        result = index.fragment_mask(fragment)[handles]
+        candidates = np.flatnonzero(result)
+        texts = index.text_lower(handles[candidates])
+        result[candidates] = np.fromiter((value in text for text in texts), dtype=bool, count=len(texts))
+        return result
+
+
+class _WordsTerm:
+    """text : phrase, matched on whole words."""
+
+    def __init__(self, value: str, negate: bool):
+        term = phrase_term(value)
+        if term is None:
+            raise QuerySyntaxError("':' needs at least one word, e.g. text : \"newton\" or text : velo*.")
+        self.term = term
+        self.negate = negate
+
+    def matches(self, question: Mapping) -> bool:
+        text = question.get("question_text") or question.get("text") or ""
+        return phrase_in_words(tokenize_text(str(text)), self.term) != self.negate
+
+    def mask(self, index: _StoreIndex, handles: np.ndarray) -> np.ndarray:
+        result = index.phrase_mask(self.term)[handles]
+        return ~result if self.negate else result
+
+
+class _LabelTerm:
+    """A term on a field held as interned labels (directly, or derived from one)."""
+
+    def __init__(
+        self,
+        field: str,
+        op: str,
+        value,
+        negate: bool,
+        tags_for_set: Callable[[str], Iterable[str]] | None,
+    ):
+        self.sources = _FIELD_SOURCES[field]
+        self.negate = negate
+        # (op, lowered value) when the label tables can answer the term directly
+        self.indexed: Tuple[str, str] | None = None
+        if field == "edition":
+            self.test = _edition_test(op, value)
+        elif field in ("page", "qno") and (isinstance(value, tuple) or op in _ORDER_OPERATORS or op == "="):
+            self.test = _number_test(field, op, value)
+            if op == "=" and not isinstance(value, tuple) and _number(value) is None:
+                self.indexed = (op, value.lower())
+        else:
+            self.test = _string_test(op, value.lower())
+            if op in ("=", "^"):
+                self.indexed = (op, value.lower())
+        if field == "tag":
+            value_test = self.test
+            lookup = tags_for_set or (lambda name: ())
+            self.test = lambda name: any(value_test(str(tag)) for tag in lookup(name))
+            self.indexed = None
+
+    def matches(self, question: Mapping) -> bool:
+        return self.test(_first_value(question, self.sources)) != self.negate
+
+    def _label_mask(self, index: _StoreIndex, field: str) -> np.ndarray:
+        if self.indexed is not None:
+            op, value = self.indexed
+            if op == "=":
+                return index.label_equal_mask(field, value)
+            return index.label_prefix_mask(field, value)
+        return index.label_mask(field, self.test)
+
+    def mask(self, index: _StoreIndex, handles: np.ndarray) -> np.ndarray:
+        store = index.store
+        primary, *fallbacks = self.sources
+        codes = store.codes(primary, handles)
+        result = self._label_mask(index, primary)[codes]
+        if fallbacks:
+            # Rows whose primary key is empty read the fallback key instead.
+            empty = index.empty_label_mask(primary)[codes]
+            if empty.any():
+                fallback = fallbacks[0]
+                result[empty] = self._label_mask(index, fallback)[store.codes(fallback, handles[empty])]
+        return ~result if self.negate else result
+
+
+class _ImagesTerm:
+    def __init__(self, value: str, negate: bool, ids_with_images: Callable[[], Iterable[int]] | None):
+        word = value.lower()
+        if word not in _TRUE_WORDS + _FALSE_WORDS:
+            raise QuerySyntaxError(f"has_images takes true or false, got '{value}'.")
+        self.expected = (word in _TRUE_WORDS) != negate
+        self._source = ids_with_images
+        self._ids: set | None = None
+
+    def ids(self) -> set:
+        if self._ids is None:
+            self._ids = set(self._source()) if self._source is not None else set()
+        return self._ids
+
+    def matches(self, question: Mapping) -> bool:
+        return (question.get("question_id") in self.ids()) == self.expected
+
+    def mask(self, index: _StoreIndex, handles: np.ndarray) -> np.ndarray:
+        ids = self.ids()
+        if not ids:
+            result = np.zeros(len(handles), dtype=bool)
+        else:
+            result = np.isin(index.store.question_ids(handles), np.fromiter(ids, dtype=np.int64, count=len(ids)))
+        return result if self.expected else ~result
+
+
+class _Not:
+    def __init__(self, node):
+        self.node = node
+
+    def matches(self, question: Mapping) -> bool:
+        return not self.node.matches(question)
+
+    def mask(self, index: _StoreIndex, handles: np.ndarray) -> np.ndarray:
+        return ~self.node.mask(index, handles)
+
+
+class _And:
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    def matches(self, question: Mapping) -> bool:
+        return self.left.matches(question) and self.right.matches(question)
+
+    def mask(self, index: _StoreIndex, handles: np.ndarray) -> np.ndarray:
+        result = self.left.mask(index, handles)
+        if result.any():
+            result[result] = self.right.mask(index, handles[result])
+        return result
+
+
+class _Or:
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+
+    def matches(self, question: Mapping) -> bool:
+        return self.left.matches(question) or self.right.matches(question)
+
+    def mask(self, index: _StoreIndex, handles: np.ndarray) -> np.ndarray:
+        result = self.left.mask(index, handles)
+        rest = ~result
+        if rest.any():
+            result[rest] = self.right.mask(index, handles[rest])
+        return result
+
+
+class _Search:
+    """Free search text: every term matches as whole words, as in DatabaseService.search_question_text."""
+
+    def __init__(self, text: str):
+        self.terms = parse_search_terms(text)
+        if not self.terms:
+            raise QuerySyntaxError("search text needs at least one letter or digit.")
+        self.text = text
+
+    def matches(self, question: Mapping) -> bool:
+        words = tokenize_text(str(question.get("question_text") or question.get("text") or ""))
+        return all(phrase_in_words(words, term) for term in self.terms)
+
+    def mask(self, index: _StoreIndex, handles: np.ndarray) -> np.ndarray:
+        result = index.phrase_mask(self.terms[0])[handles]
+        for term in self.terms[1:]:
+            result &= index.phrase_mask(term)[handles]
+        return result
+
+
+def _compile_node(node, tags_for_set, ids_with_images):
+    kind = node[0]
+    if kind == "SEARCH":
+        return _Search(node[1])
+    if kind == "NOT":
+        return _Not(_compile_node(node[1], tags_for_set, ids_with_images))
+    if kind in ("AND", "OR"):
+        left = _compile_node(node[1], tags_for_set, ids_with_images)
+        right = _compile_node(node[2], tags_for_set, ids_with_images)
+        return _And(left, right) if kind == "AND" else _Or(left, right)
+    _, field, op, value = node
+    negate = op in _NEGATED
+    op = _NEGATED.get(op, op)
+    if field == "text":
+        return _WordsTerm(value, negate) if op == ":" else _TextTerm(op, value, negate)
+    if field == "has_images":
+        return _ImagesTerm(value, negate, ids_with_images)
+    return _LabelTerm(field, op, value, negate, tags_for_set)
+
+
+class CompiledQuery:
+    """A parsed query bound to its tag and image lookups."""
+
+    def __init__(self, root):
+        self._root = root
+
+    @property
+    def search_text(self) -> str | None:
+        """The query text when the whole query is free text (see parse_query), else None."""
+        return self._root.text if isinstance(self._root, _Search) else None
+
+    def matches(self, question: Mapping) -> bool:
+        return self._root.matches(question)
+
+    def filter(self, questions: QuestionView | Iterable[Mapping]) -> QuestionView | List[Mapping]:
+        """Matching questions, in order; a QuestionView is filtered column-wise."""
+        if isinstance(questions, QuestionView):
+            handles = questions.handles
+            if not len(handles):
+                return questions
+            mask = self._root.mask(_store_index(questions.store), handles)
+            return QuestionView(questions.store, handles[mask])
+        return [question for question in questions if self._root.matches(question)]
+
+
+def order_by_ids(questions: QuestionView | Iterable[Mapping], ids: Sequence[Any]) -> QuestionView | List[Mapping]:
+    """
+    Questions reordered to follow `ids` (e.g. best search match first).
+
+    Questions whose id is not listed keep their relative order after the rest.
+    """
+    position = {qid: rank for rank, qid in enumerate(ids)}
+    unranked = len(position)
+    if isinstance(questions, QuestionView):
+        ranks = [position.get(qid, unranked) for qid in questions.store.question_ids(questions.handles).tolist()]
+        order = np.argsort(np.asarray(ranks, dtype=np.int64), kind="stable")
+        return QuestionView(questions.store, questions.handles[order])
+    return sorted(questions, key=lambda question: position.get(question.get("question_id"), unranked))
+
+
+def compile_query(
+    query: str,
+    tags_for_set: Callable[[str], Iterable[str]] | None = None,
+    ids_with_images: Callable[[], Iterable[int]] | None = None,
+) -> CompiledQuery | None:
+    """
+    Compile query text; returns None for an empty query.
+
+    tags_for_set maps a question set name to its tags (for `tag`).
+    ids_with_images returns the question ids that have images; it is called
+    at most once per compiled query, and only if the query uses has_images.
+    Raises QuerySyntaxError for invalid queries.
+    """
+    node = parse_query(query)
+    if node is None:
+        return None
+    return CompiledQuery(_compile_node(node, tags_for_set, ids_with_images))
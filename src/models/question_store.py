@@ -0,0 +1,417 @@
+"""
+Columnar storage for the questions shown in the chapter and question views.
+
+Every question of the loaded subject lives once in a QuestionStore and is
+addressed by an integer row handle. Low-cardinality fields (chapter, set,
+magazine, qno, page, ...) are interned: one small integer code per row plus a
+single table of distinct strings. Chapter buckets and filtered lists are
+QuestionViews, i.e. arrays of row handles, instead of lists of per-question
+dicts.
+
+QuestionRecord is the read/write row proxy handed to widgets; it behaves like
+the question dicts used before (get, [], in, copy()). Keys that are not
+stored columns (tags attached by the UI) are kept in a per-row overlay, so
+they persist across views just as they did on the shared dicts.
+"""
+
+from __future__ import annotations
+
+from collections.abc import MutableMapping, Sequence
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+INTERNED_FIELDS = ("group", "question_set", "question_set_name", "group_key", "qno", "page", "magazine")
+QUESTION_FIELDS = (*INTERNED_FIELDS, "text", "row_number", "question_id")
+
+
+def map_distinct(values: pd.Series, func: Callable[[Any], Any]) -> pd.Series:
+    """Apply `func` once per distinct value (missing values included) instead of once per row."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    mapped = np.empty(len(uniques), dtype=object)
+    mapped[:] = [func(value) for value in uniques]
+    return pd.Series(mapped[codes], index=values.index)
+
+
+def group_questions(questions: Iterable[Any], group_of: Callable[[Any], str]) -> Dict[str, List[Any]]:
+    """Bucket questions by group_of(question): groups in order of first appearance, questions in their given order."""
+    groups: Dict[str, List[Any]] = {}
+    for question in questions:
+        groups.setdefault(group_of(question), []).append(question)
+    return groups
+
+
+def _clean_text(value: Any) -> str:
+    return "" if pd.isna(value) else str(value).strip()
+
+
+class _InternedColumn:
+    """Row codes into a table of distinct strings."""
+
+    __slots__ = ("codes", "labels", "_lookup")
+
+    def __init__(self, codes: np.ndarray, labels: List[str]):
+        self.codes = codes
+        self.labels = labels
+        self._lookup = {label: code for code, label in enumerate(labels)}
+
+    @classmethod
+    def from_series(cls, values: pd.Series | None, length: int, clean: Callable[[Any], str] = _clean_text) -> "_InternedColumn":
+        if values is None:
+            return cls(np.zeros(length, dtype=np.int32), [""])
+        codes, uniques = pd.factorize(values, use_na_sentinel=False)
+        # Distinct raw values can clean to the same text ("A " and "A"); merge them.
+        cleaned = [clean(value) for value in uniques]
+        label_codes, labels = pd.factorize(pd.Index(cleaned, dtype=object))
+        remap = label_codes.astype(np.int32)
+        return cls(remap[codes] if len(codes) else np.zeros(0, dtype=np.int32), [str(label) for label in labels])
+
+    def derived(self, func: Callable[[str], str]) -> "_InternedColumn":
+        """New column holding func(label) per row, computed once per distinct label."""
+        mapped = [func(label) for label in self.labels]
+        codes, labels = pd.factorize(pd.Index(mapped, dtype=object))
+        return _InternedColumn(codes.astype(np.int32)[self.codes], [str(label) for label in labels])
+
+    def code_for(self, label: str) -> int:
+        code = self._lookup.get(label)
+        if code is None:
+            code = len(self.labels)
+            self.labels.append(label)
+            self._lookup[label] = code
+        return code
+
+    def take(self, positions: np.ndarray) -> "_InternedColumn":
+        return _InternedColumn(self.codes[positions], list(self.labels))
+
+    def extend(self, other: "_InternedColumn") -> None:
+        remap = np.array([self.code_for(label) for label in other.labels], dtype=np.int32)
+        self.codes = np.concatenate([self.codes, remap[other.codes]])
+
+
+class QuestionStore:
+    """Column arrays for a set of questions; row handles are positions in the arrays."""
+
+    def __init__(
+        self,
+        interned: Dict[str, _InternedColumn],
+        text: np.ndarray,
+        row_number: np.ndarray,
+        question_id: np.ndarray,
+        has_ids: bool,
+    ):
+        self._interned = interned
+        self._text = text
+        self._row_number = row_number
+        self._question_id = question_id
+        self._has_ids = has_ids
+        self._extras: Dict[int, Dict[str, Any]] = {}
+        # question id -> row, built on first use by extend()
+        self._id_rows: Dict[Any, int] | None = None
+        # Bumped whenever question text changes or rows are appended; text
+        # indexes built over the store compare it to detect staleness.
+        self.text_revision = 0
+
+    @classmethod
+    def from_columns(
+        cls,
+        chapter: pd.Series,
+        qno: pd.Series,
+        page: pd.Series,
+        text: pd.Series | None = None,
+        question_set_name: pd.Series | None = None,
+        magazine: pd.Series | None = None,
+        question_id: pd.Series | None = None,
+        chapter_group: Callable[[str], str] = lambda chapter: chapter,
+        group_key: Callable[[str], str] = lambda name: name,
+        ids_as_row_numbers: bool = True,
+    ) -> "QuestionStore":
+        """
+        Build a store from DataFrame columns, skipping rows without a chapter.
+
+        Cell values are stripped and missing cells become "". chapter_group
+        maps a raw chapter to its chapter card and group_key a question set
+        name to its tag group; both run once per distinct value. row_number
+        is the question id when ids_as_row_numbers and the row has one,
+        otherwise the 1-based sheet row (header = row 1).
+        """
+        length = len(chapter)
+        raw_chapter = _InternedColumn.from_series(chapter, length)
+        keep = np.flatnonzero(np.array([bool(label) for label in raw_chapter.labels])[raw_chapter.codes]) if length else np.zeros(0, dtype=np.intp)
+
+        interned = {
+            "question_set": raw_chapter.take(keep),
+            "qno": _InternedColumn.from_series(qno, length).take(keep),
+            "page": _InternedColumn.from_series(page, length).take(keep),
+            "magazine": _InternedColumn.from_series(magazine, length).take(keep),
+        }
+        # Without a set-name column the name starts out as the raw chapter, but
+        # stays put when the question later moves to another chapter.
+        interned["question_set_name"] = (
+            _InternedColumn.from_series(question_set_name, length).take(keep)
+            if question_set_name is not None
+            else interned["question_set"].take(np.arange(len(keep)))
+        )
+        interned["group"] = interned["question_set"].derived(chapter_group)
+        interned["group_key"] = interned["question_set_name"].derived(group_key)
+
+        if text is not None:
+            values = text.iloc[keep]
+            text_values = values.where(values.notna(), "").astype(str).str.strip().to_numpy(dtype=object)
+        else:
+            text_values = np.full(len(keep), "", dtype=object)
+
+        sheet_rows = keep.astype(np.int64) + 2
+        if question_id is None:
+            ids = np.full(len(keep), None, dtype=object)
+            row_numbers = sheet_rows
+        else:
+            raw_ids = question_id.iloc[keep]
+            try:
+                ids = raw_ids.to_numpy(dtype=np.int64)
+            except (TypeError, ValueError):
+                ids = np.array([_question_id_value(value) for value in raw_ids], dtype=object)
+            if not ids_as_row_numbers:
+                row_numbers = sheet_rows
+            elif ids.dtype == object:
+                row_numbers = np.array([sheet if qid is None else qid for qid, sheet in zip(ids, sheet_rows)], dtype=object)
+            else:
+                row_numbers = ids.copy()
+        return cls(interned, text_values, row_numbers, ids, question_id is not None)
+
+    def __len__(self) -> int:
+        return len(self._text)
+
+    # ------------------------------------------------------------------
+    # Row access
+    # ------------------------------------------------------------------
+    def value(self, row: int, field: str) -> Any:
+        column = self._interned.get(field)
+        if column is not None:
+            return column.labels[column.codes[row]]
+        if field == "text":
+            return self._text[row]
+        if field == "row_number":
+            return _python_value(self._row_number[row])
+        if field == "question_id":
+            return _python_value(self._question_id[row])
+        raise KeyError(field)
+
+    def set_value(self, row: int, field: str, value: Any) -> None:
+        """
+        Write one field of a row.
+
+        Stored columns always take the value (None becomes "" in string
+        columns), so column-wise queries never see a stale value; other keys
+        go to the row's overlay.
+        """
+        column = self._interned.get(field)
+        if column is not None:
+            column.codes[row] = column.code_for("" if value is None else str(value))
+        elif field == "text":
+            self._text[row] = "" if value is None else str(value)
+            self.text_revision += 1
+        elif field == "question_id":
+            self._question_id = _store_id(self._question_id, row, _question_id_value(value))
+            self._id_rows = None
+        elif field == "row_number":
+            self._row_number = _store_id(self._row_number, row, _question_id_value(value))
+        else:
+            self._extras.setdefault(row, {})[field] = value
+
+    def extras(self, row: int) -> Dict[str, Any] | None:
+        return self._extras.get(row)
+
+    def record(self, row: int) -> "QuestionRecord":
+        return QuestionRecord(self, int(row))
+
+    def distinct(self, field: str) -> List[str]:
+        """Distinct values of an interned field that occur in at least one row."""
+        column = self._interned[field]
+        return [column.labels[code] for code in np.unique(column.codes)]
+
+    def question_ids(self, handles: np.ndarray | None = None) -> np.ndarray:
+        return self._question_id if handles is None else self._question_id[handles]
+
+    # ------------------------------------------------------------------
+    # Column access (read-only; used by query evaluation)
+    # ------------------------------------------------------------------
+    def labels(self, field: str) -> List[str]:
+        """Distinct-value table of an interned field; codes index into it."""
+        return self._interned[field].labels
+
+    def codes(self, field: str, handles: np.ndarray | None = None) -> np.ndarray:
+        codes = self._interned[field].codes
+        return codes if handles is None else codes[handles]
+
+    def texts(self, handles: np.ndarray | None = None) -> np.ndarray:
+        return self._text if handles is None else self._text[handles]
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+    def view(self, handles: Iterable[int] | np.ndarray) -> "QuestionView":
+        return QuestionView(self, np.asarray(handles, dtype=np.intp))
+
+    def group_views(self, handles: np.ndarray | None = None) -> Dict[str, "QuestionView"]:
+        """Split rows (all, or `handles`) by chapter group, in order of first appearance."""
+        handles = np.arange(len(self), dtype=np.intp) if handles is None else np.asarray(handles, dtype=np.intp)
+        column = self._interned["group"]
+        codes = column.codes[handles]
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]) if len(order) else []
+        buckets = {}
+        for start, end in zip(starts, [*starts[1:], len(order)]):
+            bucket = handles[order[start:end]]
+            buckets[int(sorted_codes[start])] = bucket
+        first_seen = sorted(buckets, key=lambda code: buckets[code][0])
+        return {column.labels[code]: QuestionView(self, buckets[code]) for code in first_seen}
+
+    def sorted_by_id(self, handles: np.ndarray) -> np.ndarray:
+        """Handles reordered by question id (stable); unchanged when ids are missing."""
+        if not self._has_ids or self._question_id.dtype == object:
+            return handles
+        return handles[np.argsort(self._question_id[handles], kind="stable")]
+
+    def extend(self, other: "QuestionStore") -> np.ndarray:
+        """
+        Add `other`'s rows; returns their handles in this store.
+
+        A row whose question id is already in the store replaces that row in
+        place (same handle, overlay reset), so re-fetching updated questions
+        does not grow the store; rows without a known id are appended.
+        """
+        if self._id_rows is None:
+            self._id_rows = {
+                qid: row for row, qid in enumerate(self._question_id.tolist()) if qid is not None
+            }
+        handles = np.empty(len(other), dtype=np.intp)
+        appended: List[int] = []
+        for position, qid in enumerate(other._question_id.tolist()):
+            row = self._id_rows.get(qid) if qid is not None else None
+            if row is None:
+                appended.append(position)
+                continue
+            handles[position] = row
+            for field in self._interned:
+                self.set_value(row, field, other.value(position, field))
+            self._text[row] = other._text[position]
+            self._row_number = _store_id(self._row_number, row, _python_value(other._row_number[position]))
+            self._extras.pop(row, None)
+            if position in other._extras:
+                self._extras[row] = dict(other._extras[position])
+
+        if appended:
+            positions = np.asarray(appended, dtype=np.intp)
+            offset = len(self)
+            for field, column in self._interned.items():
+                column.extend(other._interned[field].take(positions))
+            self._text = np.concatenate([self._text, other._text[positions]])
+            self._row_number = np.concatenate([self._row_number, other._row_number[positions]])
+            self._question_id = np.concatenate([self._question_id, other._question_id[positions]])
+            for new_row, position in enumerate(appended, start=offset):
+                handles[position] = new_row
+                if position in other._extras:
+                    self._extras[new_row] = dict(other._extras[position])
+                qid = _python_value(self._question_id[new_row])
+                if qid is not None:
+                    self._id_rows[qid] = new_row
+        self.text_revision += 1
+        return handles
+
+
+def _store_id(array: np.ndarray, row: int, value: Any) -> np.ndarray:
+    """Set array[row] = value, widening an int64 id array to object when the value is not an int."""
+    if array.dtype != object and not isinstance(value, (int, np.integer)):
+        array = array.astype(object)
+    elif not array.flags.writeable:  # e.g. a read-only view of a DataFrame column
+        array = array.copy()
+    array[row] = value
+    return array
+
+
+def _question_id_value(value: Any) -> Any:
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    try:
+        return int(value)
+    except Exception:
+        return value
+
+
+def _python_value(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class QuestionRecord(MutableMapping):
+    """Dict-like view of one store row; writes go to the store."""
+
+    __slots__ = ("store", "row")
+
+    def __init__(self, store: QuestionStore, row: int):
+        self.store = store
+        self.row = row
+
+    def __getitem__(self, key: str) -> Any:
+        extras = self.store.extras(self.row)
+        if extras is not None and key in extras:
+            return extras[key]
+        if key in QUESTION_FIELDS:
+            return self.store.value(self.row, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.store.set_value(self.row, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        extras = self.store.extras(self.row)
+        if extras is None or key not in extras:
+            raise KeyError(key)
+        del extras[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from QUESTION_FIELDS
+        extras = self.store.extras(self.row)
+        if extras:
+            yield from (key for key in extras if key not in QUESTION_FIELDS)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def copy(self) -> Dict[str, Any]:
+        """Detached plain-dict copy (for saved lists, JSON and dialogs)."""
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"QuestionRecord({self.copy()!r})"
+
+
+class QuestionView(Sequence):
+    """An ordered selection of store rows; items are QuestionRecords."""
+
+    __slots__ = ("store", "handles")
+
+    def __init__(self, store: QuestionStore, handles: np.ndarray):
+        self.store = store
+        self.handles = handles
+
+    def __len__(self) -> int:
+        return len(self.handles)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return QuestionView(self.store, self.handles[index])
+        return QuestionRecord(self.store, int(self.handles[index]))
+
+    def __iter__(self) -> Iterator[QuestionRecord]:
+        store = self.store
+        for row in self.handles.tolist():
+            yield QuestionRecord(store, row)
+
+    def filter(self, predicate: Callable[[QuestionRecord], bool]) -> "QuestionView":
+        keep = [row for row in self.handles.tolist() if predicate(QuestionRecord(self.store, row))]
+        return QuestionView(self.store, np.asarray(keep, dtype=np.intp))
+
+    def __repr__(self) -> str:
+        return f"QuestionView({len(self)} questions)"
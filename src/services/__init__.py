@@ -2,10 +2,14 @@
 Services layer for business logic.
 
 Contains:
-- excel_service: TSV import helpers (DB-backed)
+- excel_service: TSV/XLSX import helpers (DB-backed)
+- batch_import: Headless, parallel batch import of TSV/XLSX directories
 - tag_service: Tag management (load/save tags, color assignment, filtering)
 - data_service: Data management (chapter groupings, question organization)
 - question_set_group_service: Question set grouping management
+- snapshot_service: Incremental, content-addressed database snapshots
+- folder_watcher: Event-driven (inotify or polling) watcher for incoming TSV files
+- image_store: Deduplicated image blobs with metadata and thumbnails
 """
 
 from .excel_service import (
@@ -16,6 +20,7 @@ from .tag_service import TagService, get_tag_service
 from .data_service import DataService, get_data_service, set_data_service
 from .question_set_group_service import QuestionSetGroupService
 from .db_service import DatabaseService
+from .snapshot_service import SnapshotService
 
 __all__ = [
     'read_tsv_rows',
@@ -27,4 +32,5 @@ __all__ = [
     'set_data_service',
     'DatabaseService',
     'QuestionSetGroupService',
+    'SnapshotService',
 ]
@@ -0,0 +1,215 @@
+"""
+Headless batch import of TSV and XLSX question files.
+
+Files are parsed and validated in worker processes while the main process
+writes the results, so parsing overlaps with inserting. Parsed files are
+grouped into batches of roughly `batch_size` rows and each batch is written
+with insert_question_batches: one snapshot and one transaction per batch.
+A file (or worksheet) is never split across batches, so it is imported
+all-or-nothing.
+
+Rows that already exist are counted as duplicates and skipped, which makes a
+re-run over the same directory a no-op. Source files are never deleted. In
+dry-run mode every file is validated and checked for duplicates against the
+database and the other files, but nothing is written.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+from services.db_service import DatabaseService
+from services.excel_service import (
+    _ImportSummary,
+    _id_range,
+    _load_tsv,
+    iter_xlsx_records,
+    open_xlsx_workbook,
+)
+
+IMPORT_SUFFIXES = (".tsv", ".xlsx")
+DEFAULT_BATCH_SIZE = 5000
+
+# (label, records, summary, error) for one TSV file or one worksheet
+_ParsedUnit = Tuple[str, List[dict], _ImportSummary, str | None]
+
+
+def discover_import_files(paths: Iterable[Path], recursive: bool = False) -> List[Path]:
+    """Expand directories into their .tsv/.xlsx files (sorted); files are kept as given."""
+    found: List[Path] = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            candidates = path.rglob("*") if recursive else path.glob("*")
+            found.extend(
+                sorted(
+                    candidate
+                    for candidate in candidates
+                    if candidate.is_file()
+                    and candidate.suffix.lower() in IMPORT_SUFFIXES
+                    and not candidate.name.startswith("~$")
+                )
+            )
+        else:
+            found.append(path)
+    return list(dict.fromkeys(found))
+
+
+def parse_import_file(path: Path) -> List[_ParsedUnit]:
+    """
+    Parse one file into import units: the whole file for TSV, one unit per worksheet for XLSX.
+
+    Errors are returned rather than raised so one bad file or sheet does not
+    stop the run.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".tsv":
+        try:
+            records, summary = _load_tsv(path)
+        except Exception as exc:
+            return [(path.name, [], _ImportSummary(), str(exc))]
+        return [(path.name, records, summary, None)]
+
+    if path.suffix.lower() != ".xlsx":
+        return [(path.name, [], _ImportSummary(), f"Unsupported file type '{path.suffix}'.")]
+
+    try:
+        workbook = open_xlsx_workbook(path)
+    except Exception as exc:
+        return [(path.name, [], _ImportSummary(), str(exc))]
+    units: List[_ParsedUnit] = []
+    try:
+        for worksheet in workbook.worksheets:
+            label = f"{path.name} [{worksheet.title}]"
+            summary = _ImportSummary()
+            try:
+                records = list(iter_xlsx_records(worksheet, str(path), summary))
+            except Exception as exc:
+                units.append((label, [], summary, str(exc)))
+                continue
+            if records:
+                units.append((label, records, summary, None))
+    finally:
+        workbook.close()
+    return units
+
+
+def _parsed_files(paths: List[Path], workers: int) -> Iterator[Tuple[Path, List[_ParsedUnit]]]:
+    """Yield (path, units) in input order, parsing up to 2 * workers files ahead."""
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield path, parse_import_file(path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        remaining = iter(paths)
+        pending = deque((path, pool.submit(parse_import_file, path)) for _, path in zip(range(workers * 2), remaining))
+        while pending:
+            path, future = pending.popleft()
+            next_path = next(remaining, None)
+            if next_path is not None:
+                pending.append((next_path, pool.submit(parse_import_file, next_path)))
+            try:
+                units = future.result()
+            except Exception as exc:
+                units = [(path.name, [], _ImportSummary(), f"Parser process failed: {exc}")]
+            yield path, units
+
+
+def run_batch_import(
+    db_service: DatabaseService,
+    subject_name: str,
+    paths: List[Path],
+    workers: int = 4,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dry_run: bool = False,
+    progress_callback: Callable[[str, bool, str], None] | None = None,
+) -> dict:
+    """
+    Import `paths` (files, as returned by discover_import_files) into `subject_name`.
+
+    progress_callback(label, ok, message) is called once per file or worksheet.
+    Returns a stats dict: files, units, rows, inserted, duplicates, errors,
+    failures [(label, message)], elapsed (seconds), rows_per_sec, dry_run.
+    """
+    stats = {
+        "files": len(paths),
+        "units": 0,
+        "rows": 0,
+        "inserted": 0,
+        "duplicates": 0,
+        "errors": 0,
+        "failures": [],
+        "elapsed": 0.0,
+        "rows_per_sec": 0.0,
+        "dry_run": dry_run,
+    }
+    report = progress_callback or (lambda label, ok, message: None)
+    started = time.perf_counter()
+    seen_identities: set[tuple[str, str, str]] = set()
+    batch: List[_ParsedUnit] = []
+    batch_rows = 0
+
+    def fail(label: str, message: str) -> None:
+        stats["errors"] += 1
+        stats["failures"].append((label, message))
+        report(label, False, message)
+
+    def check(unit: _ParsedUnit) -> None:
+        label, records, summary, _ = unit
+        duplicates = 0
+        fresh: List[dict] = []
+        for rec in records:
+            identity = (rec["normalized_magazine"], rec["normalized_qno"], rec["normalized_page"])
+            if identity in seen_identities:
+                duplicates += 1
+            else:
+                seen_identities.add(identity)
+                fresh.append(rec)
+        duplicates += len(db_service.find_existing_questions(subject_name, fresh))
+        stats["duplicates"] += duplicates
+        report(label, True, f"Valid: {summary.rows} rows (Pages: {summary.page_range()}), {duplicates} duplicates")
+
+    def flush() -> None:
+        nonlocal batch, batch_rows
+        if not batch:
+            return
+        units, batch, batch_rows = batch, [], 0
+        try:
+            outcomes = db_service.insert_question_batches(subject_name, [records for _, records, _, _ in units])
+        except Exception as exc:
+            for label, _, _, _ in units:
+                fail(label, f"Batch insert failed: {exc}")
+            return
+        for (label, _, summary, _), (inserted_ids, duplicates) in zip(units, outcomes):
+            stats["inserted"] += len(inserted_ids)
+            stats["duplicates"] += len(duplicates)
+            message = f"Inserted {len(inserted_ids)} rows (IDs: {_id_range(inserted_ids)}, Pages: {summary.page_range()})"
+            if duplicates:
+                message += f", skipped {len(duplicates)} duplicates"
+            report(label, True, message)
+
+    for _, units in _parsed_files(paths, workers):
+        for unit in units:
+            label, records, _, error = unit
+            stats["units"] += 1
+            if error is not None:
+                fail(label, error)
+                continue
+            stats["rows"] += len(records)
+            if dry_run:
+                check(unit)
+                continue
+            batch.append(unit)
+            batch_rows += len(records)
+            if batch_rows >= batch_size:
+                flush()
+    flush()
+
+    stats["elapsed"] = time.perf_counter() - started
+    if stats["elapsed"] > 0:
+        stats["rows_per_sec"] = stats["rows"] / stats["elapsed"]
+    return stats
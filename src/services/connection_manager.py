@@ -0,0 +1,163 @@
+"""
+Thread-aware SQLite connection management.
+
+Each thread (UI, TSV watcher, embedding QThread, ...) gets one long-lived
+connection to the active database. Connection-level PRAGMAs are applied once
+when the connection is opened instead of on every query, and
+`transaction()` scopes let several statements share one connection and commit.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+# Connection-level tuning applied once per connection.
+DEFAULT_PRAGMAS: dict[str, str | int] = {
+    "foreign_keys": "ON",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -65536,  # negative = KiB, i.e. 64 MB page cache
+    "mmap_size": 268435456,  # 256 MB memory-mapped I/O
+    "busy_timeout": 10000,  # ms to wait on a locked DB instead of failing
+}
+
+
+class ConnectionManager:
+    """
+    Hand out one persistent connection per thread for a single database path.
+
+    Connections are opened in autocommit mode; `transaction()` issues
+    BEGIN/COMMIT explicitly and is re-entrant, so nested scopes on the same
+    thread join the outermost transaction.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        journal_mode: str = "WAL",
+        pragmas: dict[str, str | int] | None = None,
+    ):
+        self.db_path = Path(db_path)
+        self.journal_mode = journal_mode
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._connections: dict[int, sqlite3.Connection] = {}
+
+    def set_db_path(self, db_path: Path) -> None:
+        """Point the manager at another database; threads reconnect lazily."""
+        db_path = Path(db_path)
+        if db_path == self.db_path:
+            return
+        with self._lock:
+            self.db_path = db_path
+            self._generation += 1
+
+    # ------------------------------------------------------------------
+    # Connections
+    # ------------------------------------------------------------------
+    def connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening (or re-opening) it if needed."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and (self._local.generation == self._generation or self._local.depth):
+            # Never swap the connection underneath an open transaction.
+            return conn
+        if conn is not None:
+            self._discard_current()
+        conn = self._open()
+        self._local.conn = conn
+        self._local.generation = self._generation
+        self._local.depth = 0
+        with self._lock:
+            self._connections[threading.get_ident()] = conn
+        return conn
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        if self.journal_mode:
+            try:
+                conn.execute(f"PRAGMA journal_mode = {self.journal_mode};")
+            except sqlite3.DatabaseError:
+                # Some synced/network drives cannot host a WAL; keep the default journal.
+                pass
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value};")
+        return conn
+
+    def _discard_current(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        self._local.depth = 0
+        with self._lock:
+            if self._connections.get(threading.get_ident()) is conn:
+                self._connections.pop(threading.get_ident(), None)
+        if conn is not None:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    def close_thread_connection(self) -> None:
+        """Close the calling thread's connection (call before a worker thread exits)."""
+        self._discard_current()
+
+    def close_all(self) -> None:
+        """Close every connection handed out so far (application shutdown)."""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+            self._generation += 1
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    # ------------------------------------------------------------------
+    # Transactions
+    # ------------------------------------------------------------------
+    def in_transaction(self) -> bool:
+        """True when the calling thread is inside a transaction() scope."""
+        return bool(getattr(self._local, "depth", 0))
+
+    @contextmanager
+    def transaction(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Run a block inside a transaction on this thread's connection.
+
+        Commits on success and rolls back on error. Nested scopes join the
+        outer transaction. Use immediate=True for read-then-write blocks so the
+        write lock is taken up front instead of failing on upgrade.
+        """
+        conn = self.connection()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        self._local.depth = 1
+        try:
+            yield conn
+        except BaseException:
+            self._local.depth = 0
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        else:
+            self._local.depth = 0
+            if conn.in_transaction:
+                conn.commit()
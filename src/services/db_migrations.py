@@ -0,0 +1,297 @@
+"""
+Versioned schema migrations for the question bank database.
+
+The schema version lives in `PRAGMA user_version`. Each migration runs once,
+inside its own transaction, and bumps the version when it succeeds. Add new
+steps to the end of MIGRATIONS; never edit or reorder a released step.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Callable, List, Tuple
+
+from services.image_store import image_digest
+from utils.helpers import normalize_page, normalize_qno
+
+IDENTITY_UNIQUE_INDEX = "uq_questions_identity"
+IDENTITY_COLUMNS = "subject_id, normalized_magazine, normalized_qno, normalized_page"
+# Rows without a full identity (legacy imports) are not constrained.
+IDENTITY_WHERE = "normalized_magazine <> '' AND normalized_qno <> '' AND normalized_page <> ''"
+QUESTION_FTS_TABLE = "questions_fts"
+
+
+def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (table,),
+    ).fetchone()
+    return row is not None
+
+
+def _column_names(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _add_column_if_missing(conn: sqlite3.Connection, table: str, column: str, col_type: str) -> None:
+    if column not in _column_names(conn, table):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
+
+
+def _create_index(conn: sqlite3.Connection, name: str, table: str, columns: str) -> None:
+    """Create an index when its table exists (older DBs may lack optional tables)."""
+    if _table_exists(conn, table):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({columns})")
+
+
+# ---------------------------------------------------------------------------
+# Migration steps
+# ---------------------------------------------------------------------------
+
+def _m001_question_embeddings(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS question_embeddings (
+            question_id INTEGER PRIMARY KEY,
+            model TEXT NOT NULL,
+            dim INTEGER NOT NULL,
+            vector BLOB NOT NULL,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+
+
+def _m002_exam_tables(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS exams (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT,
+            list_name TEXT,
+            imported_at TEXT,
+            evaluated INTEGER DEFAULT 0,
+            evaluated_at TEXT,
+            total_questions INTEGER,
+            answered INTEGER,
+            correct INTEGER,
+            wrong INTEGER,
+            score INTEGER,
+            percent REAL,
+            source_path TEXT,
+            payload_json TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS exam_questions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            exam_id INTEGER NOT NULL,
+            q_index INTEGER,
+            question_json TEXT,
+            response_json TEXT,
+            correct INTEGER,
+            answered INTEGER,
+            score INTEGER,
+            FOREIGN KEY(exam_id) REFERENCES exams(id) ON DELETE CASCADE
+        )
+        """
+    )
+    _add_column_if_missing(conn, "exam_questions", "eval_status", "TEXT")
+    _add_column_if_missing(conn, "exam_questions", "eval_comment", "TEXT")
+
+
+def _m003_hot_path_indexes(conn: sqlite3.Connection) -> None:
+    _create_index(conn, "idx_images_question_kind", "images", "question_id, kind")
+    _create_index(conn, "idx_question_list_items_list_position", "question_list_items", "list_id, position")
+    _create_index(conn, "idx_exam_questions_exam_index", "exam_questions", "exam_id, q_index")
+    _create_index(conn, "idx_questions_subject_magazine", "questions", "subject_id, normalized_magazine")
+
+
+def _m004_question_identity(conn: sqlite3.Connection) -> None:
+    """Persist normalized qno/page and index the duplicate-detection key."""
+    if not _table_exists(conn, "questions"):
+        return
+    _add_column_if_missing(conn, "questions", "normalized_qno", "TEXT")
+    _add_column_if_missing(conn, "questions", "normalized_page", "TEXT")
+    conn.create_function("py_normalize_qno", 1, normalize_qno, deterministic=True)
+    conn.create_function("py_normalize_page", 1, normalize_page, deterministic=True)
+    conn.execute(
+        """
+        UPDATE questions
+        SET normalized_qno = py_normalize_qno(question_number),
+            normalized_page = py_normalize_page(page_range)
+        """
+    )
+    try:
+        conn.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {IDENTITY_UNIQUE_INDEX} "
+            f"ON questions({IDENTITY_COLUMNS}) WHERE {IDENTITY_WHERE}"
+        )
+    except sqlite3.IntegrityError:
+        # The bank already holds duplicates; keep lookups indexed without the constraint.
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_questions_identity "
+            f"ON questions({IDENTITY_COLUMNS}) WHERE {IDENTITY_WHERE}"
+        )
+
+
+def _m005_image_blobs(conn: sqlite3.Connection) -> None:
+    """Move image bytes into the content-addressed image_blobs table."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS image_blobs (
+            hash TEXT PRIMARY KEY,
+            mime_type TEXT,
+            format TEXT,
+            width INTEGER,
+            height INTEGER,
+            size_bytes INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            thumb BLOB,
+            thumb_mime TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    if not _table_exists(conn, "images"):
+        return
+    _add_column_if_missing(conn, "images", "blob_hash", "TEXT")
+    _create_index(conn, "idx_images_blob_hash", "images", "blob_hash")
+    conn.create_function("py_image_digest", 1, lambda data: image_digest(bytes(data)), deterministic=True)
+    legacy = "blob_hash IS NULL AND data IS NOT NULL AND length(data) > 0"
+    conn.execute(
+        f"""
+        INSERT OR IGNORE INTO image_blobs (hash, mime_type, size_bytes, data)
+        SELECT py_image_digest(data), mime_type, length(data), data
+        FROM images
+        WHERE {legacy}
+        """
+    )
+    # images.data is kept (empty) for older readers; metadata and thumbnails
+    # for migrated blobs are filled in lazily the first time a preview is requested.
+    conn.execute(f"UPDATE images SET blob_hash = py_image_digest(data), data = X'' WHERE {legacy}")
+
+
+def _m006_image_blob_optimized_flag(conn: sqlite3.Connection) -> None:
+    """Track which blobs went through the ingest optimizer (batch re-optimize skips them)."""
+    _add_column_if_missing(conn, "image_blobs", "optimized", "INTEGER NOT NULL DEFAULT 0")
+
+
+def _m007_import_checkpoints(conn: sqlite3.Connection) -> None:
+    """Last committed line per source file, so chunked imports can resume."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS import_checkpoints (
+            source TEXT PRIMARY KEY,
+            signature TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            last_line INTEGER NOT NULL,
+            inserted INTEGER NOT NULL DEFAULT 0,
+            duplicates INTEGER NOT NULL DEFAULT 0,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+
+
+def _m008_question_text_fts(conn: sqlite3.Connection) -> None:
+    """FTS5 index over questions.question_text, kept in sync by triggers."""
+    if not _table_exists(conn, "questions"):
+        return
+    try:
+        conn.execute(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {QUESTION_FTS_TABLE} USING fts5(
+                question_text,
+                content='questions',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            """
+        )
+    except sqlite3.OperationalError:
+        # SQLite built without FTS5; text search falls back to LIKE scans.
+        return
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {QUESTION_FTS_TABLE}_ai AFTER INSERT ON questions BEGIN
+            INSERT INTO {QUESTION_FTS_TABLE}(rowid, question_text) VALUES (new.id, new.question_text);
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {QUESTION_FTS_TABLE}_ad AFTER DELETE ON questions BEGIN
+            INSERT INTO {QUESTION_FTS_TABLE}({QUESTION_FTS_TABLE}, rowid, question_text)
+            VALUES ('delete', old.id, old.question_text);
+        END
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {QUESTION_FTS_TABLE}_au AFTER UPDATE OF question_text ON questions BEGIN
+            INSERT INTO {QUESTION_FTS_TABLE}({QUESTION_FTS_TABLE}, rowid, question_text)
+            VALUES ('delete', old.id, old.question_text);
+            INSERT INTO {QUESTION_FTS_TABLE}(rowid, question_text) VALUES (new.id, new.question_text);
+        END
+        """
+    )
+    conn.execute(f"INSERT INTO {QUESTION_FTS_TABLE}({QUESTION_FTS_TABLE}) VALUES ('rebuild')")
+
+
+def has_question_text_index(conn: sqlite3.Connection) -> bool:
+    return _table_exists(conn, QUESTION_FTS_TABLE)
+
+
+def has_identity_unique_index(conn: sqlite3.Connection) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+        (IDENTITY_UNIQUE_INDEX,),
+    ).fetchone()
+    return row is not None
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "question_embeddings table", _m001_question_embeddings),
+    (2, "exam tables and evaluation columns", _m002_exam_tables),
+    (3, "indexes for images, list items, exam questions and subject editions", _m003_hot_path_indexes),
+    (4, "normalized qno/page columns and question identity index", _m004_question_identity),
+    (5, "content-addressed image blobs with metadata and thumbnails", _m005_image_blobs),
+    (6, "image_blobs.optimized flag", _m006_image_blob_optimized_flag),
+    (7, "import_checkpoints table for resumable imports", _m007_import_checkpoints),
+    (8, "FTS5 full-text index over question text", _m008_question_text_fts),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def migrate(conn: sqlite3.Connection) -> List[str]:
+    """
+    Apply pending migrations on an autocommit connection.
+
+    Returns the descriptions of the steps that ran (empty when up to date).
+    """
+    applied: List[str] = []
+    for version, description, step in MIGRATIONS:
+        if version <= schema_version(conn):
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-check under the write lock in case another process migrated first.
+            if version > schema_version(conn):
+                step(conn)
+                conn.execute(f"PRAGMA user_version = {version}")
+                applied.append(description)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    if applied:
+        conn.execute("PRAGMA optimize")
+    return applied
@@ -4,55 +4,163 @@ SQLite data access helper for questions, configs, and custom lists.
 
 from __future__ import annotations
 
+import functools
 import json
 import mimetypes
+import os
 import sqlite3
-from datetime import datetime, timedelta
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
 from pathlib import Path
-import shutil
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, ContextManager, Dict, Iterable, List, Tuple
 
 import numpy as np
 
 import pandas as pd
+from config.constants import CATEGORICAL_QUESTION_COLUMNS, NORMALIZED_EDITION_COLUMN
+from utils.edition_index import normalize_edition_series
 from utils.helpers import normalize_magazine_edition, normalize_page, normalize_qno
+from utils.text_search import fold_diacritics, fts_match_expression, parse_search_terms, phrase_in_words, tokenize_text
 from services.cbt_package import load_cqt
+from services.connection_manager import DEFAULT_PRAGMAS, ConnectionManager
+from services.image_presence import ImageCounts, ImagePresenceCache
+from services.image_store import DEFAULT_OPTIMIZATION, prepare_image, release_orphans, store_image
+from services.db_migrations import (
+    IDENTITY_WHERE,
+    LATEST_VERSION,
+    QUESTION_FTS_TABLE,
+    has_identity_unique_index,
+    has_question_text_index,
+    migrate,
+    schema_version,
+)
+from services.snapshot_service import SnapshotService
+from services.write_queue import WriteQueue
+
+IMAGE_OPTIMIZATION_CONFIG = "ImageOptimization"
+
+# SQLite's own auto-checkpoint would fold WAL pages into the main file before a
+# snapshot has seen them, forcing the next snapshot to re-read the whole file.
+# The writer checkpoints through SnapshotService.capture() instead.
+CONNECTION_PRAGMAS: Dict[str, str | int] = {**DEFAULT_PRAGMAS, "wal_autocheckpoint": 0, "journal_size_limit": 0}
+WAL_CHECKPOINT_BYTES = 4 * 1024 * 1024
+
+
+def _fold_text(text: str | None) -> str:
+    """SQL function for the scan fallback of search_question_text."""
+    return fold_diacritics(text.lower()) if text else ""
+
+
+def _write_job(method):
+    """
+    Run a mutating DatabaseService method on the single writer thread.
+
+    The caller blocks until the job's group commit finishes. Calls made from the
+    writer thread itself run inline so they join the batch's transaction.
+    Writing from inside a transaction() scope on another thread raises
+    RuntimeError: the job would either bypass the writer or wait on a lock
+    the caller holds.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: "DatabaseService", *args: Any, **kwargs: Any) -> Any:
+        if self.writer.is_writer_thread():
+            return method(self, *args, **kwargs)
+        if self.connections.in_transaction():
+            raise RuntimeError(f"{method.__name__} cannot run inside a transaction() scope; writes go through the writer.")
+        return self.writer.submit(method, self, *args, **kwargs).result()
+
+    return wrapper
+
+
+def _snapshot_job(method):
+    """
+    Mark a write job that calls snapshot_database().
+
+    The writer captures the database image before it opens the batch's
+    transaction; snapshot_database() inside the job only publishes that image.
+    Apply below @_write_job.
+    """
+    method.takes_snapshot = True
+    return method
 
 
 class DatabaseService:
     def __init__(self, db_path: Path):
         self.db_path = Path(db_path)
-        self.ensure_question_embeddings_table()
+        self.connections = ConnectionManager(self.db_path, pragmas=CONNECTION_PRAGMAS)
+        self.writer = WriteQueue(self.connections, before_batch=self._before_write_batch)
+        self.snapshots = SnapshotService(self.db_path)
+        self.image_presence = ImagePresenceCache()
+        self._image_pool: ThreadPoolExecutor | None = None
+        # Thumbnail generation started per blob hash (see get_image_thumbnails).
+        self._thumbnail_jobs: Dict[str, Future] = {}
+        self._schema_ready_for: Path | None = None
+        self._identity_is_unique = False
+        self._has_text_index = False
+        # Image captured for the write batch in progress (writer thread only).
+        self._batch_snapshot: Dict[str, Any] | None = None
+        self.migrate_schema()
 
     def set_db_path(self, db_path: Path) -> None:
+        if Path(db_path) != self.db_path:
+            self.image_presence.clear()
+            self._thumbnail_jobs.clear()
         self.db_path = Path(db_path)
-        self.ensure_question_embeddings_table()
+        self.connections.set_db_path(self.db_path)
+        self.snapshots.set_db_path(self.db_path)
+        self.migrate_schema()
+
+    def migrate_schema(self) -> List[str]:
+        """
+        Bring the schema and indexes up to date once per database path.
+
+        Returns the descriptions of migrations applied (empty when already current).
+        """
+        if self._schema_ready_for == self.db_path or not self.db_path.is_file():
+            return []
+        conn = self.connections.connection()
+        applied: List[str] = []
+        if schema_version(conn) < LATEST_VERSION:
+            self.snapshot_database(f"Auto-backup before schema migration to v{LATEST_VERSION}")
+            applied = migrate(conn)
+        self._identity_is_unique = has_identity_unique_index(conn)
+        self._has_text_index = has_question_text_index(conn)
+        self._schema_ready_for = self.db_path
+        return applied
+
+    def close(self) -> None:
+        """Flush queued writes and close all pooled connections (call on application shutdown)."""
+        if self._image_pool is not None:
+            self._image_pool.shutdown(wait=True)
+            self._image_pool = None
+        self.writer.close()
+        self.connections.close_all()
+        self.snapshots.close()
+
+    def submit_write(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Queue a mutation for the writer thread without waiting for it.
+
+        fn runs inside the writer's group transaction; DatabaseService write
+        methods can be passed directly, e.g. submit_write(db.upsert_embedding, ...).
+        """
+        return self.writer.submit(fn, *args, **kwargs)
 
     def ensure_question_embeddings_table(self) -> None:
-        """Create embeddings table if missing."""
-        with self._connect() as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS question_embeddings (
-                    question_id INTEGER PRIMARY KEY,
-                    model TEXT NOT NULL,
-                    dim INTEGER NOT NULL,
-                    vector BLOB NOT NULL,
-                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-                """
-            )
+        """Make sure the schema (including question_embeddings) is migrated."""
+        self.migrate_schema()
 
     def list_embedding_ids(self) -> List[int]:
         """Return question_ids that have stored embeddings."""
-        self.ensure_question_embeddings_table()
         with self._connect() as conn:
             rows = conn.execute("SELECT question_id FROM question_embeddings").fetchall()
         return [int(r["question_id"]) for r in rows]
 
+    @_write_job
     def upsert_embedding(self, question_id: int, model: str, vector: bytes, dim: int) -> None:
         """Insert or replace a question embedding."""
-        self.ensure_question_embeddings_table()
         with self._connect() as conn:
             conn.execute(
                 """
@@ -71,7 +179,6 @@ class DatabaseService:
         """Fetch embeddings for given IDs (optionally filtered by model)."""
         if not ids:
             return []
-        self.ensure_question_embeddings_table()
         placeholders = ",".join("?" for _ in ids)
         params: List[Any] = list(ids)
         model_clause = ""
@@ -112,84 +219,123 @@ class DatabaseService:
             ).fetchall()
         return [{"id": int(r["id"]), "question_text": r["question_text"] or ""} for r in rows]
 
+    def search_question_text(
+        self, query: str, subject_name: str | None = None, limit: int | None = 200
+    ) -> List[Dict[str, Any]]:
+        """
+        Ranked full-text search over question text.
+
+        Bare words must all appear, "quoted words" match as a phrase and a
+        trailing * matches word prefixes (see utils.text_search). Returns
+        [{"question_id", "rank", "snippet"}], best match first; rank is the
+        FTS5 bm25 score (lower is better). limit=None returns every match.
+        Without the FTS index (SQLite built without FTS5) the same terms are
+        matched by scanning, unranked.
+        """
+        terms = parse_search_terms(query)
+        if not terms or (limit is not None and limit <= 0):
+            return []
+        subject_join = "JOIN subjects s ON s.id = q.subject_id AND s.name = ?" if subject_name else ""
+        subject_params = [subject_name] if subject_name else []
+        with self._connect() as conn:
+            if self._has_text_index:
+                rows = conn.execute(
+                    f"""
+                    SELECT q.id AS question_id,
+                           bm25({QUESTION_FTS_TABLE}) AS rank,
+                           snippet({QUESTION_FTS_TABLE}, 0, '[', ']', '...', 12) AS snippet
+                    FROM {QUESTION_FTS_TABLE}
+                    JOIN questions q ON q.id = {QUESTION_FTS_TABLE}.rowid
+                    {subject_join}
+                    WHERE {QUESTION_FTS_TABLE} MATCH ?
+                    ORDER BY rank
+                    LIMIT ?
+                    """,
+                    [*subject_params, fts_match_expression(terms), -1 if limit is None else limit],
+                ).fetchall()
+                return [
+                    {"question_id": int(r["question_id"]), "rank": float(r["rank"]), "snippet": r["snippet"] or ""}
+                    for r in rows
+                ]
+            # Narrow with LIKE on every word (against accent-folded text, as the words
+            # are), then check word boundaries and phrases in Python.
+            conn.create_function("fold_text", 1, _fold_text, deterministic=True)
+            likes = [word for words, _ in terms for word in words]
+            rows = conn.execute(
+                f"""
+                SELECT q.id AS question_id, q.question_text
+                FROM questions q
+                {subject_join}
+                WHERE {" AND ".join("fold_text(q.question_text) LIKE ?" for _ in likes)}
+                ORDER BY q.id
+                """,
+                [*subject_params, *(f"%{word}%" for word in likes)],
+            ).fetchall()
+        results: List[Dict[str, Any]] = []
+        for r in rows:
+            words = tokenize_text(r["question_text"] or "")
+            if all(phrase_in_words(words, term) for term in terms):
+                results.append({"question_id": int(r["question_id"]), "rank": 0.0, "snippet": (r["question_text"] or "")[:120]})
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
     # ------------------------------------------------------------------
     # Snapshotting with metadata (5-day retention)
     # ------------------------------------------------------------------
     def snapshot_database(self, reason: str, retention_days: int = 5) -> Path | None:
         """
-        Create a timestamped copy of the database plus a metadata file describing the change.
+        Create an incremental snapshot of the database plus metadata describing the change.
+
+        Only pages that changed since earlier snapshots are written (see SnapshotService).
+        Inside a write job marked with @_snapshot_job this publishes the image
+        captured before the batch started; all jobs of one batch share one
+        manifest, with their reasons joined.
 
         Args:
             reason: Short description of the change (20-30 words preferred).
             retention_days: How many days of snapshots to keep (default 5).
         """
-        db_path = Path(self.db_path)
-        if not db_path.is_file():
-            return None
-
-        backup_dir = db_path.parent / "backups"
-        backup_dir.mkdir(parents=True, exist_ok=True)
-
-        timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
-        suffix = db_path.suffix
-        base_name = f"{db_path.stem}-{timestamp}"
-        backup_path = backup_dir / f"{base_name}{suffix}"
-        meta_path = backup_dir / f"{base_name}.json"
+        pending = self._batch_snapshot if self.writer.is_writer_thread() else None
+        if pending is not None:
+            if pending.get("error") is not None:
+                raise pending["error"]
+            if pending["head"] is None:
+                return None
+            pending["manifest"] = self.snapshots.publish(
+                pending["head"], reason, retention_days=retention_days, manifest_path=pending["manifest"]
+            )
+            return pending["manifest"]
+        # Unmarked jobs already hold the write lock through the writer's transaction.
+        write_locked = self.writer.is_writer_thread() and self.connections.in_transaction()
+        return self.snapshots.create(reason, retention_days=retention_days, write_locked=write_locked)
 
-        shutil.copy2(db_path, backup_path)
-        meta = {
-            "timestamp": timestamp,
-            "reason": reason.strip()[:300],
-            "db": str(db_path.name),
-        }
-        meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    def _before_write_batch(self, jobs: List[Callable[..., Any]]) -> None:
+        """
+        Prepare snapshots and checkpoints for the next write batch (writer thread).
 
-        # Prune older than retention_days
-        cutoff = datetime.utcnow() - timedelta(days=retention_days)
-        for meta_file in backup_dir.glob(f"{db_path.stem}-*.json"):
+        Runs before the batch's transaction is opened, so capturing the image
+        never holds up the batch's own writes.
+        """
+        self._batch_snapshot = None
+        if any(getattr(job, "takes_snapshot", False) for job in jobs):
             try:
-                meta_data = json.loads(meta_file.read_text(encoding="utf-8"))
-                ts = datetime.strptime(meta_data.get("timestamp", ""), "%Y%m%d-%H%M%S")
-            except Exception:
-                continue
-            if ts < cutoff:
-                db_file = backup_dir / f"{db_path.stem}-{meta_data.get('timestamp','')}{suffix}"
-                meta_file.unlink(missing_ok=True)
-                db_file.unlink(missing_ok=True)
-
-        return backup_path
+                self._batch_snapshot = {"head": self.snapshots.capture(), "manifest": None}
+            except Exception as exc:
+                # Surface the failure from the jobs' snapshot_database() calls.
+                self._batch_snapshot = {"error": exc}
+            return
+        if self.snapshots.wal_size() < WAL_CHECKPOINT_BYTES:
+            return
+        try:
+            self.snapshots.capture()
+        except Exception:
+            # Never let the WAL grow without bound; the next snapshot just reads everything.
+            self.snapshots.checkpoint()
 
     def list_snapshots(self) -> List[Dict[str, Any]]:
         """Return available snapshots with timestamp and reason."""
-        db_path = Path(self.db_path)
-        backup_dir = db_path.parent / "backups"
-        snapshots: List[Dict[str, Any]] = []
-        for meta_file in backup_dir.glob(f"{db_path.stem}-*.json"):
-            try:
-                meta_data = json.loads(meta_file.read_text(encoding="utf-8"))
-                ts = meta_data.get("timestamp") or ""
-                reason = meta_data.get("reason") or ""
-                db_file = backup_dir / f"{db_path.stem}-{ts}{db_path.suffix}"
-                if not db_file.is_file():
-                    continue
-                try:
-                    size_bytes = db_file.stat().st_size
-                except Exception:
-                    size_bytes = None
-                snapshots.append(
-                    {
-                        "timestamp": ts,
-                        "reason": reason,
-                        "db_file": str(db_file),
-                        "meta_file": str(meta_file),
-                        "size_bytes": size_bytes,
-                        "dt": datetime.strptime(ts, "%Y%m%d-%H%M%S") if ts else None,
-                    }
-                )
-            except Exception:
-                continue
-        snapshots.sort(key=lambda s: s.get("dt") or datetime.min, reverse=True)
-        return snapshots
+        return self.snapshots.list()
 
     def restore_snapshot(self, snapshot_path: Path) -> None:
         """Restore the database from the given snapshot path (creates a safety snapshot first)."""
@@ -198,7 +344,11 @@ class DatabaseService:
             raise FileNotFoundError(f"Snapshot not found: {snapshot_path}")
         # Safety snapshot before restore
         self.snapshot_database("Auto-backup before restore")
-        shutil.copy2(snapshot_path, self.db_path)
+        self.snapshots.restore(snapshot_path)
+        self.image_presence.clear()
+        # The restored file may predate newer migrations.
+        self._schema_ready_for = None
+        self.migrate_schema()
 
     def backup_database(self, max_backups: int = 10) -> Path | None:
         """
@@ -209,11 +359,17 @@ class DatabaseService:
         # Deprecated: use snapshot_database instead for logged snapshots
         return None
 
-    def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON;")
-        return conn
+    def transaction(self, immediate: bool = False) -> ContextManager[sqlite3.Connection]:
+        """
+        Group several DatabaseService calls into one transaction on this thread's connection.
+
+        Read methods called inside the scope join it. Write methods go through
+        the writer thread and raise RuntimeError inside the scope.
+        """
+        return self.connections.transaction(immediate=immediate)
+
+    def _connect(self) -> ContextManager[sqlite3.Connection]:
+        return self.connections.transaction()
 
     def get_question_by_id(self, question_id: int) -> Dict[str, Any] | None:
         with self._connect() as conn:
@@ -291,43 +447,65 @@ class DatabaseService:
             results.append(data)
         return results
 
-    def fetch_questions_df(self, subject_name: str) -> pd.DataFrame:
+    def fetch_questions_df(
+        self,
+        subject_name: str,
+        question_ids: Iterable[int] | None = None,
+        chunk_size: int = 500,
+    ) -> pd.DataFrame:
         """
         Return a DataFrame shaped like the Excel import with standard headers.
-        Columns: Qno, PageNo, Magazine Edition, Name of Question Set, Full Question Text, High level chapter, QuestionID
+        Columns: Qno, PageNo, Magazine Edition, Name of Question Set, Full Question Text,
+        High level chapter, QuestionID, Normalized Edition
+
+        Projection and the "Magazine | Edition" concatenation run in SQL; rows
+        come back as plain tuples and go straight into the DataFrame. The
+        low-cardinality columns are categoricals, and the normalized edition
+        key is computed once per distinct edition rather than once per row.
+
+        With question_ids only those rows are read (in chunked IN queries);
+        the result has the same columns and dtypes, so it can be merged into
+        an already loaded frame.
         """
+        if question_ids is None:
+            chunks: List[tuple] = [()]
+        else:
+            ids = list(dict.fromkeys(int(qid) for qid in question_ids))
+            chunks = [tuple(ids[start : start + chunk_size]) for start in range(0, len(ids), chunk_size)] or [()]
         with self._connect() as conn:
-            cur = conn.execute(
-                """
-                SELECT q.id, q.question_number, q.page_range, q.edition, q.question_set,
-                       q.question_set_name, q.chapter, q.high_level_chapter,
-                       q.question_text, q.magazine
-                FROM questions q
-                JOIN subjects s ON s.id = q.subject_id
-                WHERE lower(s.name) = lower(?)
-                """,
-                (subject_name,),
-            )
-            rows = cur.fetchall()
-
-        data = []
-        for row in rows:
-            magazine = row["magazine"] or ""
-            edition = row["edition"] or ""
-            mag_edition = f"{magazine} | {edition}" if magazine or edition else ""
-            data.append(
-                {
-                    "Qno": row["question_number"] or "",
-                    "PageNo": row["page_range"] or "",
-                    "Magazine Edition": mag_edition,
-                    "Name of Question Set": row["question_set_name"] or row["question_set"] or "",
-                    "Full Question Text": row["question_text"] or "",
-                    "High level chapter": row["high_level_chapter"] or row["chapter"] or "",
-                    "QuestionID": row["id"],
-                }
-            )
+            cur = conn.cursor()
+            cur.row_factory = None
+            records: List[tuple] = []
+            for chunk in chunks:
+                id_filter = ""
+                if question_ids is not None:
+                    id_filter = f"AND q.id IN ({', '.join('?' * len(chunk))})"
+                cur.execute(
+                    f"""
+                    SELECT COALESCE(q.question_number, '') AS "Qno",
+                           COALESCE(q.page_range, '') AS "PageNo",
+                           CASE WHEN COALESCE(q.magazine, '') = '' AND COALESCE(q.edition, '') = '' THEN ''
+                                ELSE COALESCE(q.magazine, '') || ' | ' || COALESCE(q.edition, '')
+                           END AS "Magazine Edition",
+                           COALESCE(NULLIF(q.question_set_name, ''), q.question_set, '') AS "Name of Question Set",
+                           COALESCE(q.question_text, '') AS "Full Question Text",
+                           COALESCE(NULLIF(q.high_level_chapter, ''), q.chapter, '') AS "High level chapter",
+                           q.id AS "QuestionID"
+                    FROM questions q
+                    JOIN subjects s ON s.id = q.subject_id
+                    WHERE lower(s.name) = lower(?) {id_filter}
+                    """,
+                    (subject_name, *chunk),
+                )
+                records.extend(cur.fetchall())
+            columns = [desc[0] for desc in cur.description]
+            df = pd.DataFrame.from_records(records, columns=columns)
 
-        return pd.DataFrame(data)
+        df["QuestionID"] = df["QuestionID"].astype("int64")
+        df[NORMALIZED_EDITION_COLUMN] = normalize_edition_series(df["Magazine Edition"])
+        for column in CATEGORICAL_QUESTION_COLUMNS:
+            df[column] = df[column].astype("category")
+        return df
 
     def load_config(self, key: str) -> Dict[str, Any]:
         with self._connect() as conn:
@@ -340,6 +518,8 @@ class DatabaseService:
             except json.JSONDecodeError:
                 return {}
 
+    @_write_job
+    @_snapshot_job
     def save_config(self, key: str, payload: Dict[str, Any]) -> None:
         value_json = json.dumps(payload, indent=2)
         with self._connect() as conn:
@@ -366,130 +546,379 @@ class DatabaseService:
                 raise RuntimeError(f"Failed to ensure subject '{name}'.")
             return int(row[0])
 
-    def _collect_existing_triplets(self, subject_id: int) -> Dict[tuple, tuple]:
-        """
-        Return existing (normalized_magazine, normalized_qno, normalized_page) -> (magazine, qno, page, question_id)
-        """
-        result: Dict[tuple, tuple] = {}
-        with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT id, normalized_magazine, question_number, page_range
-                FROM questions
-                WHERE subject_id = ?
-                """,
-                (subject_id,),
-            ).fetchall()
-        for row in rows:
-            norm_mag = row["normalized_magazine"] or ""
-            norm_qno = normalize_qno(row["question_number"])
-            norm_page = normalize_page(row["page_range"])
-            if norm_mag and norm_qno and norm_page:
-                result[(norm_mag, norm_qno, norm_page)] = (
-                    row["normalized_magazine"] or "",
-                    str(row["question_number"] or ""),
-                    str(row["page_range"] or ""),
-                    int(row["id"]),
-                )
-        return result
+    def _find_existing_question(
+        self,
+        conn: sqlite3.Connection,
+        subject_id: int,
+        norm_mag: str,
+        norm_qno: str,
+        norm_page: str,
+    ) -> sqlite3.Row | None:
+        """Look up a question by its normalized identity (served by the identity index)."""
+        return conn.execute(
+            f"""
+            SELECT id, question_number, page_range
+            FROM questions
+            WHERE subject_id = ? AND normalized_magazine = ? AND normalized_qno = ? AND normalized_page = ?
+              AND {IDENTITY_WHERE}
+            LIMIT 1
+            """,
+            (subject_id, norm_mag, norm_qno, norm_page),
+        ).fetchone()
 
     def insert_questions_from_tsv(
         self,
         subject_name: str,
-        records: List[Dict[str, Any]],
+        records: Iterable[Dict[str, Any]],
     ) -> Tuple[List[int], List[tuple]]:
         """
         Insert question records into DB with duplicate detection.
 
+        Duplicates are resolved per row against the (subject, magazine, qno, page)
+        identity index, so cost depends on the number of records, not the bank size.
+        records may be a generator; it is consumed on the calling thread before
+        the write job is queued, so parsing never holds the write lock and an
+        exception raised while iterating leaves the database untouched.
+        Records that already carry normalized_magazine/normalized_qno/normalized_page
+        are not normalized again.
+
         Returns (inserted_ids, duplicates) where duplicates is a list of tuples:
         (magazine, qno, page, existing_qno, existing_page).
         """
+        return self._insert_question_list(subject_name, list(records))
+
+    @_write_job
+    @_snapshot_job
+    def _insert_question_list(
+        self,
+        subject_name: str,
+        records: List[Dict[str, Any]],
+    ) -> Tuple[List[int], List[tuple]]:
         self.snapshot_database(f"Import questions for subject {subject_name}")
-        subject_id = self._ensure_subject(subject_name)
-        existing = self._collect_existing_triplets(subject_id)
+        # One write transaction for lookup + insert so concurrent writers cannot interleave.
+        with self.transaction(immediate=True) as conn:
+            subject_id = self._ensure_subject(subject_name)
+            return self._insert_question_records(conn, subject_id, records)
+
+    def insert_question_batches(
+        self,
+        subject_name: str,
+        batches: List[Iterable[Dict[str, Any]]],
+    ) -> List[Tuple[List[int], List[tuple]]]:
+        """
+        Insert several files' worth of records with one snapshot and one transaction.
+
+        Returns one (inserted_ids, duplicates) pair per batch, in order. Rows
+        of later batches that collide with earlier ones are reported as
+        duplicates, just like rows already in the database. Batches are
+        materialized on the calling thread, as in insert_questions_from_tsv.
+        """
+        return self._insert_question_lists(subject_name, [list(records) for records in batches])
+
+    @_write_job
+    @_snapshot_job
+    def _insert_question_lists(
+        self,
+        subject_name: str,
+        batches: List[List[Dict[str, Any]]],
+    ) -> List[Tuple[List[int], List[tuple]]]:
+        total = sum(len(batch) for batch in batches)
+        self.snapshot_database(f"Import {len(batches)} files ({total} questions) for subject {subject_name}")
+        with self.transaction(immediate=True) as conn:
+            subject_id = self._ensure_subject(subject_name)
+            return [self._insert_question_records(conn, subject_id, records) for records in batches]
+
+    def import_question_stream(
+        self,
+        subject_name: str,
+        records: Iterable[Dict[str, Any]],
+        chunk_size: int = 1000,
+        snapshot: bool = True,
+        checkpoint: Tuple[str, str, int, int] | None = None,
+        progress_callback: Callable[[int], None] | None = None,
+    ) -> Tuple[List[int], List[tuple]]:
+        """
+        Insert a long stream of records in chunks, one write job (and commit) per chunk.
+
+        Only one chunk is held in memory, and `records` is consumed on the
+        calling thread. Unlike insert_questions_from_tsv this is not
+        all-or-nothing: if iterating `records` raises, earlier chunks stay
+        committed. Existing rows are reported as duplicates, so the import
+        can simply be re-run once the source is fixed. With `snapshot`, one
+        snapshot is taken before the first chunk is written.
+
+        checkpoint is (source, signature, inserted so far, duplicates so far).
+        When given, every chunk also records its last `source_line` and the
+        running totals in import_checkpoints, in the same transaction as
+        the rows (see import_checkpoint). progress_callback(rows) receives
+        the number of records consumed after each chunk.
+
+        Returns (inserted_ids, duplicates) like insert_questions_from_tsv.
+        """
+        inserted_ids: List[int] = []
         duplicates: List[tuple] = []
-        inserts: List[Tuple] = []
+        processed = 0
+        records = iter(records)
+        while True:
+            chunk = list(islice(records, max(1, chunk_size)))
+            if not chunk:
+                break
+            if snapshot:
+                self.snapshot_database(f"Import questions for subject {subject_name}")
+                snapshot = False
+            chunk_checkpoint = None
+            if checkpoint is not None:
+                source, signature, inserted_before, duplicates_before = checkpoint
+                chunk_checkpoint = (
+                    source,
+                    signature,
+                    int(chunk[-1]["source_line"]),
+                    inserted_before + len(inserted_ids),
+                    duplicates_before + len(duplicates),
+                )
+            chunk_ids, chunk_duplicates = self._insert_question_chunk(subject_name, chunk, chunk_checkpoint)
+            inserted_ids.extend(chunk_ids)
+            duplicates.extend(chunk_duplicates)
+            processed += len(chunk)
+            if progress_callback:
+                progress_callback(processed)
+        return inserted_ids, duplicates
 
-        for rec in records:
-            norm_mag = normalize_magazine_edition(rec.get("magazine", ""))
-            norm_qno = normalize_qno(rec.get("question_number"))
-            norm_page = normalize_page(rec.get("page_range"))
-            combo = (norm_mag, norm_qno, norm_page)
-            if norm_mag and norm_qno and norm_page and combo in existing:
-                _, ex_qno, ex_page, _ = existing[combo]
-                duplicates.append(
+    @_write_job
+    def _insert_question_chunk(
+        self,
+        subject_name: str,
+        records: List[Dict[str, Any]],
+        checkpoint: Tuple[str, str, int, int, int] | None = None,
+    ) -> Tuple[List[int], List[tuple]]:
+        with self._connect() as conn:
+            subject_id = self._ensure_subject(subject_name)
+            inserted_ids, duplicates = self._insert_question_records(conn, subject_id, records)
+            if checkpoint is not None:
+                source, signature, last_line, inserted_before, duplicates_before = checkpoint
+                conn.execute(
+                    """
+                    INSERT INTO import_checkpoints (source, signature, subject, last_line, inserted, duplicates, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(source) DO UPDATE SET
+                        signature = excluded.signature,
+                        subject = excluded.subject,
+                        last_line = excluded.last_line,
+                        inserted = excluded.inserted,
+                        duplicates = excluded.duplicates,
+                        updated_at = excluded.updated_at
+                    """,
                     (
-                        rec.get("magazine") or "",
-                        rec.get("question_number") or "",
-                        rec.get("page_range") or "",
-                        ex_qno,
-                        ex_page,
-                    )
+                        source,
+                        signature,
+                        subject_name,
+                        last_line,
+                        inserted_before + len(inserted_ids),
+                        duplicates_before + len(duplicates),
+                    ),
                 )
-                continue
+            return inserted_ids, duplicates
 
-            edition = ""
-            issue_year = None
-            issue_month = None
-            if norm_mag:
-                parts = norm_mag.split("|", 1)
-                if len(parts) > 1:
-                    edition = parts[1]
-                    if len(edition) == 7 and edition[4] == "-":
-                        try:
-                            issue_year = int(edition[:4])
-                            issue_month = int(edition[5:7])
-                        except Exception:
-                            issue_year = None
-                            issue_month = None
-
-            inserts.append(
-                (
-                    subject_id,
-                    rec.get("source") or "",
-                    rec.get("magazine") or "",
-                    norm_mag,
-                    edition or rec.get("edition") or "",
-                    issue_year,
-                    issue_month,
-                    rec.get("page_range") or "",
-                    rec.get("question_set") or "",
-                    rec.get("question_set_name") or "",
-                    rec.get("chapter") or "",
-                    rec.get("high_level_chapter") or "",
-                    rec.get("question_number") or "",
-                    rec.get("question_text") or "",
-                    rec.get("answer_text"),
-                    rec.get("explanation"),
-                    rec.get("metadata_json"),
-                )
-            )
+    def import_checkpoint(self, source: str, signature: str, subject_name: str) -> Dict[str, Any] | None:
+        """
+        Progress of an interrupted chunked import of `source` into `subject_name`.
 
+        Returns {subject, last_line, inserted, duplicates}, or None when there
+        is no checkpoint, it was written for a different version of the file
+        (signature mismatch), or the earlier run imported into another subject.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT signature, subject, last_line, inserted, duplicates FROM import_checkpoints WHERE source = ?",
+                (source,),
+            ).fetchone()
+        if row is None or row["signature"] != signature or row["subject"].casefold() != subject_name.casefold():
+            return None
+        return {
+            "subject": row["subject"],
+            "last_line": int(row["last_line"]),
+            "inserted": int(row["inserted"]),
+            "duplicates": int(row["duplicates"]),
+        }
+
+    @_write_job
+    def clear_import_checkpoint(self, source: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM import_checkpoints WHERE source = ?", (source,))
+
+    def _insert_question_records(
+        self,
+        conn: sqlite3.Connection,
+        subject_id: int,
+        records: Iterable[Dict[str, Any]],
+    ) -> Tuple[List[int], List[tuple]]:
         inserted_ids: List[int] = []
-        if inserts:
-            with self._connect() as conn:
-                cur = conn.executemany(
+        duplicates: List[tuple] = []
+        for rec in records:
+            norm_mag, norm_qno, norm_page = self._record_identity(rec)
+            has_identity = bool(norm_mag and norm_qno and norm_page)
+
+            existing = None
+            if has_identity and not self._identity_is_unique:
+                existing = self._find_existing_question(conn, subject_id, norm_mag, norm_qno, norm_page)
+
+            new_id = None
+            if existing is None:
+                row = conn.execute(
                     """
                     INSERT INTO questions (
                         subject_id, source, magazine, normalized_magazine, edition,
                         issue_year, issue_month, page_range, question_set, question_set_name,
                         chapter, high_level_chapter, question_number, question_text,
-                        answer_text, explanation, metadata_json
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        answer_text, explanation, metadata_json, normalized_qno, normalized_page
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT DO NOTHING
+                    RETURNING id
                     """,
-                    inserts,
-                )
-                inserted_ids = [cur.lastrowid] if cur.lastrowid else []
-                # When using executemany, lastrowid is the last inserted; fetch range manually
-                if cur.lastrowid and len(inserts) > 1:
-                    start_id = cur.lastrowid - len(inserts) + 1
-                    inserted_ids = list(range(start_id, cur.lastrowid + 1))
-
+                    self._question_insert_row(subject_id, rec, norm_mag, norm_qno, norm_page),
+                ).fetchone()
+                if row is not None:
+                    new_id = int(row[0])
+                elif has_identity:
+                    existing = self._find_existing_question(conn, subject_id, norm_mag, norm_qno, norm_page)
+
+            if new_id is not None:
+                inserted_ids.append(new_id)
+                continue
+            duplicates.append(self._duplicate_entry(rec, existing))
         return inserted_ids, duplicates
 
+    def find_existing_questions(
+        self,
+        subject_name: str,
+        records: Iterable[Dict[str, Any]],
+    ) -> List[tuple]:
+        """
+        Report which records already exist in the database, without writing.
+
+        Returns duplicates in the same (magazine, qno, page, existing_qno,
+        existing_page) form as insert_questions_from_tsv, so an import can be
+        validated (dry run) before it is committed.
+        """
+        duplicates: List[tuple] = []
+        with self._connect() as conn:
+            row = conn.execute("SELECT id FROM subjects WHERE lower(name)=lower(?)", (subject_name,)).fetchone()
+            if not row:
+                return duplicates
+            subject_id = int(row[0])
+            for rec in records:
+                norm_mag, norm_qno, norm_page = self._record_identity(rec)
+                if not (norm_mag and norm_qno and norm_page):
+                    continue
+                existing = self._find_existing_question(conn, subject_id, norm_mag, norm_qno, norm_page)
+                if existing is not None:
+                    duplicates.append(self._duplicate_entry(rec, existing))
+        return duplicates
+
+    @staticmethod
+    def _record_identity(rec: Dict[str, Any]) -> Tuple[str, str, str]:
+        """(normalized magazine, qno, page) for a record, reusing precomputed keys."""
+        norm_mag = rec.get("normalized_magazine")
+        if norm_mag is None:
+            norm_mag = normalize_magazine_edition(rec.get("magazine", ""))
+        norm_qno = rec.get("normalized_qno")
+        if norm_qno is None:
+            norm_qno = normalize_qno(rec.get("question_number"))
+        norm_page = rec.get("normalized_page")
+        if norm_page is None:
+            norm_page = normalize_page(rec.get("page_range"))
+        return norm_mag, norm_qno, norm_page
+
+    @staticmethod
+    def _duplicate_entry(rec: Dict[str, Any], existing: sqlite3.Row | None) -> tuple:
+        return (
+            rec.get("magazine") or "",
+            rec.get("question_number") or "",
+            rec.get("page_range") or "",
+            str(existing["question_number"] or "") if existing else "",
+            str(existing["page_range"] or "") if existing else "",
+        )
+
+    @staticmethod
+    def _edition_fields(norm_mag: str) -> Tuple[str, int | None, int | None]:
+        """Split a normalized 'magazine|YYYY-MM' key into (edition, issue_year, issue_month)."""
+        edition = ""
+        issue_year = None
+        issue_month = None
+        if norm_mag:
+            parts = norm_mag.split("|", 1)
+            if len(parts) > 1:
+                edition = parts[1]
+                if len(edition) == 7 and edition[4] == "-":
+                    try:
+                        issue_year = int(edition[:4])
+                        issue_month = int(edition[5:7])
+                    except Exception:
+                        issue_year = None
+                        issue_month = None
+        return edition, issue_year, issue_month
+
+    @staticmethod
+    def _question_insert_row(
+        subject_id: int,
+        rec: Dict[str, Any],
+        norm_mag: str,
+        norm_qno: str,
+        norm_page: str,
+    ) -> Tuple:
+        """Build the questions INSERT tuple for a TSV record."""
+        edition, issue_year, issue_month = DatabaseService._edition_fields(norm_mag)
+        return (
+            subject_id,
+            rec.get("source") or "",
+            rec.get("magazine") or "",
+            norm_mag,
+            edition or rec.get("edition") or "",
+            issue_year,
+            issue_month,
+            rec.get("page_range") or "",
+            rec.get("question_set") or "",
+            rec.get("question_set_name") or "",
+            rec.get("chapter") or "",
+            rec.get("high_level_chapter") or "",
+            rec.get("question_number") or "",
+            rec.get("question_text") or "",
+            rec.get("answer_text"),
+            rec.get("explanation"),
+            rec.get("metadata_json"),
+            norm_qno,
+            norm_page,
+        )
+
     # ------------------------------------------------------------------
     # Images
     # ------------------------------------------------------------------
+    def image_optimization_settings(self) -> Dict[str, Any]:
+        """Ingest optimization settings: DEFAULT_OPTIMIZATION overlaid with the ImageOptimization config."""
+        settings = dict(DEFAULT_OPTIMIZATION)
+        try:
+            settings.update(self.load_config(IMAGE_OPTIMIZATION_CONFIG))
+        except sqlite3.Error:
+            pass
+        return settings
+
+    def _image_workers(self) -> ThreadPoolExecutor:
+        """Worker pool for Pillow decoding/re-encoding (Pillow releases the GIL while coding)."""
+        if self._image_pool is None:
+            self._image_pool = ThreadPoolExecutor(
+                max_workers=min(4, os.cpu_count() or 1),
+                thread_name_prefix="image-ingest",
+            )
+        return self._image_pool
+
+    @staticmethod
+    def _read_image_file(file_path: Path) -> Tuple[bytes, str]:
+        path = Path(file_path)
+        if not path.exists() or not path.is_file():
+            raise FileNotFoundError(f"Image file not found: {path}")
+        mime_type, _ = mimetypes.guess_type(path.name)
+        return path.read_bytes(), mime_type or "application/octet-stream"
+
     def add_question_image(self, question_id: int, kind: str, file_path: Path) -> int:
         """
         Store an image for a question.
@@ -502,56 +931,209 @@ class DatabaseService:
         Returns:
             Newly inserted image ID.
         """
-        path = Path(file_path)
-        if not path.exists() or not path.is_file():
-            raise FileNotFoundError(f"Image file not found: {path}")
+        settings = self.image_optimization_settings()
 
-        mime_type, _ = mimetypes.guess_type(path.name)
-        mime_type = mime_type or "application/octet-stream"
-        data = path.read_bytes()
+        def prepare() -> Dict[str, Any]:
+            data, mime_type = self._read_image_file(file_path)
+            return prepare_image(data, mime_type, settings)
 
-        with self._connect() as conn:
-            self.snapshot_database(f"Add {kind} image for question {question_id}")
-            cur = conn.execute(
-                """
-                INSERT INTO images (question_id, kind, mime_type, data)
-                VALUES (?, ?, ?, ?)
-                """,
-                (question_id, kind, mime_type, sqlite3.Binary(data)),
-            )
-            return cur.lastrowid or 0
+        return self._add_prepared_image(question_id, kind, self._image_workers().submit(prepare).result())
+
+    def add_question_images(self, question_id: int, kind: str, file_paths: List[Path]) -> Tuple[List[int], List[Path]]:
+        """
+        Store several image files for a question.
+
+        Files are read, optimized and thumbnailed in parallel on the image
+        worker pool, then inserted in one write job.
+
+        Returns (new image IDs, paths that could not be read).
+        """
+        settings = self.image_optimization_settings()
+
+        def prepare(path: Path) -> Dict[str, Any]:
+            data, mime_type = self._read_image_file(path)
+            return prepare_image(data, mime_type, settings)
+
+        paths = [Path(p) for p in file_paths]
+        futures = [self._image_workers().submit(prepare, path) for path in paths]
+        prepared_list: List[Dict[str, Any]] = []
+        failed: List[Path] = []
+        for path, future in zip(paths, futures):
+            try:
+                prepared_list.append(future.result())
+            except OSError:
+                failed.append(path)
+        if not prepared_list:
+            return [], failed
+        try:
+            return self._insert_images(question_id, kind, prepared_list), failed
+        finally:
+            self.image_presence.invalidate(question_id)
 
     def add_question_image_bytes(self, question_id: int, kind: str, data: bytes, mime_type: str = "application/octet-stream") -> int:
-        """Store an in-memory image blob for a question."""
+        """
+        Store an in-memory image blob for a question.
+
+        Identical bytes are stored once in image_blobs; optimization, the
+        thumbnail and metadata are computed on the image worker pool before
+        the write is queued, as in add_question_images.
+        """
+        settings = self.image_optimization_settings()
+        prepared = self._image_workers().submit(prepare_image, data, mime_type, settings).result()
+        return self._add_prepared_image(question_id, kind, prepared)
+
+    def _add_prepared_image(self, question_id: int, kind: str, prepared: Dict[str, Any]) -> int:
+        try:
+            return self._insert_images(question_id, kind, [prepared])[0]
+        finally:
+            self.image_presence.invalidate(question_id)
+
+    @_write_job
+    @_snapshot_job
+    def _insert_images(self, question_id: int, kind: str, prepared_list: List[Dict[str, Any]]) -> List[int]:
+        ids: List[int] = []
         with self._connect() as conn:
-            self.snapshot_database(f"Add {kind} image for question {question_id}")
-            cur = conn.execute(
-                """
-                INSERT INTO images (question_id, kind, mime_type, data)
-                VALUES (?, ?, ?, ?)
-                """,
-                (question_id, kind, mime_type, sqlite3.Binary(data)),
-            )
-            return cur.lastrowid or 0
+            noun = "image" if len(prepared_list) == 1 else f"{len(prepared_list)} images"
+            self.snapshot_database(f"Add {kind} {noun} for question {question_id}")
+            for prepared in prepared_list:
+                store_image(conn, prepared)
+                cur = conn.execute(
+                    """
+                    INSERT INTO images (question_id, kind, mime_type, data, blob_hash)
+                    VALUES (?, ?, ?, X'', ?)
+                    """,
+                    (question_id, kind, prepared["mime_type"], prepared["hash"]),
+                )
+                ids.append(cur.lastrowid or 0)
+        return ids
+
+    def reoptimize_images(
+        self,
+        batch_size: int = 16,
+        progress_callback: Callable[[int, int], None] | None = None,
+    ) -> Dict[str, int]:
+        """
+        Run the ingest optimizer over stored images that have not been through it.
+
+        Blobs are optimized on the image worker pool and written back one
+        batch per write job. Rewritten images get a new hash; rows are
+        re-pointed and the old blob is dropped. The job is resumable: blobs
+        are flagged as optimized once processed, whether or not they shrank.
+
+        Returns counts: processed, rewritten, bytes_before, bytes_after.
+        """
+        settings = dict(self.image_optimization_settings(), enabled=True)
+        with self._connect() as conn:
+            total = int(conn.execute("SELECT COUNT(*) FROM image_blobs WHERE optimized = 0").fetchone()[0])
+        stats = {"processed": 0, "rewritten": 0, "bytes_before": 0, "bytes_after": 0}
+        if not total:
+            return stats
+        self.snapshot_database(f"Auto-backup before re-optimizing {total} images")
+
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT hash, mime_type, data FROM image_blobs WHERE optimized = 0 LIMIT ?",
+                    (batch_size,),
+                ).fetchall()
+            if not rows:
+                break
+            futures = [
+                self._image_workers().submit(prepare_image, row["data"], row["mime_type"], settings)
+                for row in rows
+            ]
+            batch = [(row["hash"], future.result()) for row, future in zip(rows, futures)]
+            self._apply_reoptimized(batch)
+
+            for (old_hash, prepared), row in zip(batch, rows):
+                stats["processed"] += 1
+                stats["bytes_before"] += len(row["data"])
+                stats["bytes_after"] += len(prepared["data"])
+                if prepared["hash"] != old_hash:
+                    stats["rewritten"] += 1
+            if progress_callback:
+                progress_callback(stats["processed"], total)
+        return stats
+
+    @_write_job
+    def _apply_reoptimized(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        with self._connect() as conn:
+            for old_hash, prepared in batch:
+                store_image(conn, prepared)
+                if prepared["hash"] == old_hash:
+                    continue
+                conn.execute(
+                    "UPDATE images SET blob_hash = ?, mime_type = ? WHERE blob_hash = ?",
+                    (prepared["hash"], prepared["mime_type"], old_hash),
+                )
+                release_orphans(conn, [old_hash])
 
     def get_image_counts(self, question_id: int) -> Dict[str, int]:
-        """Return a dict of image counts grouped by kind for a question."""
+        """Return a dict of image counts grouped by kind for a question (served from the presence cache)."""
+        counts = self.image_presence.get(question_id)
+        if counts is None:
+            self.image_presence.prime([question_id], self.get_image_counts_bulk)
+            counts = self.image_presence.get(question_id) or {}
+        return counts
+
+    def has_images(self, question_id: int) -> bool:
+        """True when the question has at least one stored image of any kind."""
+        return any(v > 0 for v in self.get_image_counts(question_id).values())
+
+    def get_image_counts_bulk(self, question_ids: List[int], chunk_size: int = 500) -> Dict[int, ImageCounts]:
+        """
+        Return {question_id: {kind: count}} for many questions in a few queries.
+
+        IDs are queried in chunks to stay below SQLite's bound-parameter limit.
+        Questions without images are absent from the result. Bypasses the cache.
+        """
+        ids = list(dict.fromkeys(int(qid) for qid in question_ids))
+        result: Dict[int, ImageCounts] = {}
+        if not ids:
+            return result
         with self._connect() as conn:
-            rows = conn.execute(
-                "SELECT kind, COUNT(*) as cnt FROM images WHERE question_id = ? GROUP BY kind",
-                (question_id,),
-            ).fetchall()
-        return {row["kind"]: int(row["cnt"]) for row in rows}
+            for start in range(0, len(ids), chunk_size):
+                chunk = ids[start : start + chunk_size]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = conn.execute(
+                    f"""
+                    SELECT question_id, kind, COUNT(*) AS cnt
+                    FROM images
+                    WHERE question_id IN ({placeholders})
+                    GROUP BY question_id, kind
+                    """,
+                    chunk,
+                ).fetchall()
+                for row in rows:
+                    result.setdefault(int(row["question_id"]), {})[row["kind"]] = int(row["cnt"])
+        return result
+
+    def question_ids_with_images(self) -> set[int]:
+        """
+        Ids of every question with at least one image, read from the database.
+
+        Unlike the presence cache this never misses questions that were not
+        primed or whose entry was dropped after an image was added or deleted.
+        """
+        with self._connect() as conn:
+            rows = conn.execute("SELECT DISTINCT question_id FROM images WHERE question_id IS NOT NULL").fetchall()
+        return {int(row["question_id"]) for row in rows}
+
+    def prime_image_counts(self, question_ids: List[int]) -> None:
+        """Load image counts for a whole dataset into the presence cache up front."""
+        self.image_presence.prime(question_ids, self.get_image_counts_bulk)
 
     def get_images(self, question_id: int, kind: str) -> List[Dict[str, Any]]:
-        """Return images for a question/kind."""
+        """Return full-resolution images (with width/height/format when known) for a question/kind."""
         with self._connect() as conn:
             rows = conn.execute(
                 """
-                SELECT id, mime_type, data
-                FROM images
-                WHERE question_id = ? AND kind = ?
-                ORDER BY id
+                SELECT i.id, i.mime_type, COALESCE(b.data, i.data) AS data,
+                       b.width, b.height, b.format
+                FROM images i
+                LEFT JOIN image_blobs b ON b.hash = i.blob_hash
+                WHERE i.question_id = ? AND i.kind = ?
+                ORDER BY i.id
                 """,
                 (question_id, kind),
             ).fetchall()
@@ -562,33 +1144,119 @@ class DatabaseService:
                     "id": int(row["id"]),
                     "mime_type": row["mime_type"] or "application/octet-stream",
                     "data": row["data"],
+                    "width": row["width"],
+                    "height": row["height"],
+                    "format": row["format"],
                 }
             )
         return result
 
+    def get_image_thumbnails(self, question_id: int, kind: str) -> List[Dict[str, Any]]:
+        """
+        Return preview-sized images for a question/kind.
+
+        Blobs migrated from the old images table have no thumbnail yet: they
+        are returned at full size, and the thumbnail is generated once on the
+        image worker pool and saved through the writer. Images Pillow cannot
+        decode stay at full size.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT i.id, i.mime_type, i.blob_hash, b.thumb, b.thumb_mime,
+                       CASE WHEN b.thumb IS NULL THEN COALESCE(b.data, i.data) END AS data
+                FROM images i
+                LEFT JOIN image_blobs b ON b.hash = i.blob_hash
+                WHERE i.question_id = ? AND i.kind = ?
+                ORDER BY i.id
+                """,
+                (question_id, kind),
+            ).fetchall()
+        result: List[Dict[str, Any]] = []
+        for row in rows:
+            thumb, thumb_mime = row["thumb"], row["thumb_mime"]
+            if thumb is None:
+                thumb, thumb_mime = row["data"], row["mime_type"]
+                if thumb and row["blob_hash"]:
+                    self._queue_thumbnail(row["blob_hash"], bytes(thumb), row["mime_type"])
+            result.append(
+                {
+                    "id": int(row["id"]),
+                    "mime_type": thumb_mime or "application/octet-stream",
+                    "data": thumb,
+                }
+            )
+        return result
+
+    def _queue_thumbnail(self, blob_hash: str, data: bytes, mime_type: str | None) -> Future:
+        """Generate a blob's missing thumbnail off the calling thread, at most once per blob."""
+        job = self._thumbnail_jobs.get(blob_hash)
+        if job is None:
+            job = self._thumbnail_jobs[blob_hash] = self._image_workers().submit(
+                self._build_thumbnail, blob_hash, data, mime_type
+            )
+        return job
+
+    def _build_thumbnail(self, blob_hash: str, data: bytes, mime_type: str | None) -> None:
+        try:
+            prepared = prepare_image(data, mime_type)
+            if prepared["thumb"] is not None:
+                self._store_thumbnail(blob_hash, prepared)
+        except Exception as exc:
+            print(f"Warning: Could not create thumbnail for image {blob_hash}: {exc}")
+
+    @_write_job
+    def _store_thumbnail(self, blob_hash: str, prepared: Dict[str, Any]) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                UPDATE image_blobs
+                SET thumb = ?, thumb_mime = ?,
+                    format = COALESCE(format, ?),
+                    width = COALESCE(width, ?),
+                    height = COALESCE(height, ?)
+                WHERE hash = ? AND thumb IS NULL
+                """,
+                (
+                    sqlite3.Binary(prepared["thumb"]),
+                    prepared["thumb_mime"],
+                    prepared["format"],
+                    prepared["width"],
+                    prepared["height"],
+                    blob_hash,
+                ),
+            )
+
     def delete_images(self, question_id: int, kind: str | None = None) -> int:
         """
         Delete images for a question. If kind is provided, only that category is removed.
 
         Returns the number of deleted rows.
         """
+        try:
+            return self._delete_images(question_id, kind)
+        finally:
+            self.image_presence.invalidate(question_id)
+
+    @_write_job
+    @_snapshot_job
+    def _delete_images(self, question_id: int, kind: str | None) -> int:
         with self._connect() as conn:
             self.snapshot_database(f"Delete images ({kind or 'all'}) for question {question_id}")
             if kind:
-                cur = conn.execute(
-                    "DELETE FROM images WHERE question_id = ? AND kind = ?",
-                    (question_id, kind),
-                )
+                where, params = "question_id = ? AND kind = ?", (question_id, kind)
             else:
-                cur = conn.execute(
-                    "DELETE FROM images WHERE question_id = ?",
-                    (question_id,),
-                )
+                where, params = "question_id = ?", (question_id,)
+            hashes = [row["blob_hash"] for row in conn.execute(f"SELECT blob_hash FROM images WHERE {where}", params)]
+            cur = conn.execute(f"DELETE FROM images WHERE {where}", params)
+            release_orphans(conn, hashes)
             return cur.rowcount or 0
 
     # ------------------------------------------------------------------
     # Question updates
     # ------------------------------------------------------------------
+    @_write_job
+    @_snapshot_job
     def update_question_fields(self, question_id: int, fields: Dict[str, Any]) -> None:
         """Update allowed fields on a question row."""
         if not fields:
@@ -607,6 +1275,22 @@ class DatabaseService:
         updates = {k: v for k, v in fields.items() if k in allowed}
         if not updates:
             return
+        # Keep the persisted duplicate-detection keys in step with the raw values.
+        if "magazine" in updates:
+            norm_mag = normalize_magazine_edition(updates["magazine"])
+            updates["normalized_magazine"] = norm_mag
+            # Derive the edition columns the same way the import path does, but only
+            # when an issue was found; otherwise ("name|name") keep the stored ones.
+            name, _, issue = norm_mag.partition("|")
+            if issue and issue != name:
+                edition, issue_year, issue_month = self._edition_fields(norm_mag)
+                updates["edition"] = edition
+                updates["issue_year"] = issue_year
+                updates["issue_month"] = issue_month
+        if "question_number" in updates:
+            updates["normalized_qno"] = normalize_qno(updates["question_number"])
+        if "page_range" in updates:
+            updates["normalized_page"] = normalize_page(updates["page_range"])
 
         self.snapshot_database(f"Update question {question_id}")
 
@@ -614,12 +1298,157 @@ class DatabaseService:
         values = list(updates.values())
         values.append(question_id)
         with self._connect() as conn:
-            conn.execute(f"UPDATE questions SET {set_clause}, updated_at = CURRENT_TIMESTAMP WHERE id = ?", values)
+            try:
+                conn.execute(f"UPDATE questions SET {set_clause}, updated_at = CURRENT_TIMESTAMP WHERE id = ?", values)
+            except sqlite3.IntegrityError as exc:
+                if "UNIQUE" not in str(exc):
+                    raise
+                raise ValueError(self._duplicate_edit_message(conn, question_id, updates)) from exc
+
+    def _duplicate_edit_message(self, conn: sqlite3.Connection, question_id: int, updates: Dict[str, Any]) -> str:
+        """Describe the question an edit would collide with on the identity index."""
+        row = conn.execute(
+            """
+            SELECT subject_id, magazine, question_number, page_range,
+                   normalized_magazine, normalized_qno, normalized_page
+            FROM questions WHERE id = ?
+            """,
+            (question_id,),
+        ).fetchone()
+        if row is None:
+            return "Another question already has this magazine, question number and page."
+        merged = {k: row[k] for k in row.keys()}
+        merged.update(updates)
+        existing = self._find_existing_question(
+            conn,
+            int(merged["subject_id"]),
+            merged["normalized_magazine"],
+            merged["normalized_qno"],
+            merged["normalized_page"],
+        )
+        other = f" (question id {existing['id']})" if existing is not None else ""
+        return (
+            f"Duplicate question: another question in this subject{other} already has "
+            f"magazine '{merged['magazine'] or ''}', question {merged['question_number'] or ''}, "
+            f"page {merged['page_range'] or ''}."
+        )
+
+    @staticmethod
+    def _parse_list_metadata(row: sqlite3.Row) -> Dict[str, Any]:
+        meta: Dict[str, Any] = {}
+        if row["metadata_json"]:
+            try:
+                meta = json.loads(row["metadata_json"])
+            except json.JSONDecodeError:
+                meta = {}
+        created_at = row["created_at"] if "created_at" in row.keys() else None
+        if created_at:
+            meta["_created_at"] = created_at
+        return meta
+
+    @staticmethod
+    def _list_item_to_question(item: sqlite3.Row) -> Dict[str, Any]:
+        magazine = item["magazine"] or ""
+        edition = item["edition"] or ""
+        mag_edition = f"{magazine} | {edition}" if magazine or edition else ""
+        return {
+            "group": item["high_level_chapter"] or item["chapter"] or "",
+            "question_set": item["question_set"] or "",
+            "question_set_name": item["question_set_name"] or item["question_set"] or "",
+            "group_key": item["question_set_name"] or item["question_set"] or "",
+            "qno": item["question_number"] or "",
+            "page": item["page_range"] or "",
+            "magazine": mag_edition,
+            "text": item["question_text"] or "",
+            "row_number": item["id"],
+            "question_id": item["id"],
+        }
+
+    def _fetch_list_items(self, conn: sqlite3.Connection, list_id: int) -> List[Dict[str, Any]]:
+        item_rows = conn.execute(
+            """
+            SELECT q.id, q.magazine, q.edition, q.high_level_chapter, q.chapter, q.question_set,
+                   q.question_set_name, q.question_number, q.page_range, q.question_text
+            FROM question_list_items qi
+            JOIN questions q ON q.id = qi.question_id
+            WHERE qi.list_id = ?
+            ORDER BY qi.position
+            """,
+            (list_id,),
+        ).fetchall()
+        return [self._list_item_to_question(item) for item in item_rows]
+
+    def load_question_list_summaries(self) -> List[Dict[str, Any]]:
+        """
+        Return one summary per saved list without loading list items.
+
+        Each summary has: name, metadata (metadata_json plus _created_at), created_at,
+        count, magazine_names (distinct magazine names of the items) and archived.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                WITH items AS (
+                    SELECT qi.list_id, COALESCE(q.magazine, '') AS magazine
+                    FROM question_list_items qi
+                    JOIN questions q ON q.id = qi.question_id
+                ),
+                counts AS (
+                    SELECT list_id, COUNT(*) AS item_count
+                    FROM items
+                    GROUP BY list_id
+                ),
+                mags AS (
+                    SELECT list_id, GROUP_CONCAT(mag, char(31)) AS magazine_names
+                    FROM (
+                        SELECT DISTINCT list_id,
+                               TRIM(CASE WHEN instr(magazine, '|') > 0
+                                         THEN substr(magazine, 1, instr(magazine, '|') - 1)
+                                         ELSE magazine END) AS mag
+                        FROM items
+                    )
+                    WHERE mag <> ''
+                    GROUP BY list_id
+                )
+                SELECT ql.id, ql.name, ql.metadata_json, ql.created_at,
+                       COALESCE(c.item_count, 0) AS item_count, m.magazine_names
+                FROM question_lists ql
+                LEFT JOIN counts c ON c.list_id = ql.id
+                LEFT JOIN mags m ON m.list_id = ql.id
+                """
+            ).fetchall()
+
+        summaries: List[Dict[str, Any]] = []
+        for row in rows:
+            meta = self._parse_list_metadata(row)
+            magazine_names = sorted(set((row["magazine_names"] or "").split("\x1f")) - {""})
+            summaries.append(
+                {
+                    "name": row["name"],
+                    "metadata": meta,
+                    "created_at": meta.get("_created_at") or "",
+                    "count": int(row["item_count"] or 0),
+                    "magazine_names": magazine_names,
+                    "archived": bool(meta.get("archived")),
+                }
+            )
+        return summaries
+
+    def load_question_list_items(self, list_name: str) -> List[Dict[str, Any]]:
+        """Return the question dicts of a single saved list, in list order."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT id FROM question_lists WHERE name = ?", (list_name,)).fetchone()
+            if not row:
+                return []
+            return self._fetch_list_items(conn, int(row["id"]))
 
     def load_question_lists(self) -> Tuple[Dict[str, List[Dict[str, Any]]], Dict[str, Dict[str, Any]]]:
         """
         Return (question_lists, metadata) where question_lists is name -> list[dict],
         metadata is name -> dict (metadata_json contents).
+
+        Loads every list's items; prefer load_question_list_summaries plus
+        load_question_list_items when only some lists are needed.
         """
         question_lists: Dict[str, List[Dict[str, Any]]] = {}
         metadata: Dict[str, Dict[str, Any]] = {}
@@ -627,52 +1456,13 @@ class DatabaseService:
         with self._connect() as conn:
             list_rows = conn.execute("SELECT id, name, metadata_json, created_at FROM question_lists").fetchall()
             for list_row in list_rows:
-                list_id = list_row["id"]
                 list_name = list_row["name"]
-                meta = {}
-                if list_row["metadata_json"]:
-                    try:
-                        meta = json.loads(list_row["metadata_json"])
-                    except json.JSONDecodeError:
-                        meta = {}
-                created_at = list_row["created_at"] if "created_at" in list_row.keys() else None
-                if created_at:
-                    meta["_created_at"] = created_at
-                metadata[list_name] = meta
-
-                item_rows = conn.execute(
-                    """
-                    SELECT q.*, qi.position
-                    FROM question_list_items qi
-                    JOIN questions q ON q.id = qi.question_id
-                    WHERE qi.list_id = ?
-                    ORDER BY qi.position
-                    """,
-                    (list_id,),
-                ).fetchall()
-
-                questions: List[Dict[str, Any]] = []
-                for item in item_rows:
-                    magazine = item["magazine"] or ""
-                    edition = item["edition"] or ""
-                    mag_edition = f"{magazine} | {edition}" if magazine or edition else ""
-                    questions.append(
-                        {
-                            "group": item["high_level_chapter"] or item["chapter"] or "",
-                            "question_set": item["question_set"] or "",
-                            "question_set_name": item["question_set_name"] or item["question_set"] or "",
-                            "group_key": item["question_set_name"] or item["question_set"] or "",
-                            "qno": item["question_number"] or "",
-                            "page": item["page_range"] or "",
-                            "magazine": mag_edition,
-                            "text": item["question_text"] or "",
-                            "row_number": item["id"],
-                            "question_id": item["id"],
-                        }
-                    )
-                question_lists[list_name] = questions
+                metadata[list_name] = self._parse_list_metadata(list_row)
+                question_lists[list_name] = self._fetch_list_items(conn, int(list_row["id"]))
         return question_lists, metadata
 
+    @_write_job
+    @_snapshot_job
     def save_question_list(self, list_name: str, questions: List[Dict[str, Any]], metadata: Dict[str, Any]) -> None:
         meta_json = json.dumps(metadata or {}, indent=2)
         self.snapshot_database(f"Save question list {list_name}")
@@ -707,6 +1497,8 @@ class DatabaseService:
                 )
                 position += 1
 
+    @_write_job
+    @_snapshot_job
     def set_list_archived(self, list_name: str, archived: bool) -> None:
         """Mark a saved list as archived by updating its metadata."""
         with self._connect() as conn:
@@ -740,6 +1532,8 @@ class DatabaseService:
             meta = {}
         return meta.get("theory_latex", "") or ""
 
+    @_write_job
+    @_snapshot_job
     def set_list_theory(self, list_name: str, theory_text: str) -> None:
         with self._connect() as conn:
             self.snapshot_database(f"Update theory for list {list_name}")
@@ -761,6 +1555,8 @@ class DatabaseService:
                 (list_name, meta_json),
             )
 
+    @_write_job
+    @_snapshot_job
     def delete_question_list(self, list_name: str) -> None:
         with self._connect() as conn:
             row = conn.execute("SELECT id FROM question_lists WHERE name = ?", (list_name,)).fetchone()
@@ -769,6 +1565,8 @@ class DatabaseService:
             self.snapshot_database(f"Delete question list {list_name}")
             conn.execute("DELETE FROM question_lists WHERE id = ?", (row["id"],))
 
+    @_write_job
+    @_snapshot_job
     def update_questions_chapter(self, question_ids: List[int], target_group: str) -> None:
         if not question_ids:
             return
@@ -782,55 +1580,9 @@ class DatabaseService:
     # ------------------------------------------------------------------
     # Exams (.cqt import)
     # ------------------------------------------------------------------
-    def _ensure_exam_tables(self) -> None:
-        with self._connect() as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS exams (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT,
-                    list_name TEXT,
-                    imported_at TEXT,
-                    evaluated INTEGER DEFAULT 0,
-                    evaluated_at TEXT,
-                    total_questions INTEGER,
-                    answered INTEGER,
-                    correct INTEGER,
-                    wrong INTEGER,
-                    score INTEGER,
-                    percent REAL,
-                    source_path TEXT,
-                    payload_json TEXT
-                )
-                """
-            )
-            self._add_column_if_missing(conn, "exam_questions", "eval_status", "TEXT")
-            self._add_column_if_missing(conn, "exam_questions", "eval_comment", "TEXT")
-
-    def _add_column_if_missing(self, conn: sqlite3.Connection, table: str, column: str, col_type: str) -> None:
-        cols = [row["name"] for row in conn.execute(f"PRAGMA table_info({table})")]
-        if column not in cols:
-            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS exam_questions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    exam_id INTEGER NOT NULL,
-                    q_index INTEGER,
-                    question_json TEXT,
-                    response_json TEXT,
-                    correct INTEGER,
-                    answered INTEGER,
-                    score INTEGER,
-                    FOREIGN KEY(exam_id) REFERENCES exams(id) ON DELETE CASCADE
-                )
-                """
-            )
-
     def import_exam_from_cqt(self, path: str, package_password: str) -> Dict[str, Any]:
         """Import a .cqt package, compute stats, and persist as an exam record."""
         self.snapshot_database("Import exam from CQT")
-        self._ensure_exam_tables()
         payload = load_cqt(path, package_password)
         questions = payload.get("questions", [])
         responses = payload.get("responses", {}) or {}
@@ -910,7 +1662,41 @@ class DatabaseService:
         percent = (correct_cnt * 4 / (total * 4)) * 100 if total else 0.0
         imported_at = datetime.utcnow().isoformat() + "Z"
 
-        exam_id = None
+        exam_id = self._insert_exam(
+            (
+                Path(path).name,
+                payload.get("list_name", ""),
+                imported_at,
+                1 if evaluated else 0,
+                evaluated_at if evaluated else None,
+                total,
+                answered_cnt,
+                correct_cnt,
+                wrong_cnt,
+                score,
+                percent,
+                str(path),
+                json.dumps(payload, ensure_ascii=False),
+            ),
+            question_rows,
+        )
+
+        return {
+            "exam_id": exam_id,
+            "imported_at": imported_at,
+            "total": total,
+            "answered": answered_cnt,
+            "correct": correct_cnt,
+            "wrong": wrong_cnt,
+            "score": score,
+            "percent": percent,
+            "evaluated": evaluated,
+            "evaluated_at": evaluated_at,
+        }
+
+    @_write_job
+    def _insert_exam(self, exam_row: Tuple, question_rows: List[Tuple]) -> int | None:
+        """Persist an exam row and its questions; runs on the writer thread."""
         with self._connect() as conn:
             cur = conn.execute(
                 """
@@ -919,21 +1705,7 @@ class DatabaseService:
                     answered, correct, wrong, score, percent, source_path, payload_json
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    Path(path).name,
-                    payload.get("list_name", ""),
-                    imported_at,
-                    1 if evaluated else 0,
-                    evaluated_at if evaluated else None,
-                    total,
-                    answered_cnt,
-                    correct_cnt,
-                    wrong_cnt,
-                    score,
-                    percent,
-                    str(path),
-                    json.dumps(payload, ensure_ascii=False),
-                ),
+                exam_row,
             )
             exam_id = cur.lastrowid
             conn.executemany(
@@ -944,22 +1716,9 @@ class DatabaseService:
                 """,
                 [(exam_id, *row) for row in question_rows],
             )
-
-        return {
-            "exam_id": exam_id,
-            "imported_at": imported_at,
-            "total": total,
-            "answered": answered_cnt,
-            "correct": correct_cnt,
-            "wrong": wrong_cnt,
-            "score": score,
-            "percent": percent,
-            "evaluated": evaluated,
-            "evaluated_at": evaluated_at,
-        }
+        return exam_id
 
     def list_exams(self) -> List[Dict[str, Any]]:
-        self._ensure_exam_tables()
         with self._connect() as conn:
             rows = conn.execute(
                 """
@@ -973,7 +1732,6 @@ class DatabaseService:
         return result
 
     def get_exam_questions(self, exam_id: int) -> List[Dict[str, Any]]:
-        self._ensure_exam_tables()
         with self._connect() as conn:
             rows = conn.execute(
                 """
@@ -1009,27 +1767,28 @@ class DatabaseService:
         return result
 
     def get_exam_by_id(self, exam_id: int) -> Dict[str, Any] | None:
-        self._ensure_exam_tables()
         with self._connect() as conn:
             row = conn.execute("SELECT * FROM exams WHERE id = ?", (exam_id,)).fetchone()
         if not row:
             return None
         return {k: row[k] for k in row.keys()}
 
+    @_write_job
+    @_snapshot_job
     def delete_exam(self, exam_id: int) -> None:
         """Delete an exam and its questions."""
-        self._ensure_exam_tables()
         self.snapshot_database(f"Delete exam {exam_id}")
         with self._connect() as conn:
             conn.execute("DELETE FROM exams WHERE id = ?", (exam_id,))
 
+    @_write_job
+    @_snapshot_job
     def update_exam_question_evaluation(self, exam_id: int, q_index: int, status: str, comment: str) -> Dict[str, Any]:
         """
         Override evaluation for a question and recompute exam aggregates.
         status: 'correct' | 'incorrect' | 'unanswered'
         comment: required note for this override
         """
-        self._ensure_exam_tables()
         if not comment:
             raise ValueError("Evaluation comment is required.")
         status = (status or "").lower()
@@ -1,21 +1,23 @@
 """
-TSV import helpers that write directly to SQLite (no Excel workbooks).
+TSV and XLSX import helpers that write directly to SQLite.
 """
 
 from __future__ import annotations
 
 import csv
+import io
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional, TextIO
 
-from config.constants import MAGAZINE_GROUPING_MAP
+from config.constants import MAGAZINE_GROUPING_MAP, TSV_IMPORT_CHUNK_ROWS
 from services.db_service import DatabaseService
 from utils.helpers import (
     normalize_magazine_edition,
     normalize_qno,
     normalize_page,
-    validate_tsv,
 )
 
 
@@ -53,134 +55,424 @@ def read_tsv_rows(tsv_path: Path) -> list[list[str]]:
 # TSV -> DB import
 # ---------------------------------------------------------------------------
 
+class _ImportSummary:
+    """Running totals kept while TSV records stream into the database."""
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.first_page = ""
+        self.last_page = ""
+        self.min_page: int | None = None
+        self.max_page: int | None = None
+
+    def add_page(self, page: str) -> None:
+        if not page:
+            return
+        if not self.first_page:
+            self.first_page = page
+        self.last_page = page
+        match = re.search(r"\d+", page)
+        if match:
+            number = int(match.group())
+            self.min_page = number if self.min_page is None else min(self.min_page, number)
+            self.max_page = number if self.max_page is None else max(self.max_page, number)
+
+    def page_range(self) -> str:
+        if self.min_page is not None:
+            return str(self.min_page) if self.min_page == self.max_page else f"{self.min_page}-{self.max_page}"
+        if not self.first_page:
+            return "N/A"
+        return self.first_page if self.first_page == self.last_page else f"{self.first_page}-{self.last_page}"
+
+
+def _iter_question_records(
+    header_row: list[str],
+    numbered_rows: Iterable[tuple[int | None, list[str]]],
+    source: str,
+    summary: _ImportSummary,
+    single_edition: bool = True,
+) -> Iterator[dict]:
+    """Detect the question columns in `header_row` and yield validated records for `numbered_rows`."""
+    # Find required columns
+    qno_column = _find_qno_column(header_row)
+    magazine_col = _find_magazine_column(header_row)
+    question_set_col = _find_question_set_column(header_row)
+    page_col = _find_page_column(header_row)
+    try:
+        question_text_col = _find_question_text_column(header_row)
+    except ValueError:
+        question_text_col = None
+    try:
+        chapter_col = _find_high_level_chapter_column(header_row)
+    except ValueError:
+        chapter_col = None
+
+    for line_no, row, signature in _iter_validated_rows(
+        numbered_rows, magazine_col, question_set_col, qno_column, page_col, single_edition
+    ):
+        normalized_magazine, normalized_qno, normalized_page, mag_val, qno_val, page_val = signature
+        qset_val = row[question_set_col - 1].strip()
+        qtext_val = row[question_text_col - 1].strip() if question_text_col else ""
+        chapter_val = row[chapter_col - 1].strip() if chapter_col else ""
+        summary.rows += 1
+        summary.add_page(page_val)
+        yield {
+            "source": source,
+            "source_line": line_no,
+            "magazine": mag_val,
+            "edition": "",
+            "page_range": page_val,
+            "question_set": qset_val,
+            "question_set_name": qset_val,
+            "chapter": chapter_val,
+            "high_level_chapter": chapter_val,
+            "question_number": qno_val,
+            "question_text": qtext_val,
+            "normalized_magazine": normalized_magazine,
+            "normalized_qno": normalized_qno,
+            "normalized_page": normalized_page,
+        }
+
+
+def iter_tsv_records(
+    tsv_source: str | os.PathLike | TextIO | Iterable[str],
+    summary: _ImportSummary | None = None,
+    name: str = "TSV",
+) -> Iterator[dict]:
+    """
+    Parse, validate and normalize TSV data in one streaming pass.
+
+    tsv_source is a file path (str or Path), or an open text stream / iterable of lines
+    (e.g. io.StringIO(text, newline="")) so pasted text needs no temp file;
+    `name` labels error messages for non-file sources.
+    Yields insert-ready question records (including the normalized identity
+    keys) one row at a time, so memory use does not grow with file size.
+    Raises ValueError naming the offending line on the first bad row.
+    """
+    summary = summary if summary is not None else _ImportSummary()
+    if isinstance(tsv_source, (str, os.PathLike)):
+        tsv_path = Path(tsv_source)
+        with tsv_path.open("r", encoding="utf-8", newline="") as tsv_file:
+            yield from _iter_tsv_lines(tsv_file, tsv_path.name, str(tsv_path), summary)
+    else:
+        yield from _iter_tsv_lines(tsv_source, name, name, summary)
+
+    if not summary.rows:
+        raise ValueError("Unable to identify magazine edition in the TSV file.")
+
+
+def _iter_tsv_lines(lines: Iterable[str], name: str, source: str, summary: _ImportSummary) -> Iterator[dict]:
+    reader = csv.reader(lines, delimiter="\t")
+    header_row = next(reader, None)
+    if header_row is None:
+        raise ValueError(f"{name} is empty or missing a header row.")
+    if not any(cell.strip() for cell in header_row):
+        raise ValueError("TSV header row is empty.")
+
+    column_count = len(header_row)
+
+    def numbered_rows() -> Iterator[tuple[int, list[str]]]:
+        for row in reader:
+            if len(row) != column_count:
+                raise ValueError(
+                    f"{name} line {reader.line_num}: expected {column_count} columns but found {len(row)}."
+                )
+            yield reader.line_num, row
+
+    yield from _iter_question_records(header_row, numbered_rows(), source, summary)
+
+
+# ---------------------------------------------------------------------------
+# XLSX -> DB import
+# ---------------------------------------------------------------------------
+
+def open_xlsx_workbook(xlsx_path: Path):
+    """Open a workbook for streaming (read-only, cached cell values instead of formulas)."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:
+        raise RuntimeError("openpyxl is required to import .xlsx files (pip install openpyxl).") from exc
+    return load_workbook(xlsx_path, read_only=True, data_only=True)
+
+
+def _cell_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def iter_xlsx_records(
+    worksheet,
+    source: str,
+    summary: _ImportSummary | None = None,
+    magazine_name: str | None = None,
+) -> Iterator[dict]:
+    """
+    Stream question records from one worksheet of a read-only workbook.
+
+    The first row is the header and is matched like a TSV header. Rows with
+    no question text (or no cells at all) are skipped, and a sheet may hold
+    several magazine editions; (edition, qno, page) must still be unique.
+    When the edition column holds only the issue ("Jan 2023"), pass
+    `magazine_name` and it is prefixed as "Magazine | Jan 2023" so the
+    edition normalizes like a TSV import. A sheet without a header yields nothing.
+    """
+    summary = summary if summary is not None else _ImportSummary()
+    rows = worksheet.iter_rows(values_only=True)
+    header = next(rows, None)
+    header_row = [_cell_text(value) for value in header or ()]
+    if not any(header_row):
+        return
+    column_count = len(header_row)
+    magazine_index = _find_magazine_column(header_row) - 1
+    try:
+        text_index = _find_question_text_column(header_row) - 1
+    except ValueError:
+        text_index = None
+
+    def numbered_rows() -> Iterator[tuple[int, list[str]]]:
+        for line_no, values in enumerate(rows, start=2):
+            row = [_cell_text(value) for value in values[:column_count]]
+            row.extend([""] * (column_count - len(row)))
+            if not any(row) or (text_index is not None and not row[text_index]):
+                continue
+            if magazine_name and row[magazine_index] and "|" not in row[magazine_index]:
+                row[magazine_index] = f"{magazine_name} | {row[magazine_index]}"
+            yield line_no, row
+
+    yield from _iter_question_records(header_row, numbered_rows(), source, summary, single_edition=False)
+
+    if not summary.rows:
+        raise ValueError(f"Sheet '{worksheet.title}' has a header but no question rows.")
+
+
+def _import_status(inserted_ids: list[int], duplicates: list[tuple], summary: _ImportSummary) -> str:
+    """Build the per-file status line, raising ValueError when duplicates were found."""
+    if duplicates:
+        readable = "; ".join(
+            f"Magazine '{mag}' Question '{qno}' Page '{page}' already exists (DB has Qno '{ex_qno}', Page '{ex_page}')"
+            for mag, qno, page, ex_qno, ex_page in duplicates
+        )
+        raise ValueError(
+            "Duplicate questions detected: "
+            f"{readable}. Remove or update these entries before importing."
+        )
+
+    return f"Inserted {len(inserted_ids)} rows (IDs: {_id_range(inserted_ids)}, Pages: {summary.page_range()})"
+
+
+def _id_range(inserted_ids: list[int]) -> str:
+    if not inserted_ids:
+        return "N/A"
+    return f"{min(inserted_ids)}-{max(inserted_ids)}" if len(inserted_ids) > 1 else str(inserted_ids[0])
+
+
+def _import_error(exc: Exception) -> Exception:
+    if isinstance(exc, ValueError):
+        return ValueError(f"TSV processing failed: {exc}")
+    return RuntimeError(f"Unexpected error during TSV processing: {exc}")
+
+
+def _delete_tsv(tsv_path: Path) -> None:
+    try:
+        if tsv_path.exists():
+            tsv_path.unlink()
+    except Exception as delete_exc:
+        print(f"Warning: Could not delete TSV file {tsv_path}: {delete_exc}")
+
+
 def process_tsv(tsv_path: Path, db_service: DatabaseService, subject_name: str) -> str:
     """
     Process a TSV file and insert rows into SQLite.
 
-    - Validates TSV format
+    - Streams the file once: parse, validate, normalize and insert per row
     - Uses TSV header to detect required columns
     - Detects duplicates in DB (subject + magazine + page + qno)
-    - Inserts rows into questions table
+    - Inserts rows into questions table (all-or-nothing on validation errors)
     - Returns status with ID range inserted
     """
     try:
-        validate_tsv(tsv_path)
-        header_row, rows = read_tsv_with_header(tsv_path)
-        if not header_row:
-            raise ValueError("TSV header row is empty.")
-
-        # Find required columns
-        qno_column = _find_qno_column(header_row)
-        magazine_col = _find_magazine_column(header_row)
-        question_set_col = _find_question_set_column(header_row)
-        page_col = _find_page_column(header_row)
-        question_text_col = None
-        try:
-            question_text_col = _find_question_text_column(header_row)
-        except ValueError:
-            question_text_col = None
-        chapter_col = None
-        try:
-            chapter_col = _find_high_level_chapter_column(header_row)
-        except ValueError:
-            chapter_col = None
-
-        # Validate TSV metadata
-        _, row_signatures = extract_file_metadata(
-            rows, magazine_col, question_set_col, qno_column, page_col
+        summary = _ImportSummary()
+        inserted_ids, duplicates = db_service.insert_questions_from_tsv(
+            subject_name, iter_tsv_records(tsv_path, summary)
         )
+        return _import_status(inserted_ids, duplicates, summary)
+    except Exception as exc:
+        raise _import_error(exc) from exc
+    finally:
+        _delete_tsv(tsv_path)
 
-        records = []
-        page_numbers = []
-        for row in rows:
-            mag_val = row[magazine_col - 1].strip() if len(row) >= magazine_col else ""
-            qno_val = row[qno_column - 1].strip() if len(row) >= qno_column else ""
-            page_val = row[page_col - 1].strip() if len(row) >= page_col else ""
-            qset_val = row[question_set_col - 1].strip() if len(row) >= question_set_col else ""
-            qtext_val = (
-                row[question_text_col - 1].strip()
-                if question_text_col and len(row) >= question_text_col
-                else ""
-            )
-            chapter_val = (
-                row[chapter_col - 1].strip()
-                if chapter_col and len(row) >= chapter_col
-                else ""
-            )
 
-            if page_val:
-                page_numbers.append(page_val)
-
-            records.append(
-                {
-                    "source": str(tsv_path),
-                    "magazine": mag_val,
-                    "edition": "",
-                    "page_range": page_val,
-                    "question_set": qset_val,
-                    "question_set_name": qset_val,
-                    "chapter": chapter_val,
-                    "high_level_chapter": chapter_val,
-                    "question_number": qno_val,
-                    "question_text": qtext_val,
-                }
-            )
+def process_tsv_text(
+    tsv_text: str,
+    db_service: DatabaseService,
+    subject_name: str,
+    name: str = "TSV",
+) -> tuple[bool, str, list[int]]:
+    """
+    Import TSV text (clipboard or text box) without writing it to disk.
 
-        inserted_ids, duplicates = db_service.insert_questions_from_tsv(subject_name, records)
-        if duplicates:
-            readable = "; ".join(
-                f"Magazine '{mag}' Question '{qno}' Page '{page}' already exists (DB has Qno '{ex_qno}', Page '{ex_page}')"
-                for mag, qno, page, ex_qno, ex_page in duplicates
-            )
-            raise ValueError(
-                "Duplicate questions detected: "
-                f"{readable}. Remove or update these entries before importing."
-            )
+    The text is parsed straight from memory and streamed into one insert
+    transaction. Returns (ok, message, inserted_ids) like one entry of
+    process_tsv_batch.
+    """
+    summary = _ImportSummary()
+    try:
+        inserted_ids, duplicates = db_service.insert_questions_from_tsv(
+            subject_name, iter_tsv_records(io.StringIO(tsv_text, newline=""), summary, name)
+        )
+    except Exception as exc:
+        return False, str(_import_error(exc)), []
+    return _import_result(inserted_ids, duplicates, summary)
 
-        id_range = "N/A"
-        if inserted_ids:
-            id_range = (
-                f"{min(inserted_ids)}-{max(inserted_ids)}"
-                if len(inserted_ids) > 1
-                else str(inserted_ids[0])
-            )
 
-        page_range = "N/A"
-        if page_numbers:
-            try:
-                numeric_pages = []
-                for page in page_numbers:
-                    match = re.search(r"\d+", page)
-                    if match:
-                        numeric_pages.append(int(match.group()))
-                if numeric_pages:
-                    min_page = min(numeric_pages)
-                    max_page = max(numeric_pages)
-                    page_range = str(min_page) if min_page == max_page else f"{min_page}-{max_page}"
-                else:
-                    page_range = page_numbers[0] if len(page_numbers) == 1 else f"{page_numbers[0]}-{page_numbers[-1]}"
-            except Exception:
-                page_range = page_numbers[0] if len(page_numbers) == 1 else f"{page_numbers[0]}-{page_numbers[-1]}"
+def _import_result(
+    inserted_ids: list[int], duplicates: list[tuple], summary: _ImportSummary
+) -> tuple[bool, str, list[int]]:
+    try:
+        return True, _import_status(inserted_ids, duplicates, summary), inserted_ids
+    except ValueError as exc:
+        return False, str(_import_error(exc)), inserted_ids
 
-        status_message = f"Inserted {len(inserted_ids)} rows (IDs: {id_range}, Pages: {page_range})"
 
-        try:
-            tsv_path.unlink()
-        except Exception as delete_exc:
-            print(f"Warning: Could not delete TSV file {tsv_path}: {delete_exc}")
+class ImportInterrupted(RuntimeError):
+    """A chunked import stopped part-way; committed rows and the checkpoint are kept for resuming."""
 
-        return status_message
 
-    except ValueError as exc:
-        raise ValueError(f"TSV processing failed: {exc}") from exc
+def process_tsv_resumable(
+    tsv_path: Path,
+    db_service: DatabaseService,
+    subject_name: str,
+    chunk_size: int = TSV_IMPORT_CHUNK_ROWS,
+    progress_callback: Callable[[int, int], None] | None = None,
+    stop_event=None,
+) -> tuple[bool, str, list[int]]:
+    """
+    Import a large TSV file in chunks, resuming where an earlier run stopped.
+
+    The whole file is validated first, so bad data still rejects it without
+    writing anything. Rows are then committed chunk_size at a time, and each
+    commit records the last committed line in import_checkpoints. If the run
+    is interrupted (stop_event set, a database error, the app exiting), the
+    file and its checkpoint stay and the next run continues after that line.
+    Checkpoints are tied to the file's size and mtime and to the subject, so
+    an edited file, or one imported into a different subject, starts over.
+
+    progress_callback(rows done, total rows) is called after every chunk.
+    Returns (ok, message, inserted_ids) like process_tsv_batch and deletes
+    the file once it has been handled; raises ImportInterrupted otherwise.
+    """
+    source = str(tsv_path.resolve())
+    summary = _ImportSummary()
+    try:
+        stat = tsv_path.stat()
+        for _ in iter_tsv_records(tsv_path, summary):
+            pass
     except Exception as exc:
-        raise RuntimeError(f"Unexpected error during TSV processing: {exc}") from exc
+        db_service.clear_import_checkpoint(source)
+        _delete_tsv(tsv_path)
+        return False, str(_import_error(exc)), []
+
+    signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+    checkpoint = db_service.import_checkpoint(source, signature, subject_name)
+    resume_line = checkpoint["last_line"] if checkpoint else 0
+    inserted_before = checkpoint["inserted"] if checkpoint else 0
+    duplicates_before = checkpoint["duplicates"] if checkpoint else 0
+    skipped = 0
+
+    def pending_records() -> Iterator[dict]:
+        nonlocal skipped
+        for record in iter_tsv_records(tsv_path):
+            if record["source_line"] <= resume_line:
+                skipped += 1
+                continue
+            if stop_event is not None and stop_event.is_set():
+                raise ImportInterrupted("stopped by user")
+            yield record
+
+    def report(processed: int) -> None:
+        if progress_callback:
+            progress_callback(skipped + processed, summary.rows)
+
+    try:
+        inserted_ids, duplicates = db_service.import_question_stream(
+            subject_name,
+            pending_records(),
+            chunk_size=chunk_size,
+            snapshot=not resume_line,
+            checkpoint=(source, signature, inserted_before, duplicates_before),
+            progress_callback=report,
+        )
+    except Exception as exc:
+        raise ImportInterrupted(
+            f"Import of {tsv_path.name} interrupted ({exc}). Committed rows are kept; "
+            "the file resumes from its last checkpoint on the next run."
+        ) from exc
+
+    db_service.clear_import_checkpoint(source)
+    _delete_tsv(tsv_path)
+    ok, message, inserted_ids = _import_result(inserted_ids, duplicates, summary)
+    if resume_line:
+        message = f"Resumed after line {resume_line} ({inserted_before} rows inserted earlier). {message}"
+        if duplicates_before:
+            ok = False
+            message += f" {duplicates_before} duplicate rows were skipped before the interruption."
+    return ok, message, inserted_ids
+
+
+def _load_tsv(tsv_path: Path) -> tuple[list[dict], _ImportSummary]:
+    summary = _ImportSummary()
+    return list(iter_tsv_records(tsv_path, summary)), summary
+
+
+def process_tsv_batch(
+    tsv_paths: list[Path],
+    db_service: DatabaseService,
+    subject_name: str,
+    max_workers: int = 4,
+) -> list[tuple[Path, bool, str, list[int]]]:
+    """
+    Import several TSV files as one batch.
+
+    Files are parsed and validated in parallel; every valid file is then
+    inserted in a single transaction with a single snapshot. Rows repeated
+    across files are reported as duplicates of the earlier file's rows.
+    A file that fails validation is skipped without affecting the others.
+
+    Returns (path, ok, message, inserted_ids) per file, in input order.
+    inserted_ids lists the rows that were written even when ok is False
+    (a file with duplicates still commits its new rows). All files are
+    deleted afterwards, as with process_tsv.
+    """
+    results: dict[Path, tuple[bool, str, list[int]]] = {}
+    try:
+        parsed: list[tuple[Path, list[dict], _ImportSummary]] = []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tsv_paths))), thread_name_prefix="tsv-parse") as pool:
+            futures = [(path, pool.submit(_load_tsv, path)) for path in tsv_paths]
+            for path, future in futures:
+                try:
+                    records, summary = future.result()
+                except Exception as exc:
+                    results[path] = (False, str(_import_error(exc)), [])
+                else:
+                    parsed.append((path, records, summary))
+
+        if parsed:
+            try:
+                outcomes = db_service.insert_question_batches(subject_name, [records for _, records, _ in parsed])
+            except Exception as exc:
+                message = str(_import_error(exc))
+                for path, _, _ in parsed:
+                    results[path] = (False, message, [])
+            else:
+                for (path, _, summary), (inserted_ids, duplicates) in zip(parsed, outcomes):
+                    results[path] = _import_result(inserted_ids, duplicates, summary)
     finally:
-        try:
-            if tsv_path.exists():
-                tsv_path.unlink()
-        except Exception as delete_exc:
-            print(f"Warning: Could not delete TSV file {tsv_path}: {delete_exc}")
+        for path in tsv_paths:
+            _delete_tsv(path)
+    return [(path, *results[path]) for path in tsv_paths]
 
 
 # ---------------------------------------------------------------------------
@@ -253,76 +545,97 @@ def _find_question_text_column(header_row: list[str]) -> int:
     raise ValueError("Unable to locate column containing question text.")
 
 
-def extract_file_metadata(
-    rows: list[list[str]],
+def _iter_validated_rows(
+    numbered_rows: Iterable[tuple[int | None, list[str]]],
     magazine_col: int,
     question_set_col: int,
     qno_col: int,
     page_col: int,
-) -> tuple[str, list[tuple[str, str, str, str, str, str]]]:
+    single_edition: bool = True,
+) -> Iterator[tuple[int | None, list[str], tuple[str, str, str, str, str, str]]]:
+    """
+    Validate rows lazily and yield (line_no, row, signature).
+
+    signature is (normalized_magazine, normalized_qno, normalized_page,
+    magazine_value, qno_value, page_value). Every row must carry the same
+    magazine edition (unless single_edition is False) and a unique
+    (edition, qno, page) triple; errors name the line.
+    """
     magazine_identifier = None
-    row_signatures: list[tuple[str, str, str, str, str, str]] = []
     seen_row_signatures: set[tuple[str, str, str]] = set()
+    required_columns = max(magazine_col, question_set_col, qno_col, page_col)
 
-    for row in rows:
-        required_columns = max(magazine_col, question_set_col, qno_col, page_col)
+    for line_no, row in numbered_rows:
+        where = f"Line {line_no}: " if line_no is not None else ""
         if len(row) < required_columns:
-            raise ValueError("TSV row does not contain all required columns.")
+            raise ValueError(f"{where}TSV row does not contain all required columns.")
 
         magazine_value = row[magazine_col - 1].strip()
         if not magazine_value:
-            raise ValueError("Magazine edition must be provided for every row.")
+            raise ValueError(f"{where}Magazine edition must be provided for every row.")
 
         normalized_magazine = normalize_magazine_edition(magazine_value)
 
         if magazine_identifier is None:
             magazine_identifier = normalized_magazine
-        elif magazine_identifier != normalized_magazine:
+        elif single_edition and magazine_identifier != normalized_magazine:
             raise ValueError(
-                "All rows in the TSV must belong to the same magazine edition. "
+                f"{where}All rows in the TSV must belong to the same magazine edition. "
                 "Please split files by edition before importing."
             )
 
         question_value = row[question_set_col - 1].strip()
         if not question_value:
-            raise ValueError("Question set must be provided for every row.")
+            raise ValueError(f"{where}Question set must be provided for every row.")
 
         qno_value = row[qno_col - 1].strip()
         if not qno_value:
-            raise ValueError("Question number must be provided for every row.")
+            raise ValueError(f"{where}Question number must be provided for every row.")
 
         normalized_qno = normalize_qno(qno_value)
         if not normalized_qno:
-            raise ValueError(f"Unable to normalize question number '{qno_value}'.")
+            raise ValueError(f"{where}Unable to normalize question number '{qno_value}'.")
 
         page_value = row[page_col - 1].strip()
         if not page_value:
-            raise ValueError("Page number must be provided for every row.")
+            raise ValueError(f"{where}Page number must be provided for every row.")
 
         normalized_page = normalize_page(page_value)
         if not normalized_page:
-            raise ValueError(f"Unable to normalize page number '{page_value}'.")
+            raise ValueError(f"{where}Unable to normalize page number '{page_value}'.")
 
-        combo_signature = (magazine_identifier, normalized_qno, normalized_page)
+        combo_signature = (normalized_magazine, normalized_qno, normalized_page)
         if combo_signature in seen_row_signatures:
             raise ValueError(
-                "Duplicate question/page detected within TSV for magazine edition "
+                f"{where}Duplicate question/page detected within TSV for magazine edition "
                 f"'{magazine_value}', question number '{qno_value}', page '{page_value}'."
             )
         seen_row_signatures.add(combo_signature)
 
-        row_signatures.append(
-            (
-                normalized_magazine,
-                normalized_qno,
-                normalized_page,
-                magazine_value,
-                qno_value,
-                page_value,
-            )
+        yield line_no, row, (
+            normalized_magazine,
+            normalized_qno,
+            normalized_page,
+            magazine_value,
+            qno_value,
+            page_value,
         )
 
-    if magazine_identifier is None:
-        raise ValueError("Unable to identify magazine edition in the TSV file.")
 
-    return magazine_identifier, row_signatures
+def extract_file_metadata(
+    rows: list[list[str]],
+    magazine_col: int,
+    question_set_col: int,
+    qno_col: int,
+    page_col: int,
+) -> tuple[str, list[tuple[str, str, str, str, str, str]]]:
+    """Validate already-loaded data rows (header excluded) and return (edition key, row signatures)."""
+    row_signatures = [
+        signature
+        for _, _, signature in _iter_validated_rows(
+            enumerate(rows, start=2), magazine_col, question_set_col, qno_col, page_col
+        )
+    ]
+    if not row_signatures:
+        raise ValueError("Unable to identify magazine edition in the TSV file.")
+    return row_signatures[0][0], row_signatures
@@ -0,0 +1,289 @@
+"""
+Event-driven folder watcher for incoming TSV files.
+
+On Linux the watcher blocks on inotify (via ctypes, no extra dependency) and
+wakes up only when something changes in the folder. Elsewhere, or when
+inotify is unavailable, it falls back to polling. Either way a file is only
+handed out once its size and mtime have stopped changing, so files that are
+still being written are never picked up.
+
+Ready files are delivered through a bounded queue; when the consumer falls
+behind, stable files simply stay pending until there is room.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# inotify event bits (see <sys/inotify.h>)
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+_EVENT_HEADER = struct.Struct("iIII")
+
+_STOPPED = object()
+
+
+class _InotifyBackend:
+    """Minimal inotify reader for a single directory."""
+
+    name = "inotify"
+
+    def __init__(self, folder: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(fd, os.fsencode(str(folder)), _IN_WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, f"inotify_add_watch failed for {folder}")
+        self.fd = fd
+
+    @classmethod
+    def create(cls, folder: Path) -> "_InotifyBackend | None":
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            return cls(folder)
+        except (OSError, AttributeError):
+            return None
+
+    def read_events(self) -> Tuple[List[Tuple[str, bool]], bool]:
+        """Return ([(name, closed_for_write)], overflowed) for all queued events."""
+        events: List[Tuple[str, bool]] = []
+        overflow = False
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not buffer:
+                break
+            offset = 0
+            while offset < len(buffer):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                raw_name = buffer[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                elif raw_name:
+                    events.append((os.fsdecode(raw_name), bool(mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO))))
+        return events, overflow
+
+    def close(self) -> None:
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class FolderWatcher:
+    """
+    Watch one folder and hand out files matching `pattern` once they are stable.
+
+    A file is stable when its (size, mtime) has not changed for
+    `settle_seconds`. If inotify reports the writer closed the file (or it was
+    renamed into place), the shorter `closed_settle_seconds` applies.
+    """
+
+    def __init__(
+        self,
+        folder: Path,
+        pattern: str = "*.tsv",
+        settle_seconds: float = 1.0,
+        closed_settle_seconds: float = 0.2,
+        poll_interval: float = 3.0,
+        max_queued: int = 64,
+        use_inotify: bool = True,
+    ):
+        self.folder = Path(folder)
+        self.pattern = pattern
+        self.settle_seconds = settle_seconds
+        self.closed_settle_seconds = closed_settle_seconds
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.ready: queue.Queue = queue.Queue(maxsize=max(1, int(max_queued)))
+        self.backend_name = "polling"
+        # path -> (signature, last change time, closed-for-write seen)
+        self._pending: Dict[Path, Tuple[Tuple[int, int], float, bool]] = {}
+        self._claimed: set[Path] = set()
+        self._claimed_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake_r, self._wake_w = os.pipe()
+        # Guards the wake pipe: its fds are closed exactly once, after the watcher thread is done with them.
+        self._wake_lock = threading.Lock()
+        self._wake_closed = False
+        self._thread: threading.Thread | None = None
+
+    # ------------------------------------------------------------------
+    # Consumer API
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        backend = _InotifyBackend.create(self.folder) if self.use_inotify else None
+        if backend is not None:
+            self.backend_name = backend.name
+        self._thread = threading.Thread(target=self._run, args=(backend,), name="folder-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching and wake any consumer blocked in next_ready()."""
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        with self._wake_lock:
+            if not self._wake_closed:
+                try:
+                    os.write(self._wake_w, b"x")
+                except OSError:
+                    pass
+        try:
+            self.ready.put_nowait(_STOPPED)
+        except queue.Full:
+            pass
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=2.0)
+        if self._thread is None or not self._thread.is_alive():
+            self._close_wake_pipe()
+        # Otherwise the watcher thread closes the pipe itself once it leaves select().
+
+    def next_ready(self, timeout: float | None = None) -> Path | None:
+        """Block until a stable file is available; None on timeout or after stop()."""
+        while not self._stop.is_set():
+            try:
+                item = self.ready.get(timeout=timeout)
+            except queue.Empty:
+                return None
+            if item is _STOPPED:
+                break
+            return item
+        return None
+
+    def drain_ready(self) -> List[Path]:
+        """Return every file that is ready right now without blocking."""
+        items: List[Path] = []
+        while True:
+            try:
+                item = self.ready.get_nowait()
+            except queue.Empty:
+                return items
+            if item is not _STOPPED:
+                items.append(item)
+
+    def done(self, path: Path) -> None:
+        """Mark a handed-out file as processed so it can be picked up again if it reappears."""
+        with self._claimed_lock:
+            self._claimed.discard(Path(path))
+
+    # ------------------------------------------------------------------
+    # Watcher thread
+    # ------------------------------------------------------------------
+    def _run(self, backend: _InotifyBackend | None) -> None:
+        try:
+            self._rescan()
+            while not self._stop.is_set():
+                self._promote_stable()
+                if backend is not None:
+                    timeout = self._pending_timeout()
+                    readable, _, _ = select.select([backend.fd, self._wake_r], [], [], timeout)
+                    if backend.fd in readable:
+                        events, overflow = backend.read_events()
+                        if overflow:
+                            self._rescan()
+                        for name, closed in events:
+                            if fnmatch.fnmatch(name, self.pattern):
+                                self._observe(self.folder / name, closed)
+                else:
+                    timeout = self._pending_timeout()
+                    self._stop.wait(self.poll_interval if timeout is None else min(timeout, self.poll_interval))
+                    self._rescan()
+        finally:
+            if backend is not None:
+                backend.close()
+            self._close_wake_pipe()
+
+    def _close_wake_pipe(self) -> None:
+        with self._wake_lock:
+            if self._wake_closed:
+                return
+            self._wake_closed = True
+            for fd in (self._wake_r, self._wake_w):
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+    def _pending_timeout(self) -> float | None:
+        """How long to sleep: until the next pending file could settle, or indefinitely."""
+        if not self._pending:
+            return None
+        return max(0.05, min(self.closed_settle_seconds, self.settle_seconds / 2))
+
+    def _is_claimed(self, path: Path) -> bool:
+        with self._claimed_lock:
+            return path in self._claimed
+
+    def _rescan(self) -> None:
+        try:
+            paths = sorted(self.folder.glob(self.pattern))
+        except OSError:
+            return
+        for path in paths:
+            if path not in self._pending:
+                self._observe(path, closed=False)
+
+    def _observe(self, path: Path, closed: bool) -> None:
+        if self._is_claimed(path):
+            return
+        try:
+            stat = path.stat()
+        except OSError:
+            self._pending.pop(path, None)
+            return
+        signature = (stat.st_size, stat.st_mtime_ns)
+        previous = self._pending.get(path)
+        if previous is not None and previous[0] == signature:
+            self._pending[path] = (signature, previous[1], previous[2] or closed)
+        else:
+            self._pending[path] = (signature, time.monotonic(), closed)
+
+    def _promote_stable(self) -> None:
+        now = time.monotonic()
+        for path, (signature, changed_at, closed) in sorted(self._pending.items()):
+            try:
+                stat = path.stat()
+            except OSError:
+                del self._pending[path]
+                continue
+            current = (stat.st_size, stat.st_mtime_ns)
+            if current != signature:
+                self._pending[path] = (current, now, False)
+                continue
+            settle = self.closed_settle_seconds if closed else self.settle_seconds
+            if now - changed_at < settle:
+                continue
+            with self._claimed_lock:
+                self._claimed.add(path)
+            try:
+                self.ready.put_nowait(path)
+            except queue.Full:
+                # Back-pressure: keep it pending and retry on the next wake-up.
+                with self._claimed_lock:
+                    self._claimed.discard(path)
+                continue
+            del self._pending[path]
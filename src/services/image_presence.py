@@ -0,0 +1,59 @@
+"""
+Process-wide cache of per-question image counts.
+
+Question cards only need to know how many question/answer images exist to
+enable their image buttons. The cache is filled with one bulk query per loaded
+dataset and entries are dropped whenever images are added or deleted, so
+cards never hit SQLite one question at a time.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, Iterable, List
+
+ImageCounts = Dict[str, int]
+
+
+class ImagePresenceCache:
+    """Thread-safe question_id -> {kind: count} map with explicit invalidation."""
+
+    def __init__(self) -> None:
+        self._counts: Dict[int, ImageCounts] = {}
+        self._lock = threading.Lock()
+
+    def get(self, question_id: int) -> ImageCounts | None:
+        with self._lock:
+            counts = self._counts.get(int(question_id))
+        return dict(counts) if counts is not None else None
+
+    def missing(self, question_ids: Iterable[int]) -> List[int]:
+        """Return the ids (deduplicated, in order) that have no cached entry."""
+        with self._lock:
+            seen: Dict[int, None] = {}
+            for qid in question_ids:
+                qid = int(qid)
+                if qid not in self._counts:
+                    seen[qid] = None
+        return list(seen)
+
+    def update(self, counts_by_id: Dict[int, ImageCounts]) -> None:
+        with self._lock:
+            for qid, counts in counts_by_id.items():
+                self._counts[int(qid)] = dict(counts)
+
+    def prime(self, question_ids: Iterable[int], fetch: Callable[[List[int]], Dict[int, ImageCounts]]) -> None:
+        """Fetch and store counts for every id not cached yet (ids without images map to {})."""
+        pending = self.missing(question_ids)
+        if not pending:
+            return
+        fetched = fetch(pending)
+        self.update({qid: fetched.get(qid, {}) for qid in pending})
+
+    def invalidate(self, question_id: int) -> None:
+        with self._lock:
+            self._counts.pop(int(question_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts.clear()
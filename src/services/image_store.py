@@ -0,0 +1,231 @@
+"""
+Content-addressed storage for question images.
+
+Image bytes live once in `image_blobs`, keyed by their SHA-256 digest, together
+with width/height/format metadata and a small preview thumbnail. Rows in
+`images` only reference a blob through `images.blob_hash`, so the same
+screenshot pasted into several questions is stored once.
+
+Decoding, optimization and thumbnailing happen in `prepare_image`, which
+callers run (optionally on a worker pool) before entering a write transaction;
+`store_image` only writes rows.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import sqlite3
+from typing import Any, Dict, Iterable
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+THUMBNAIL_MAX_SIZE = (480, 480)
+THUMBNAIL_JPEG_QUALITY = 85
+EXIF_ORIENTATION_TAG = 0x0112
+# APP1 (EXIF/XMP), APP2 (ICC), APP13 (IPTC) and COM segments.
+JPEG_METADATA_MARKERS = frozenset({0xE1, 0xE2, 0xED, 0xFE})
+
+# Ingest optimization defaults; overridable through the "ImageOptimization" config.
+# Off by default: images are stored exactly as pasted unless the config (or
+# scripts/reoptimize_images.py) opts in. format "png" recompresses losslessly;
+# "jpeg" trades exactness for size on opaque images. Only PNG/JPEG are produced
+# because the PDF export accepts no others.
+DEFAULT_OPTIMIZATION: Dict[str, Any] = {
+    "enabled": False,
+    "max_dimension": 2400,
+    "format": "png",
+    "quality": 90,
+}
+
+
+def image_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _has_alpha(img: Image.Image) -> bool:
+    return img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+
+
+def make_thumbnail(img: Image.Image, max_size: tuple[int, int] = THUMBNAIL_MAX_SIZE) -> tuple[bytes, str]:
+    """
+    Render a preview no larger than max_size.
+
+    Transparent images stay PNG; everything else becomes a JPEG, which is far
+    smaller for screenshots of printed pages.
+    """
+    thumb = img.copy()
+    thumb.thumbnail(max_size, Image.LANCZOS)
+    buffer = io.BytesIO()
+    if _has_alpha(thumb):
+        thumb.convert("RGBA").save(buffer, "PNG", optimize=True)
+        return buffer.getvalue(), "image/png"
+    thumb.convert("RGB").save(buffer, "JPEG", quality=THUMBNAIL_JPEG_QUALITY, optimize=True)
+    return buffer.getvalue(), "image/jpeg"
+
+
+def strip_jpeg_metadata(data: bytes) -> bytes:
+    """
+    Drop EXIF/XMP (APP1), ICC (APP2), IPTC (APP13) and comment segments from a JPEG.
+
+    Lossless: the entropy-coded image data is copied byte for byte. Returns
+    the input unchanged when the marker structure cannot be parsed.
+    """
+    if data[:2] != b"\xff\xd8":
+        return data
+    out = bytearray(data[:2])
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return data
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            # Fill byte before the real marker.
+            pos += 1
+            continue
+        if marker == 0xDA:
+            # Start of scan: everything from here on is image data.
+            out += data[pos:]
+            return bytes(out)
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            out += data[pos : pos + 2]
+            pos += 2
+            continue
+        end = pos + 2 + int.from_bytes(data[pos + 2 : pos + 4], "big")
+        if end > len(data):
+            return data
+        if marker not in JPEG_METADATA_MARKERS:
+            out += data[pos:end]
+        pos = end
+    return data
+
+
+def optimize_image(data: bytes, mime_type: str | None, settings: Dict[str, Any]) -> tuple[bytes, str | None]:
+    """
+    Downscale to max_dimension, drop EXIF/ICC/text metadata and recompress.
+
+    JPEG sources stay JPEG. Within max_dimension their metadata segments are
+    stripped losslessly instead of re-encoding, since a second lossy pass
+    would just add generation loss; they are only re-encoded when they have
+    to be downscaled or carry an EXIF rotation. Returns the original bytes
+    unchanged when the image cannot be decoded, is animated, or the
+    re-encoded result is not smaller.
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            if getattr(img, "is_animated", False):
+                return data, mime_type
+            img.load()
+            rotated = img.getexif().get(EXIF_ORIENTATION_TAG, 1) not in (0, 1)
+            out = ImageOps.exif_transpose(img)
+            max_dimension = int(settings.get("max_dimension") or 0)
+            resized = max_dimension > 0 and max(out.size) > max_dimension
+            if img.format == "JPEG" and not resized and not rotated:
+                return strip_jpeg_metadata(data), mime_type
+            if resized:
+                out = out.copy()
+                out.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+
+            buffer = io.BytesIO()
+            as_jpeg = settings.get("format") == "jpeg" or img.format == "JPEG"
+            if as_jpeg and not _has_alpha(out):
+                quality = int(settings.get("quality") or DEFAULT_OPTIMIZATION["quality"])
+                out.convert("RGB").save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+                new_mime = "image/jpeg"
+            else:
+                if out.mode not in ("1", "L", "LA", "P", "RGB", "RGBA"):
+                    out = out.convert("RGBA" if _has_alpha(out) else "RGB")
+                # Saving without pnginfo/exif/icc_profile strips the metadata.
+                out.save(buffer, "PNG", optimize=True)
+                new_mime = "image/png"
+    except (UnidentifiedImageError, OSError, ValueError):
+        return data, mime_type
+
+    optimized = buffer.getvalue()
+    if len(optimized) >= len(data):
+        return data, mime_type
+    return optimized, new_mime
+
+
+def prepare_image(
+    data: bytes,
+    mime_type: str | None = None,
+    optimization: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
+    """
+    Hash an image and derive its metadata and thumbnail.
+
+    With an enabled `optimization` settings dict the bytes are run through
+    `optimize_image` first. Bytes Pillow cannot decode are still stored; they
+    just get no metadata or thumbnail, and previews fall back to the full image.
+    """
+    data = bytes(data)
+    optimized = bool(optimization and optimization.get("enabled"))
+    if optimized:
+        data, mime_type = optimize_image(data, mime_type, optimization)
+    prepared: Dict[str, Any] = {
+        "hash": image_digest(data),
+        "data": data,
+        "mime_type": mime_type or "application/octet-stream",
+        "format": None,
+        "width": None,
+        "height": None,
+        "thumb": None,
+        "thumb_mime": None,
+        "optimized": optimized,
+    }
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.load()
+            prepared["format"] = img.format
+            prepared["width"], prepared["height"] = img.size
+            if img.format and prepared["mime_type"] == "application/octet-stream":
+                prepared["mime_type"] = Image.MIME.get(img.format, prepared["mime_type"])
+            prepared["thumb"], prepared["thumb_mime"] = make_thumbnail(img)
+    except (UnidentifiedImageError, OSError, ValueError):
+        pass
+    return prepared
+
+
+def store_image(conn: sqlite3.Connection, prepared: Dict[str, Any]) -> None:
+    """Insert a prepared blob unless its digest is already stored."""
+    conn.execute(
+        """
+        INSERT INTO image_blobs (hash, mime_type, format, width, height, size_bytes, data, thumb, thumb_mime, optimized)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(hash) DO UPDATE SET
+            format = COALESCE(image_blobs.format, excluded.format),
+            width = COALESCE(image_blobs.width, excluded.width),
+            height = COALESCE(image_blobs.height, excluded.height),
+            thumb = COALESCE(image_blobs.thumb, excluded.thumb),
+            thumb_mime = COALESCE(image_blobs.thumb_mime, excluded.thumb_mime),
+            optimized = MAX(image_blobs.optimized, excluded.optimized)
+        """,
+        (
+            prepared["hash"],
+            prepared["mime_type"],
+            prepared["format"],
+            prepared["width"],
+            prepared["height"],
+            len(prepared["data"]),
+            sqlite3.Binary(prepared["data"]),
+            sqlite3.Binary(prepared["thumb"]) if prepared["thumb"] is not None else None,
+            prepared["thumb_mime"],
+            int(prepared.get("optimized", False)),
+        ),
+    )
+
+
+def release_orphans(conn: sqlite3.Connection, hashes: Iterable[str]) -> int:
+    """Delete blobs among `hashes` that no image row references any more."""
+    removed = 0
+    for digest in set(h for h in hashes if h):
+        cur = conn.execute(
+            """
+            DELETE FROM image_blobs
+            WHERE hash = ? AND NOT EXISTS (SELECT 1 FROM images WHERE blob_hash = ?)
+            """,
+            (digest, digest),
+        )
+        removed += cur.rowcount or 0
+    return removed
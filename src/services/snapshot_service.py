@@ -0,0 +1,507 @@
+"""
+Incremental database snapshots backed by a content-addressed chunk store.
+
+The database image is split into page-aligned chunks and hashed; chunks that
+are already in the store are shared between manifests. The last captured
+image is kept as a "head" manifest. While the database has not been
+checkpointed behind our back, the next snapshot only reads the pages written
+to the WAL since then and rewrites the chunks that contain them, so its cost
+follows the size of the change rather than the size of the database. Any
+other case (first snapshot, rollback journal, foreign checkpoint) falls back
+to reading the whole file.
+
+Layout next to the database:
+    backups/
+        <db_stem>-<timestamp>.json     manifest (timestamp, reason, chunk list)
+        <db_stem>.head.json            last captured image, base for the next delta
+        chunks/<ab>/<hash>             raw chunk bytes, shared by all manifests
+
+Legacy full-copy snapshots (<db_stem>-<timestamp>.db + .json) are still listed,
+restored and pruned.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List
+
+TIMESTAMP_FORMAT = "%Y%m%d-%H%M%S-%f"
+# Manifests written before microsecond timestamps were introduced.
+LEGACY_TIMESTAMP_FORMAT = "%Y%m%d-%H%M%S"
+SNAPSHOT_FORMAT = "chunked-v1"
+DEFAULT_CHUNK_PAGES = 64
+
+# WAL file layout (https://www.sqlite.org/fileformat.html#the_write_ahead_log).
+WAL_MAGIC = (0x377F0682, 0x377F0683)
+WAL_HEADER_SIZE = 32
+WAL_FRAME_HEADER_SIZE = 24
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse a manifest timestamp in the current or the legacy (seconds) format."""
+    try:
+        return datetime.strptime(value, TIMESTAMP_FORMAT)
+    except ValueError:
+        return datetime.strptime(value, LEGACY_TIMESTAMP_FORMAT)
+
+
+class SnapshotService:
+    """Create, list, restore and prune incremental snapshots of a SQLite file."""
+
+    def __init__(self, db_path: Path, chunk_pages: int = DEFAULT_CHUNK_PAGES):
+        self.db_path = Path(db_path)
+        self.chunk_pages = max(1, int(chunk_pages))
+        self._lock = threading.Lock()
+        # Kept open after the first capture. SQLite checkpoints and deletes the
+        # WAL when its last connection closes, which would turn every later
+        # snapshot back into a full read.
+        self._conn: sqlite3.Connection | None = None
+
+    def set_db_path(self, db_path: Path) -> None:
+        with self._lock:
+            self._close_connection()
+            self.db_path = Path(db_path)
+
+    def close(self) -> None:
+        """Release the connection that keeps the WAL alive between snapshots."""
+        with self._lock:
+            self._close_connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, isolation_level=None, timeout=30, check_same_thread=False)
+        return self._conn
+
+    def _close_connection(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @property
+    def backup_dir(self) -> Path:
+        return self.db_path.parent / "backups"
+
+    @property
+    def chunk_dir(self) -> Path:
+        return self.backup_dir / "chunks"
+
+    @property
+    def head_path(self) -> Path:
+        return self.backup_dir / f"{self.db_path.stem}.head.json"
+
+    # ------------------------------------------------------------------
+    # Create
+    # ------------------------------------------------------------------
+
+    def create(self, reason: str, retention_days: int = 5, write_locked: bool = False) -> Path | None:
+        """
+        Snapshot the database and return the manifest path.
+
+        Only chunks whose hash is not yet in the store are written to disk.
+        Pass write_locked=True when the caller's own transaction already holds
+        the database write lock.
+        """
+        if not self.db_path.is_file():
+            return None
+
+        with self._lock:
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+            head = self._capture(write_locked)
+            manifest_path = self._write_manifest(head, reason)
+            self._prune(retention_days)
+        return manifest_path
+
+    def publish(
+        self,
+        head: Dict[str, Any],
+        reason: str,
+        retention_days: int = 5,
+        manifest_path: Path | None = None,
+    ) -> Path:
+        """
+        Write a manifest for an image returned by capture().
+
+        When manifest_path names a manifest already written for the same
+        image, the reason is appended to it instead of adding another one.
+        """
+        with self._lock:
+            if manifest_path is not None and manifest_path.is_file():
+                manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+                manifest["reason"] = f"{manifest.get('reason', '')}; {reason.strip()}"[:300]
+                self._write_json(manifest_path, manifest)
+                return manifest_path
+            manifest_path = self._write_manifest(head, reason)
+            self._prune(retention_days)
+        return manifest_path
+
+    def _write_manifest(self, head: Dict[str, Any], reason: str) -> Path:
+        now = datetime.utcnow()
+        timestamp = now.strftime(TIMESTAMP_FORMAT)
+        manifest_path = self.backup_dir / f"{self.db_path.stem}-{timestamp}.json"
+        suffix = 1
+        while manifest_path.exists():
+            # Clock did not advance (coarse timers): never overwrite an existing manifest.
+            manifest_path = self.backup_dir / f"{self.db_path.stem}-{timestamp}-{suffix}.json"
+            suffix += 1
+        manifest = {
+            "timestamp": timestamp,
+            "reason": reason.strip()[:300],
+            "db": str(self.db_path.name),
+            "format": SNAPSHOT_FORMAT,
+            "page_size": head["page_size"],
+            "chunk_size": head["chunk_size"],
+            "size_bytes": head["size_bytes"],
+            "stored_bytes": head["stored_bytes"],
+            "chunks": head["chunks"],
+        }
+        self._write_json(manifest_path, manifest)
+        return manifest_path
+
+    def _write_json(self, path: Path, data: Dict[str, Any]) -> None:
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    # ------------------------------------------------------------------
+    # Capture
+    # ------------------------------------------------------------------
+    def capture(self) -> Dict[str, Any] | None:
+        """
+        Update the head image without publishing a manifest.
+
+        Doubles as the WAL checkpoint when automatic checkpoints are disabled:
+        pages are copied into the chunk store before they leave the WAL.
+        """
+        if not self.db_path.is_file():
+            return None
+        with self._lock:
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+            return self._capture()
+
+    def checkpoint(self) -> bool:
+        """
+        Plain passive checkpoint; the next snapshot will read the whole file.
+
+        Best effort: returns False instead of raising when the database is
+        busy or unreadable, and the WAL is left for a later checkpoint.
+        """
+        if not self.db_path.is_file():
+            return False
+        try:
+            self._checkpoint()
+        except (sqlite3.Error, OSError):
+            return False
+        return True
+
+    def wal_size(self) -> int:
+        """Current size of the WAL file in bytes (0 without a WAL)."""
+        try:
+            return self._wal_path().stat().st_size
+        except OSError:
+            return 0
+
+    def _capture(self, write_locked: bool = False) -> Dict[str, Any]:
+        """
+        Bring the head image up to date with the live database and return it.
+
+        The database write lock is held throughout, so no commit can land
+        between reading the WAL and checkpointing it into the main file.
+        """
+        conn = self._connection()
+        if not write_locked:
+            conn.execute("BEGIN IMMEDIATE")
+        try:
+            page_size = int(conn.execute("PRAGMA page_size").fetchone()[0])
+            head = self._build_head(page_size)
+            self._write_json(self.head_path, head)
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+        return head
+
+    def _build_head(self, page_size: int) -> Dict[str, Any]:
+        chunk_size = page_size * self.chunk_pages
+        previous = self._load_head()
+        state_before = self._db_state()
+        frame_count = self._checkpoint()
+        frames, db_pages = self._read_wal_frames(page_size, frame_count)
+        state_after = self._db_state()
+
+        delta = (
+            previous is not None
+            and previous.get("db_state") == state_before
+            and previous.get("page_size") == page_size
+            and previous.get("chunk_size") == chunk_size
+        )
+        if db_pages is not None:
+            size_bytes = db_pages * page_size
+        elif delta:
+            size_bytes = int(previous["size_bytes"])
+        else:
+            size_bytes = state_before[0]
+
+        dirty: Dict[int, List[int]] = {}
+        for pgno in frames:
+            if (pgno - 1) * page_size < size_bytes:
+                dirty.setdefault((pgno - 1) // self.chunk_pages, []).append(pgno)
+
+        old_chunks: List[str] = previous["chunks"] if delta else []
+        old_size = int(previous["size_bytes"]) if delta else 0
+        chunks: List[str] = []
+        stored_bytes = 0
+        wal = open(self._wal_path(), "rb") if frames else None
+        db_file = None if delta else open(self.db_path, "rb")
+        try:
+            for idx in range((size_bytes + chunk_size - 1) // chunk_size):
+                offset = idx * chunk_size
+                length = min(chunk_size, size_bytes - offset)
+                if delta and idx not in dirty and idx < len(old_chunks) and min(chunk_size, old_size - offset) == length:
+                    chunks.append(old_chunks[idx])
+                    continue
+                if delta:
+                    base = self._read_chunk(old_chunks[idx]) if idx < len(old_chunks) else b""
+                else:
+                    db_file.seek(offset)
+                    base = db_file.read(length)
+                chunk = bytearray(base[:length])
+                chunk.extend(bytes(length - len(chunk)))
+                for pgno in dirty.get(idx, ()):
+                    wal.seek(frames[pgno])
+                    start = (pgno - 1) * page_size - offset
+                    chunk[start : start + page_size] = wal.read(page_size)
+                digest = hashlib.blake2b(chunk, digest_size=20).hexdigest()
+                chunks.append(digest)
+                if self._write_chunk(digest, memoryview(chunk)):
+                    stored_bytes += len(chunk)
+        finally:
+            if wal is not None:
+                wal.close()
+            if db_file is not None:
+                db_file.close()
+
+        return {
+            "format": SNAPSHOT_FORMAT,
+            "db": str(self.db_path.name),
+            "page_size": page_size,
+            "chunk_size": chunk_size,
+            "size_bytes": size_bytes,
+            "stored_bytes": stored_bytes,
+            "chunks": chunks,
+            "db_state": state_after,
+        }
+
+    def _db_state(self) -> List[int]:
+        """Size and mtime of the main file; any checkpoint we did not run changes it."""
+        stat = self.db_path.stat()
+        return [int(stat.st_size), int(stat.st_mtime_ns)]
+
+    def _wal_path(self) -> Path:
+        return self.db_path.with_name(self.db_path.name + "-wal")
+
+    def _checkpoint(self) -> int:
+        """
+        Passively checkpoint the WAL and return the number of committed frames in it.
+
+        Returns 0 for databases that are not in WAL mode.
+        """
+        conn = sqlite3.connect(self.db_path, isolation_level=None, timeout=30)
+        try:
+            row = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+        finally:
+            conn.close()
+        return max(0, int(row[1])) if row else 0
+
+    def _read_wal_frames(self, page_size: int, frame_count: int) -> tuple[Dict[int, int], int | None]:
+        """
+        Map each page in the first frame_count WAL frames to the offset of its newest image.
+
+        Also returns the database size in pages recorded by the last commit frame.
+        """
+        frames: Dict[int, int] = {}
+        db_pages: int | None = None
+        if frame_count <= 0:
+            return frames, db_pages
+        frame_size = WAL_FRAME_HEADER_SIZE + page_size
+        with open(self._wal_path(), "rb") as fh:
+            header = fh.read(WAL_HEADER_SIZE)
+            if len(header) < WAL_HEADER_SIZE:
+                return frames, db_pages
+            magic, _version, wal_page_size, _seq, salt1, salt2 = struct.unpack(">6I", header[:24])
+            if magic not in WAL_MAGIC or wal_page_size != page_size:
+                raise ValueError("Unexpected WAL header; cannot snapshot incrementally.")
+            pending: Dict[int, int] = {}
+            for index in range(frame_count):
+                offset = WAL_HEADER_SIZE + index * frame_size
+                fh.seek(offset)
+                frame_header = fh.read(WAL_FRAME_HEADER_SIZE)
+                if len(frame_header) < WAL_FRAME_HEADER_SIZE:
+                    break
+                pgno, commit_pages, frame_salt1, frame_salt2 = struct.unpack(">4I", frame_header[:16])
+                if (frame_salt1, frame_salt2) != (salt1, salt2):
+                    break
+                pending[pgno] = offset + WAL_FRAME_HEADER_SIZE
+                if commit_pages:
+                    frames.update(pending)
+                    pending.clear()
+                    db_pages = commit_pages
+        return frames, db_pages
+
+    def _load_head(self) -> Dict[str, Any] | None:
+        try:
+            head = json.loads(self.head_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return head if head.get("format") == SNAPSHOT_FORMAT else None
+
+    def _read_chunk(self, digest: str) -> bytes:
+        path = self._chunk_path(digest)
+        if not path.is_file():
+            raise FileNotFoundError(f"Snapshot chunk missing: {digest}")
+        return path.read_bytes()
+
+    def _chunk_path(self, digest: str) -> Path:
+        return self.chunk_dir / digest[:2] / digest
+
+    def _write_chunk(self, digest: str, chunk: memoryview) -> bool:
+        """Persist a chunk if it is new. Returns True when bytes were written."""
+        path = self._chunk_path(digest)
+        if path.is_file():
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{digest}.tmp")
+        tmp_path.write_bytes(chunk)
+        os.replace(tmp_path, path)
+        return True
+
+    # ------------------------------------------------------------------
+    # List / restore
+    # ------------------------------------------------------------------
+    def list(self) -> List[Dict[str, Any]]:
+        """Return snapshots (newest first) in the shape used by the snapshot UI."""
+        snapshots: List[Dict[str, Any]] = []
+        suffix = self.db_path.suffix
+        for meta_file in self.backup_dir.glob(f"{self.db_path.stem}-*.json"):
+            try:
+                meta_data = json.loads(meta_file.read_text(encoding="utf-8"))
+                ts = meta_data.get("timestamp") or ""
+                reason = meta_data.get("reason") or ""
+                if meta_data.get("format") == SNAPSHOT_FORMAT:
+                    db_file = meta_file
+                    size_bytes = meta_data.get("size_bytes")
+                    stored_bytes = meta_data.get("stored_bytes")
+                else:
+                    db_file = self.backup_dir / f"{self.db_path.stem}-{ts}{suffix}"
+                    if not db_file.is_file():
+                        continue
+                    try:
+                        size_bytes = db_file.stat().st_size
+                    except Exception:
+                        size_bytes = None
+                    stored_bytes = size_bytes
+                snapshots.append(
+                    {
+                        "timestamp": ts,
+                        "reason": reason,
+                        "db_file": str(db_file),
+                        "meta_file": str(meta_file),
+                        "size_bytes": size_bytes,
+                        "stored_bytes": stored_bytes,
+                        "dt": parse_timestamp(ts) if ts else None,
+                    }
+                )
+            except Exception:
+                continue
+        snapshots.sort(key=lambda s: s.get("dt") or datetime.min, reverse=True)
+        return snapshots
+
+    def restore(self, snapshot_path: Path) -> None:
+        """
+        Restore the live database from a manifest or a legacy full-copy file.
+
+        The restore runs through the backup API so open connections stay valid.
+        """
+        snapshot_path = Path(snapshot_path)
+        if not snapshot_path.is_file():
+            raise FileNotFoundError(f"Snapshot not found: {snapshot_path}")
+
+        if snapshot_path.suffix == ".json":
+            manifest = json.loads(snapshot_path.read_text(encoding="utf-8"))
+            if manifest.get("format") != SNAPSHOT_FORMAT:
+                raise ValueError(f"Unsupported snapshot manifest: {snapshot_path}")
+            image = bytearray(self._assemble(manifest))
+            if len(image) >= 100:
+                # Pages captured from a WAL database keep the WAL read/write
+                # versions (2) in the header; an in-memory database cannot open
+                # a WAL, so mark the image as rollback-journal (1) first.
+                image[18] = image[19] = 1
+            source = sqlite3.connect(":memory:")
+            source.deserialize(bytes(image))
+        else:
+            source = sqlite3.connect(snapshot_path)
+
+        target = sqlite3.connect(self.db_path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        # The restore rewrote the database; the next snapshot starts from a full read.
+        self.head_path.unlink(missing_ok=True)
+
+    def _assemble(self, manifest: Dict[str, Any]) -> bytes:
+        parts = [self._read_chunk(digest) for digest in manifest.get("chunks", [])]
+        image = b"".join(parts)
+        expected = manifest.get("size_bytes")
+        if expected is not None and len(image) != int(expected):
+            raise ValueError("Snapshot is corrupt: assembled size does not match manifest.")
+        return image
+
+    # ------------------------------------------------------------------
+    # Retention
+    # ------------------------------------------------------------------
+    def _prune(self, retention_days: int) -> None:
+        """Drop snapshots older than retention_days and garbage-collect orphan chunks."""
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        suffix = self.db_path.suffix
+        removed_manifest = False
+        for meta_file in self.backup_dir.glob(f"{self.db_path.stem}-*.json"):
+            try:
+                meta_data = json.loads(meta_file.read_text(encoding="utf-8"))
+                ts = parse_timestamp(meta_data.get("timestamp", ""))
+            except Exception:
+                continue
+            if ts >= cutoff:
+                continue
+            if meta_data.get("format") == SNAPSHOT_FORMAT:
+                removed_manifest = True
+            else:
+                db_file = self.backup_dir / f"{self.db_path.stem}-{meta_data.get('timestamp', '')}{suffix}"
+                db_file.unlink(missing_ok=True)
+            meta_file.unlink(missing_ok=True)
+
+        if removed_manifest:
+            self._collect_garbage()
+
+    def _collect_garbage(self) -> None:
+        """Delete chunks no longer referenced by any manifest in the backup folder."""
+        referenced: set[str] = set()
+        for meta_file in self.backup_dir.glob("*.json"):
+            try:
+                meta_data = json.loads(meta_file.read_text(encoding="utf-8"))
+            except Exception:
+                # Unreadable manifest: keep every chunk rather than risk data loss.
+                return
+            if meta_data.get("format") == SNAPSHOT_FORMAT:
+                referenced.update(meta_data.get("chunks", []))
+        if not self.chunk_dir.is_dir():
+            return
+        for chunk_file in self.chunk_dir.glob("*/*"):
+            if chunk_file.name not in referenced:
+                chunk_file.unlink(missing_ok=True)
@@ -0,0 +1,137 @@
+"""
+Single-writer queue for SQLite mutations.
+
+All DatabaseService writes are funnelled through one background thread. Jobs
+that are waiting when the writer becomes free are run together inside one
+transaction (group commit), each under its own SAVEPOINT so a failing job
+only rolls back its own changes. Callers get a concurrent.futures.Future and
+can block on `.result()` or attach a done-callback.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from services.connection_manager import ConnectionManager
+
+_STOP = object()
+
+
+class WriteQueue:
+    """Run mutation jobs on a dedicated writer thread with grouped commits."""
+
+    def __init__(
+        self,
+        connections: ConnectionManager,
+        max_batch: int = 256,
+        before_batch: Callable[[list[Callable[..., Any]]], None] | None = None,
+    ):
+        self.connections = connections
+        self.max_batch = max(1, int(max_batch))
+        # Called on the writer thread with the batch's job functions, outside any transaction.
+        self.before_batch = before_batch
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def is_writer_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Queue fn(*args, **kwargs) for the writer thread and return its Future."""
+        future: Future = Future()
+        self._ensure_started()
+        self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Finish queued jobs and stop the writer thread."""
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+        thread.join(timeout=timeout)
+        with self._lock:
+            if self._thread is thread and not thread.is_alive():
+                self._thread = None
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+            self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            job = self._queue.get()
+            if job is _STOP:
+                break
+            batch = [job]
+            # Group commit: take whatever else queued up while the last batch ran.
+            while len(batch) < self.max_batch:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stopping = True
+                    break
+                batch.append(nxt)
+            if self.before_batch is not None:
+                try:
+                    self.before_batch([fn for _future, fn, _args, _kwargs in batch])
+                except Exception as exc:
+                    # Fail the batch rather than the thread, or every caller blocks forever.
+                    self._fail_batch(batch, exc)
+                    continue
+            self._commit_batch(batch)
+        self.connections.close_thread_connection()
+
+    def _commit_batch(self, batch: list[tuple]) -> None:
+        outcomes: list[tuple[bool, Any]] = []
+        try:
+            with self.connections.transaction(immediate=True) as conn:
+                for idx, (future, fn, args, kwargs) in enumerate(batch):
+                    if not future.set_running_or_notify_cancel():
+                        outcomes.append((False, None))
+                        continue
+                    savepoint = f"write_job_{idx}"
+                    conn.execute(f"SAVEPOINT {savepoint}")
+                    try:
+                        result = fn(*args, **kwargs)
+                    except Exception as exc:
+                        conn.execute(f"ROLLBACK TO {savepoint}")
+                        conn.execute(f"RELEASE {savepoint}")
+                        outcomes.append((False, exc))
+                    else:
+                        conn.execute(f"RELEASE {savepoint}")
+                        outcomes.append((True, result))
+        except Exception as exc:
+            # BEGIN or COMMIT failed: nothing in this batch was persisted.
+            self._fail_batch(batch, exc)
+            return
+
+        for (future, *_), (ok, value) in zip(batch, outcomes):
+            if not future.running():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    @staticmethod
+    def _fail_batch(batch: list[tuple], exc: BaseException) -> None:
+        for future, *_ in batch:
+            if future.done():
+                continue
+            if future.running() or future.set_running_or_notify_cancel():
+                future.set_exception(exc)
@@ -24,11 +24,12 @@ import math
 import sqlite3
 import shutil
 import tempfile
-import shlex
 import secrets
 from io import BytesIO
+from itertools import repeat
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from PySide6.QtCore import Qt, QTimer, QSize, QStringListModel, QThread, QObject, Signal
 from PySide6.QtGui import QColor, QFont, QPalette, QTextCursor, QPixmap, QGuiApplication
@@ -79,11 +80,18 @@ from matplotlib.figure import Figure
 from config.constants import (
     LAST_SELECTION_FILE,
     MAGAZINE_GROUPING_MAP,
+    NORMALIZED_EDITION_COLUMN,
     TAG_COLORS,
     DEFAULT_DB_PATH,
+    LARGE_TSV_IMPORT_BYTES,
 )
+from models.dataset_changes import CHAPTER_COLUMN, DatasetChanges, apply_to_frame
+from models.question_lists import LazyQuestionLists
+from models.question_query import QUERY_FIELDS, CompiledQuery, QuerySyntaxError, compile_query, order_by_ids
+from models.question_store import QuestionStore, QuestionView, group_questions, map_distinct
 from services.db_service import DatabaseService
-from services.excel_service import process_tsv
+from services.excel_service import ImportInterrupted, process_tsv_batch, process_tsv_resumable, process_tsv_text
+from services.folder_watcher import FolderWatcher
 from services.question_set_group_service import QuestionSetGroupService
 from services.tag_service import TagService
 from ui.dialogs import QuestionEditDialog
@@ -105,6 +113,7 @@ from ui.widgets import (
     QuestionListCardView,
     TagBadge,
 )
+from utils.edition_index import EditionIndex, edition_page_ranges, frame_editions, page_number_series
 from utils.helpers import (
     _find_high_level_chapter_column,
     _find_magazine_column,
@@ -232,12 +241,21 @@ class EmbeddingWorker(QObject):
             if not texts:
                 continue
             vectors = model.encode(texts, normalize_embeddings=True)
+            # Queue the whole batch so the writer thread commits it as one group.
+            pending = []
             for rec, vec in zip(records, vectors):
                 blob = np.asarray(vec, dtype="float32").tobytes()
-                self.db_service.upsert_embedding(rec["id"], self.model_name, blob, len(vec))
+                pending.append(
+                    self.db_service.submit_write(
+                        self.db_service.upsert_embedding, rec["id"], self.model_name, blob, len(vec)
+                    )
+                )
+            for future in pending:
+                future.result()
                 done += 1
             self.progress.emit(done, total)
 
+        self.db_service.connections.close_thread_connection()
         self.finished.emit(done, total, self._stop)
 
 
@@ -249,13 +267,15 @@ class TSVWatcherWindow(QMainWindow):
 
         self.event_queue: queue.Queue[tuple] = queue.Queue()
         self.watch_thread: threading.Thread | None = None
+        self.folder_watcher: FolderWatcher | None = None
         self.stop_event = threading.Event()
         self.file_rows: dict[str, int] = {}
         self.file_errors: dict[str, str] = {}
         self.metrics_request_id = 0
-        self.chapter_questions: dict[str, list[dict[str, str]]] = {}
-        self.current_questions: list[dict[str, str]] = []
-        self.all_questions: list[dict[str, str]] = []  # Unfiltered questions
+        self.question_store: QuestionStore | None = None  # every loaded question, stored once
+        self.chapter_questions: dict[str, QuestionView] = {}  # chapter -> row handles into question_store
+        self.current_questions: QuestionView | list = []
+        self.all_questions: QuestionView | list = []  # Unfiltered questions
         self.advanced_query_term: str = ""
         self.tag_filter_term: str = ""
         self.selected_tag_filters: list[str] = []  # Multiple selected tags for filtering
@@ -267,7 +287,7 @@ class TSVWatcherWindow(QMainWindow):
         self.current_Database_path: Path | None = None
         self.Database_df: pd.DataFrame | None = None  # Cached DataFrame
         self.high_level_column_index: int | None = None
-        self.question_lists: dict[str, list[dict]] = {}  # name -> list of questions
+        self.question_lists = LazyQuestionLists()  # name -> list of questions, hydrated on access
         self.question_lists_metadata: dict[str, dict] = {}  # name -> metadata (filters, magazine, etc)
         self.saved_list_entries_all: list[dict] = []  # full list entries for filtering
         self.saved_list_filter_mag: str = ""
@@ -286,6 +306,7 @@ class TSVWatcherWindow(QMainWindow):
         self.analysis_value_field: str = "High Level Chapter"
         self.mag_heatmap_data: dict[tuple[int, int], dict] = {}  # (year, month) -> info
         self.mag_page_ranges: dict[str, tuple[str, str]] = {}  # normalized edition -> (min, max)
+        self.magazine_details: list[dict] = []  # edition coverage of the loaded dataset
         self.question_set_groups_dirty: bool = False  # Track if groupings changed
         self.pending_auto_watch: bool = False  # deprecated
         self._question_tab_controls: list[QWidget] = []  # widgets to disable during question reload
@@ -295,6 +316,7 @@ class TSVWatcherWindow(QMainWindow):
         self.tag_service = TagService(db_service=self.db_service)
         self.current_db_path: Path = DEFAULT_DB_PATH
         self.current_subject: str | None = None
+        self.loaded_dataset: tuple[Path, str] | None = None  # (db path, subject) Database_df was loaded from
         self.use_database: bool = False
         # Embedding progress tracking
         self.sim_embed_base_done: int = 0
@@ -683,8 +705,14 @@ class TSVWatcherWindow(QMainWindow):
         
         # Advanced query input
         self.advanced_query_input = QLineEdit()
-        self.advanced_query_input.setPlaceholderText('Query: text ~ "roots" AND magazine ~ "Nov"')
-        self.advanced_query_input.setToolTip("Advanced query across text, magazine, question set. Use = or ~, AND/OR.")
+        self.advanced_query_input.setPlaceholderText('Search text, or query: text ~ "roots" AND magazine ~ "Nov"')
+        self.advanced_query_input.setToolTip(
+            'Plain words search question text, best match first: newton "second law" velo*\n'
+            "Fields: text, magazine, question_set, chapter, page, qno, edition, tag, has_images.\n"
+            "Operators: = != ~ (contains) !~ ^ (starts with) < <= > >= and low..high ranges;\n"
+            "text : words matches whole words as a phrase (velo* matches a prefix).\n"
+            "Combine with AND, OR, NOT and parentheses."
+        )
         self.advanced_query_input.setMinimumHeight(28)
         self.advanced_query_input.setMaximumHeight(28)
         self.advanced_query_input.returnPressed.connect(self._on_advanced_query_submit)
@@ -2050,28 +2078,36 @@ class TSVWatcherWindow(QMainWindow):
         load_combo(self.analysis_tag_combo, all_tags)
 
     def _analysis_dataframe(self) -> pd.DataFrame:
+        """Only the columns the analysis charts use; derived columns are mapped once per distinct value."""
         if self.Database_df is None or self.Database_df.empty:
             return pd.DataFrame()
-        df = self.Database_df.copy()
-        df["Question Set"] = df["Name of Question Set"] if "Name of Question Set" in df else df.get("question_set_name", "")
-        df["High Level Chapter"] = (
-            df["High level chapter"]
-            if "High level chapter" in df
-            else df.get("high_level_chapter", df.get("chapter", ""))
+        source = self.Database_df
+
+        def column(*names: str) -> pd.Series:
+            for name in names:
+                if name in source:
+                    return source[name]
+            return pd.Series("", index=source.index)
+
+        df = pd.DataFrame(
+            {
+                "Question Set": column("Name of Question Set", "question_set_name"),
+                "High Level Chapter": column("High level chapter", "high_level_chapter", "chapter"),
+                "Magazine Edition": column("Magazine Edition", "magazine"),
+            }
         )
-        df["Magazine Edition"] = df["Magazine Edition"] if "Magazine Edition" in df else df.get("magazine", "")
-        df["Chapter Group"] = df["High Level Chapter"].apply(self._match_chapter_group)
+        df["Chapter Group"] = map_distinct(df["High Level Chapter"], self._match_chapter_group)
         # Question set group
         group_lookup = {}
         if hasattr(self, "question_set_group_service") and self.question_set_group_service:
             for g_name, g_data in self.question_set_group_service.get_all_groups().items():
                 for qs in g_data.get("question_sets", []):
                     group_lookup[qs] = g_name
-        df["Question Set Group"] = df["Question Set"].apply(lambda qs: group_lookup.get(qs, "Others"))
+        df["Question Set Group"] = map_distinct(df["Question Set"], lambda qs: group_lookup.get(qs, "Others"))
         # Tags from group
         def tags_for_group(group_name: str) -> list[str]:
             return self.question_set_group_tags.get(group_name, [])
-        df["Tags"] = df["Question Set Group"].apply(tags_for_group)
+        df["Tags"] = map_distinct(df["Question Set Group"], tags_for_group)
         return df
 
     def _refresh_question_analysis(self):
@@ -2106,7 +2142,7 @@ class TSVWatcherWindow(QMainWindow):
             "Tag": "Tags",
         }
         col = value_map.get(value_field, "High Level Chapter")
-        plot_df = df.copy()
+        plot_df = df
         if col == "Tags":
             plot_df = plot_df.explode("Tags")
             plot_df = plot_df[plot_df["Tags"].notna() & (plot_df["Tags"] != "")]
@@ -3283,6 +3319,7 @@ class TSVWatcherWindow(QMainWindow):
         self.use_database = True
         self.current_Database_path = None
         self._load_dataframe_state(df, f"{subject} from database")
+        self.loaded_dataset = (db_path, subject)
 
     def _load_dataframe_state(self, df: pd.DataFrame, source_label: str) -> None:
         """Populate UI from a DataFrame (DB-backed)."""
@@ -3296,8 +3333,10 @@ class TSVWatcherWindow(QMainWindow):
             self._set_magazine_summary("Magazines: 0", "Tracked editions: 0")
             return
 
+        self._prime_image_presence(df.get("QuestionID"))
         row_count = self._compute_row_count_from_df(df)
         magazine_details, warnings = self._collect_magazine_details(df)
+        self.magazine_details = magazine_details
         detected_magazine = self._detect_magazine_name(magazine_details)
         grouping_key = MAGAZINE_GROUPING_MAP.get(detected_magazine, "PhysicsChapterGrouping")
         self.current_magazine_name = detected_magazine
@@ -3370,6 +3409,200 @@ class TSVWatcherWindow(QMainWindow):
         self._refresh_question_analysis()
         self._refresh_similarity_filters()
 
+    # ------------------------------------------------------------------
+    # Incremental dataset updates
+    # ------------------------------------------------------------------
+    def apply_dataset_changes(self, changes: DatasetChanges) -> None:
+        """
+        Fold inserted, updated and moved questions into the loaded dataset.
+
+        Only the changed rows are read back from SQLite. Chapter buckets and
+        cards, page ranges and the question-set grouping view are patched from
+        them; the heatmap is repainted only when edition coverage changed.
+        Falls back to a full reload when no dataset for the subject is loaded.
+        """
+        if changes.is_empty():
+            return
+        subject = self.subject_combo.currentText() if hasattr(self, "subject_combo") else ""
+        df = self.Database_df
+        if (
+            df is None
+            or df.empty
+            or not self.use_database
+            or self.loaded_dataset != (self.db_service.db_path, subject)
+        ):
+            self.load_subject_from_db()
+            return
+
+        rows = None
+        if changes.fetch_ids():
+            try:
+                rows = self.db_service.fetch_questions_df(subject, question_ids=changes.fetch_ids())
+            except Exception as exc:
+                self.log(f"Incremental refresh failed, reloading subject: {exc}")
+                self.load_subject_from_db()
+                return
+        self.Database_df = apply_to_frame(df, changes, rows)
+
+        has_rows = rows is not None and not rows.empty
+        if has_rows:
+            if not self._apply_edition_changes(rows, recompute=bool(changes.updated)):
+                # A different magazine now dominates; groupings must be reloaded.
+                self.load_subject_from_db()
+                return
+            self._prime_image_presence(rows["QuestionID"])
+            self._apply_question_set_changes(rows, recompute=bool(changes.updated))
+
+        touched = self._apply_chapter_question_changes(changes, rows)
+        raw_chapters = sorted(
+            {str(value).strip() for value in self.Database_df[CHAPTER_COLUMN].unique() if pd.notna(value)} - {""}
+        )
+        self._auto_assign_chapters(raw_chapters)
+        if hasattr(self, "chapter_view"):
+            self.chapter_view.sync_chapters(self._chapter_card_order())
+        if self.current_selected_chapter in touched:
+            self._populate_question_table(self.chapter_questions.get(self.current_selected_chapter, []))
+
+        self.row_count_label.setText(f"Total rows: {self._compute_row_count_from_df(self.Database_df)}")
+        if hasattr(self, "dashboard_view"):
+            self.dashboard_view.update_dashboard_data(
+                self.Database_df,
+                self.chapter_groups,
+                magazine_details=self.magazine_details,
+                mag_display_name=self.current_magazine_display_name,
+                mag_page_ranges=self.mag_page_ranges,
+            )
+        if has_rows and hasattr(self, "_refresh_embed_counts_display"):
+            self._refresh_embed_counts_display()
+        # Analysis and similarity pages rebuild on navigation; only refresh the visible one.
+        current_page = self.content_stack.currentIndex() if hasattr(self, "content_stack") else -1
+        if current_page == 11:
+            self._refresh_question_analysis()
+        elif current_page == 12:
+            self._refresh_similarity_filters()
+
+    def _apply_edition_changes(self, rows: pd.DataFrame, recompute: bool = False) -> bool:
+        """
+        Update edition coverage and page ranges for newly fetched rows.
+
+        Page ranges only widen on insert, so they are merged from `rows`;
+        updates (which may shrink a range) recompute them. Returns False when
+        the detected magazine changed and a full reload is needed.
+        """
+        magazine_details, _ = self._collect_magazine_details(self.Database_df)
+        if self._detect_magazine_name(magazine_details) != self.current_magazine_name:
+            return False
+        if recompute:
+            page_ranges = self._compute_page_ranges_for_editions(self.Database_df, magazine_details)
+        else:
+            page_ranges = dict(self.mag_page_ranges)
+            for normalized, (low, high) in self._compute_page_ranges_for_editions(rows, []).items():
+                old_low, old_high = page_ranges.get(normalized, ("", ""))
+                if old_low and old_high:
+                    low = str(min(int(low), int(old_low)))
+                    high = str(max(int(high), int(old_high)))
+                page_ranges[normalized] = (low, high)
+        if magazine_details == self.magazine_details and page_ranges == self.mag_page_ranges:
+            return True
+
+        self.magazine_details = magazine_details
+        self.mag_page_ranges = page_ranges
+        total_editions = sum(len(entry["editions"]) for entry in magazine_details)
+        mag_display = self.current_magazine_display_name or (
+            self.current_magazine_name.title() if self.current_magazine_name else "Unknown"
+        )
+        self._set_magazine_summary(
+            f"Magazine: {mag_display}",
+            f"Tracked editions: {total_editions}",
+        )
+        self._populate_magazine_heatmap(magazine_details, page_ranges)
+        return True
+
+    def _apply_question_set_changes(self, rows: pd.DataFrame, recompute: bool = False) -> None:
+        """Refresh question-set stats for the sets that `rows` belong to."""
+        view = getattr(self, "question_set_grouping_view", None)
+        if view is None:
+            return
+        df = self.Database_df
+        if recompute:
+            view.update_from_workbook(
+                self._extract_unique_question_sets(df),
+                self._extract_question_set_min_pages(df),
+                self._extract_question_set_magazines(df),
+            )
+            return
+        touched = set(self._extract_unique_question_sets(rows))
+        if not touched:
+            return
+        header_row = [None if pd.isna(col) else str(col) for col in df.columns]
+        try:
+            question_set_col = _find_question_set_column(header_row)
+        except ValueError:
+            return
+        # Per-set stats depend only on that set's rows, so recompute just those.
+        subset = df[df.iloc[:, question_set_col - 1].astype(str).str.strip().isin(touched)]
+        view.update_from_workbook(
+            sorted(set(view.all_question_sets) | touched),
+            {**view.question_set_min_pages, **self._extract_question_set_min_pages(subset)},
+            {**view.question_set_magazine, **self._extract_question_set_magazines(subset)},
+        )
+
+    def _apply_chapter_question_changes(
+        self, changes: DatasetChanges, rows: pd.DataFrame | None
+    ) -> set[str]:
+        """
+        Patch chapter_questions in place and return the chapter keys that changed.
+
+        Updated rows are dropped from their buckets and rebuilt from `rows`
+        (overwriting their row in the question store); moved questions keep
+        their store row and only change bucket. Touched buckets stay in QuestionID order, matching a full load.
+        """
+        fetched = set(rows["QuestionID"].tolist()) if rows is not None and not rows.empty else set()
+        stale = list(fetched | set(changes.updated) | set(changes.moved))
+        moved_only = [qid for qid in changes.moved if qid not in fetched]
+        store = self.question_store
+        touched: set[str] = set()
+        added: dict[str, list[np.ndarray]] = {}
+        if store is not None and stale:
+            for chapter_key in list(self.chapter_questions):
+                handles = self.chapter_questions[chapter_key].handles
+                ids = store.question_ids(handles)
+                stale_mask = np.isin(ids, stale)
+                if not stale_mask.any():
+                    continue
+                for handle in handles[stale_mask & np.isin(ids, moved_only)].tolist():
+                    raw_chapter = changes.moved[store.value(handle, "question_id")]
+                    target_key = self._match_chapter_group(raw_chapter)
+                    store.set_value(handle, "group", target_key)
+                    store.set_value(handle, "question_set", raw_chapter)
+                    added.setdefault(target_key, []).append(np.array([handle], dtype=np.intp))
+                touched.add(chapter_key)
+                kept = handles[~stale_mask]
+                if len(kept):
+                    self.chapter_questions[chapter_key] = store.view(kept)
+                else:
+                    del self.chapter_questions[chapter_key]
+
+        if fetched:
+            chapter_data, _, _, _ = self._collect_question_analysis_data(rows)
+            if chapter_data:
+                fetched_store = next(iter(chapter_data.values())).store
+                if store is None:
+                    store = self.question_store = fetched_store
+                    handles = np.arange(len(fetched_store), dtype=np.intp)
+                else:
+                    handles = store.extend(fetched_store)
+                for chapter_key, view in chapter_data.items():
+                    added.setdefault(chapter_key, []).append(handles[view.handles])
+
+        for chapter_key, parts in added.items():
+            current = self.chapter_questions.get(chapter_key)
+            if current is not None:
+                parts = [current.handles, *parts]
+            self.chapter_questions[chapter_key] = store.view(store.sorted_by_id(np.concatenate(parts)))
+            touched.add(chapter_key)
+        return touched
+
     def _open_similarity_from_question(self, question: dict) -> None:
         """Switch to Similar Questions tab and run search for the given question."""
         qid = (
@@ -3765,11 +3998,14 @@ class TSVWatcherWindow(QMainWindow):
         """Clear all question analysis data and UI elements."""
         # Clear data structures
         self.Database_df = None  # Clear cached DataFrame
+        self.loaded_dataset = None
         self.chapter_questions.clear()
-        self.current_questions.clear()
-        self.all_questions.clear()
+        self.question_store = None
+        self.current_questions = []
+        self.all_questions = []
         self.advanced_query_term = ""
         self.current_magazine_display_name = ""
+        self.magazine_details = []
         
         # Clear UI elements
         self._populate_magazine_heatmap([], {})
@@ -3926,11 +4162,17 @@ class TSVWatcherWindow(QMainWindow):
             warnings.append("Unable to determine question set column; question sets will not be listed.")
 
         coverage: dict[str, dict[str, object]] = {}
-        magazine_series = df.iloc[:, magazine_col - 1]
-        question_series = (
-            df.iloc[:, question_set_col - 1] if question_set_col is not None else repeat(None, len(df))
-        )
-        for magazine_value, question_value in zip(magazine_series, question_series):
+        # Work on distinct (edition, question set) pairs; first occurrences keep row order.
+        combos = pd.DataFrame({"magazine": df.iloc[:, magazine_col - 1]})
+        if question_set_col is not None:
+            combos["question_set"] = df.iloc[:, question_set_col - 1]
+        if NORMALIZED_EDITION_COLUMN in df.columns:
+            combos["normalized"] = df[NORMALIZED_EDITION_COLUMN]
+        combos = combos.drop_duplicates()
+        magazine_series = combos["magazine"]
+        question_series = combos["question_set"] if question_set_col is not None else repeat(None, len(combos))
+        normalized_series = combos["normalized"] if "normalized" in combos else repeat(None, len(combos))
+        for magazine_value, question_value, normalized in zip(magazine_series, question_series, normalized_series):
             if pd.isna(magazine_value):
                 continue
             text = str(magazine_value).strip()
@@ -3939,7 +4181,8 @@ class TSVWatcherWindow(QMainWindow):
             display_parts = [part.strip() for part in text.split("|", 1)]
             display_name = display_parts[0] or "Unknown"
             display_edition = display_parts[1] if len(display_parts) > 1 else ""
-            normalized = normalize_magazine_edition(text)
+            if normalized is None:
+                normalized = normalize_magazine_edition(text)
             norm_parts = normalized.split("|", 1)
             norm_name = norm_parts[0]
             norm_edition = norm_parts[1] if len(norm_parts) > 1 else ""
@@ -4001,34 +4244,14 @@ class TSVWatcherWindow(QMainWindow):
             return ranges
         header_row = [None if pd.isna(col) else str(col) for col in df.columns]
         try:
-            magazine_col = _find_magazine_column(header_row)
             page_col = _find_page_column(header_row)
         except ValueError:
             return ranges
-
-        magazine_series = df.iloc[:, magazine_col - 1]
-        page_series = df.iloc[:, page_col - 1]
-        for mag_value, page_value in zip(magazine_series, page_series):
-            if pd.isna(mag_value) or pd.isna(page_value):
-                continue
-            normalized = normalize_magazine_edition(str(mag_value))
-            page_text = str(page_value).strip()
-            if not page_text:
-                continue
-            # Attempt to parse page numbers; allow strings
-            try:
-                page_num = int(float(page_text))
-            except ValueError:
-                page_num = None
-            low, high = ranges.get(normalized, ("", ""))
-            if page_num is None:
-                continue
-            if not low or page_num < int(low):
-                low = str(page_num)
-            if not high or page_num > int(high):
-                high = str(page_num)
-            ranges[normalized] = (low, high)
-        return ranges
+        editions = frame_editions(df)
+        if editions is None:
+            return ranges
+        # One groupby over numeric pages; rows without an edition or a numeric page drop out.
+        return edition_page_ranges(editions, page_number_series(df.iloc[:, page_col - 1]))
 
     def _on_mag_heatmap_button_clicked(self) -> None:
         """Handle heatmap button click to show questions grouped by QuestionSetGroup.json."""
@@ -4082,22 +4305,22 @@ class TSVWatcherWindow(QMainWindow):
                 chapter_col_idx = idx
 
         questions: list[dict] = []
-        magazine_series = df.iloc[:, magazine_col - 1]
-        qset_series = df.iloc[:, question_set_col - 1]
-        qno_series = df.iloc[:, qno_col - 1]
-        page_series = df.iloc[:, page_col - 1]
-        qtext_series = df.iloc[:, question_text_col - 1]
-        id_series = df.iloc[:, id_col_idx - 1] if id_col_idx else None
-        chapter_series = df.iloc[:, chapter_col_idx - 1] if chapter_col_idx else None
-        high_series = df.iloc[:, high_chapter_col_idx - 1] if high_chapter_col_idx else None
-
-        for idx, (mag_value, qset_value, qno_value, page_value, qtext_value) in enumerate(
-            zip(magazine_series, qset_series, qno_series, page_series, qtext_series)
+        # Indexed lookup of the edition's rows; only those rows are materialized.
+        subset = df.iloc[EditionIndex.for_frame(df).positions(normalized_edition)]
+        magazine_series = subset.iloc[:, magazine_col - 1]
+        qset_series = subset.iloc[:, question_set_col - 1]
+        qno_series = subset.iloc[:, qno_col - 1]
+        page_series = subset.iloc[:, page_col - 1]
+        qtext_series = subset.iloc[:, question_text_col - 1]
+        id_series = subset.iloc[:, id_col_idx - 1] if id_col_idx else repeat(None, len(subset))
+        chapter_series = subset.iloc[:, chapter_col_idx - 1] if chapter_col_idx else repeat(None, len(subset))
+        high_series = subset.iloc[:, high_chapter_col_idx - 1] if high_chapter_col_idx else repeat(None, len(subset))
+
+        for mag_value, qset_value, qno_value, page_value, qtext_value, raw_id, chapter_value, high_value in zip(
+            magazine_series, qset_series, qno_series, page_series, qtext_series, id_series, chapter_series, high_series
         ):
             if pd.isna(mag_value) or pd.isna(qset_value):
                 continue
-            if normalize_magazine_edition(str(mag_value)) != normalized_edition:
-                continue
             qs_name = str(qset_value).strip()
             questions.append(
                 {
@@ -4108,20 +4331,19 @@ class TSVWatcherWindow(QMainWindow):
                     "question_set_name": qs_name,
                     "magazine": display_label,
                     "chapter": (
-                        str(chapter_series.iloc[idx]).strip()
-                        if chapter_series is not None and not pd.isna(chapter_series.iloc[idx])
+                        str(chapter_value).strip()
+                        if chapter_col_idx and not pd.isna(chapter_value)
                         else ""
                     ),
                     "high_level_chapter": (
-                        str(high_series.iloc[idx]).strip()
-                        if high_series is not None and not pd.isna(high_series.iloc[idx])
+                        str(high_value).strip()
+                        if high_chapter_col_idx and not pd.isna(high_value)
                         else ""
                     ),
                     "question_id": None,
                 }
             )
             if id_col_idx:
-                raw_id = id_series.iloc[idx] if id_series is not None else None
                 if pd.isna(raw_id) or str(raw_id).strip() == "":
                     questions[-1]["question_id"] = None
                 else:
@@ -4174,7 +4396,7 @@ class TSVWatcherWindow(QMainWindow):
 
     def _collect_question_analysis_data(
         self, df: pd.DataFrame
-    ) -> tuple[dict[str, list[dict]], list[str], int | None, list[str]]:
+    ) -> tuple[dict[str, QuestionView], list[str], int | None, list[str]]:
         warnings: list[str] = []
         if df.empty:
             return {}, warnings, None, []
@@ -4215,54 +4437,23 @@ class TSVWatcherWindow(QMainWindow):
                 id_col_idx = idx
                 break
 
-        def normalize(value) -> str:
-            if pd.isna(value):
-                return ""
-            text = str(value).strip()
-            return text
-
-        chapters: dict[str, list[dict]] = {}
-        raw_inputs: set[str] = set()
-        for row_number, row in enumerate(df.itertuples(index=False, name=None), start=2):
-            values = list(row)
-            raw_chapter_name = normalize(values[question_set_col - 1])
-            if not raw_chapter_name:
-                continue
-            raw_inputs.add(raw_chapter_name)
-            chapter_name = self._match_chapter_group(raw_chapter_name)
-            qno_value = normalize(values[qno_col - 1])
-            page_value = normalize(values[page_col - 1])
-            question_text = normalize(values[question_text_col - 1]) if question_text_col else ""
-            question_set_name = normalize(values[question_set_name_col - 1]) if question_set_name_col else raw_chapter_name
-            magazine_value = normalize(values[magazine_col - 1]) if magazine_col else ""
-            question_id = None
-            if id_col_idx:
-                try:
-                    question_id = int(values[id_col_idx - 1])
-                except Exception:
-                    question_id = values[id_col_idx - 1]
-
-            effective_row_number = question_id if self.use_database and question_id is not None else row_number
-            
-            # Extract group_key for tag lookup (same key used for accordion headers)
-            group_key = self._extract_group_key(question_set_name)
-
-            chapters.setdefault(chapter_name, []).append(
-                {
-                    "group": chapter_name,
-                    "question_set": raw_chapter_name,
-                    "question_set_name": question_set_name,
-                    "group_key": group_key,  # For tag color lookup in chips
-                    "qno": qno_value,
-                    "page": page_value,
-                    "magazine": magazine_value,
-                    "text": question_text,
-                    "row_number": effective_row_number,
-                    "question_id": question_id,
-                }
-            )
-
-        return chapters, warnings, question_set_col, sorted(raw_inputs)
+        def column(col_idx: int | None) -> pd.Series | None:
+            return df.iloc[:, col_idx - 1] if col_idx else None
+
+        store = QuestionStore.from_columns(
+            chapter=column(question_set_col),
+            qno=column(qno_col),
+            page=column(page_col),
+            text=column(question_text_col),
+            question_set_name=column(question_set_name_col),
+            magazine=column(magazine_col),
+            question_id=column(id_col_idx),
+            chapter_group=self._match_chapter_group,
+            # group_key is used for tag color lookup in chips (same key as accordion headers)
+            group_key=self._extract_group_key,
+            ids_as_row_numbers=self.use_database,
+        )
+        return store.group_views(), warnings, question_set_col, sorted(store.distinct("question_set"))
 
     def _normalize_label(self, label: str) -> str:
         return re.sub(r"\s+", " ", label.strip().lower())
@@ -4808,7 +4999,7 @@ class TSVWatcherWindow(QMainWindow):
                 qno_col = _find_qno_column(header_row)
                 page_col = _find_page_column(header_row)
                 question_set_col = _find_question_set_column(header_row)
-                magazine_col = _find_magazine_column(header_row)
+                _find_magazine_column(header_row)
             except ValueError:
                 # If columns not found, just show question sets without children
                 for name in question_sets:
@@ -4820,24 +5011,16 @@ class TSVWatcherWindow(QMainWindow):
             questions_by_set: dict[str, list[dict]] = {}
             normalized_target = normalize_magazine_edition(f"{magazine_name}|{edition_label}")
             
-            # Use pandas vectorized operations for better performance
-            magazine_series = df.iloc[:, magazine_col - 1]
-            question_set_series = df.iloc[:, question_set_col - 1]
-            qno_series = df.iloc[:, qno_col - 1]
-            page_series = df.iloc[:, page_col - 1]
+            # Indexed lookup of the edition's rows instead of scanning the whole frame
+            positions = EditionIndex.for_frame(df).positions(normalized_target)
+            subset = df.iloc[positions]
+            question_set_series = subset.iloc[:, question_set_col - 1]
+            qno_series = subset.iloc[:, qno_col - 1]
+            page_series = subset.iloc[:, page_col - 1]
             
-            for idx, (mag_value, qset_value, qno_value, page_value) in enumerate(zip(
-                magazine_series, question_set_series, qno_series, page_series
-            )):
-                # Skip if magazine value is missing
-                if pd.isna(mag_value):
-                    continue
-                
-                # Check if magazine matches
-                normalized_mag = normalize_magazine_edition(str(mag_value))
-                if normalized_mag != normalized_target:
-                    continue
-                
+            for idx, qset_value, qno_value, page_value in zip(
+                positions.tolist(), question_set_series, qno_series, page_series
+            ):
                 # Get question set
                 if pd.isna(qset_value):
                     continue
@@ -4885,10 +5068,12 @@ class TSVWatcherWindow(QMainWindow):
                 parent_item = QTreeWidgetItem([f" {name}", "", ""])
                 self.question_sets_tree.addTopLevelItem(parent_item)
 
-    def _populate_chapter_list(self, chapters: dict[str, list[dict]]) -> None:
+    def _populate_chapter_list(self, chapters: dict[str, QuestionView]) -> None:
         if not hasattr(self, "chapter_view"):
             return
         self.chapter_questions = chapters or {}
+        # All buckets of one load share a single store.
+        self.question_store = next((view.store for view in self.chapter_questions.values()), None)
         if hasattr(self, "question_tree"):
             self.question_tree.clear()
         self.question_text_view.clear()
@@ -4897,25 +5082,29 @@ class TSVWatcherWindow(QMainWindow):
             self._populate_question_table([])
             return
         
-        # Sort chapters by question count (descending) then by name (ascending)
-        sorted_chapters = sorted(
-            self.chapter_questions.items(),
-            key=lambda kv: (-len(kv[1]), kv[0].lower()),
-        )
-        
         # Clear and populate chapter view
         self.chapter_view.clear_chapters()
         
-        for chapter_key, questions in sorted_chapters:
+        for chapter_key, question_count in self._chapter_card_order():
             self.chapter_view.add_chapter(
                 chapter_name=chapter_key,
                 chapter_key=chapter_key,
-                question_count=len(questions)
+                question_count=question_count
             )
         
         # Do not auto-select; wait for user interaction to avoid eager loading
 
-    def _populate_question_table(self, questions: list[dict]) -> None:
+    def _chapter_card_order(self) -> list[tuple[str, int]]:
+        """Chapters sorted by question count (descending) then by name (ascending)."""
+        return [
+            (chapter_key, len(questions))
+            for chapter_key, questions in sorted(
+                self.chapter_questions.items(),
+                key=lambda kv: (-len(kv[1]), kv[0].lower()),
+            )
+        ]
+
+    def _populate_question_table(self, questions: QuestionView | list) -> None:
         if not hasattr(self, "question_tree"):
             return
         self.all_questions = questions or []
@@ -4951,103 +5140,40 @@ class TSVWatcherWindow(QMainWindow):
             self.advanced_query_term = self.advanced_query_input.text().strip()
         self._apply_question_search()
 
-    def _parse_advanced_query(self, query: str):
+    def _compile_advanced_query(self, query: str) -> tuple[CompiledQuery | None, str | None]:
         """
-        Parse a simple JIRA-like query into an AST.
-        Supports fields: text, magazine, question_set (question_set_name).
-        Operators: = (equals, case-insensitive), ~ (contains).
-        Logical: AND, OR. AND has higher precedence than OR. Parentheses not supported.
+        Compile a JIRA-like query (see models.question_query) against the current tags and images.
+
+        Returns (compiled query or None when empty, error message or None).
         """
-        if not query:
-            return None, None
+        qs_to_group: dict[str, str] = {}
+        if hasattr(self, "question_set_group_service") and self.question_set_group_service:
+            for g_name, g_data in self.question_set_group_service.get_all_groups().items():
+                for qs in g_data.get("question_sets", []):
+                    qs_to_group[qs] = g_name
+
+        def tags_for_set(question_set_name: str) -> list[str]:
+            return self.question_set_group_tags.get(qs_to_group.get(question_set_name, "Others"), [])
+
+        def ids_with_images() -> set[int]:
+            return self.db_service.question_ids_with_images() if self.db_service else set()
 
         try:
-            tokens = shlex.split(query.strip())
-        except ValueError as exc:
+            return compile_query(query, tags_for_set=tags_for_set, ids_with_images=ids_with_images), None
+        except QuerySyntaxError as exc:
             return None, f"Invalid query: {exc}"
 
-        terms = []
-        i = 0
-        while i < len(tokens):
-            tok = tokens[i]
-            upper = tok.upper()
-            if upper in ("AND", "OR"):
-                terms.append(("OP", upper))
-                i += 1
-                continue
-            # Expect field op value
-            if i + 2 >= len(tokens):
-                return None, "Invalid query: expected 'field operator value'."
-            field = tok
-            op = tokens[i + 1]
-            value = tokens[i + 2]
-            if op not in ("=", "~"):
-                return None, f"Invalid operator '{op}'. Use = or ~."
-            terms.append(("TERM", field, op, value))
-            i += 3
-
-        # Build AST with simple precedence: AND before OR, left-associative
-        def reduce_ops(seq, op_name):
-            out = []
-            idx = 0
-            while idx < len(seq):
-                item = seq[idx]
-                if item == ("OP", op_name):
-                    if not out or idx + 1 >= len(seq):
-                        return None
-                    left = out.pop()
-                    right = seq[idx + 1]
-                    out.append(("BIN", op_name, left, right))
-                    idx += 2
-                else:
-                    out.append(item)
-                    idx += 1
-            return out
-
-        # First handle AND, then OR
-        seq = terms
-        seq = reduce_ops(seq, "AND")
-        if seq is None:
-            return None, "Invalid AND expression."
-        seq = reduce_ops(seq, "OR")
-        if seq is None or len(seq) != 1:
-            return None, "Invalid OR expression."
-        return seq[0], None
-
-    def _evaluate_advanced_query(self, ast_node, question: dict) -> bool:
-        """Evaluate the parsed query AST against a question record."""
-        if not ast_node:
-            return True
-        kind = ast_node[0]
-        if kind == "TERM":
-            _, field, op, value = ast_node
-            val = ""
-            field_norm = field.lower()
-            if field_norm in ("text", "question", "question_text"):
-                val = question.get("question_text") or question.get("text") or ""
-            elif field_norm in ("magazine", "magazine_name"):
-                val = question.get("magazine", "")
-            elif field_norm in ("question_set", "question_set_name", "set"):
-                val = question.get("question_set_name") or question.get("question_set") or ""
-            else:
-                val = ""
-            val = str(val).lower()
-            comp = value.lower()
-            if op == "=":
-                return val == comp
-            return comp in val
-        if kind == "BIN":
-            _, op, left, right = ast_node
-            if op == "AND":
-                return self._evaluate_advanced_query(left, question) and self._evaluate_advanced_query(right, question)
-            if op == "OR":
-                return self._evaluate_advanced_query(left, question) or self._evaluate_advanced_query(right, question)
-        return False
+    def _rank_by_text_search(self, questions: QuestionView | list, text: str) -> QuestionView | list:
+        """Free-text matches (already filtered) reordered best match first by the FTS5 bm25 rank."""
+        if not self.db_service or not questions:
+            return questions
+        results = self.db_service.search_question_text(text, self.current_subject or None, limit=None)
+        return order_by_ids(questions, [result["question_id"] for result in results])
 
     def _update_advanced_query_completions(self, text: str) -> None:
         """Update autocomplete suggestions for the advanced query box."""
-        fields = ["text", "magazine", "question_set"]
-        operators = ["=", "~", "AND", "OR"]
+        fields = list(QUERY_FIELDS)
+        operators = ["=", "!=", "~", "^", ":", ">=", "<=", "AND", "OR", "NOT"]
         # Basic heuristic: after a field, suggest operators; after an operator, suggest fields; otherwise both
         tokens = text.strip().split()
         suggestions: list[str] = []
@@ -5058,7 +5184,7 @@ class TSVWatcherWindow(QMainWindow):
             last_upper = last.upper()
             if last.lower() in fields:
                 suggestions = operators
-            elif last_upper in ("AND", "OR", "=", "~"):
+            elif last_upper in ("AND", "OR", "NOT", "(") or last in operators:
                 suggestions = fields
             else:
                 suggestions = fields + operators
@@ -5074,10 +5200,11 @@ class TSVWatcherWindow(QMainWindow):
                 scroll_value = scrollbar.value()
         
         filtered = self.all_questions
+        ranked = False  # free-text search results come best match first
 
         # Apply advanced query (runs only when submitted)
         if self.advanced_query_term:
-            ast, err = self._parse_advanced_query(self.advanced_query_term)
+            query, err = self._compile_advanced_query(self.advanced_query_term)
             if err:
                 if hasattr(self, "advanced_query_error"):
                     self.advanced_query_error.setText(err)
@@ -5087,7 +5214,11 @@ class TSVWatcherWindow(QMainWindow):
                 if hasattr(self, "advanced_query_error"):
                     self.advanced_query_error.clear()
                     self.advanced_query_error.setVisible(False)
-                filtered = [q for q in filtered if self._evaluate_advanced_query(ast, q)]
+                if query is not None:
+                    filtered = query.filter(filtered)
+                    if query.search_text:
+                        filtered = self._rank_by_text_search(filtered, query.search_text)
+                        ranked = True
         else:
             if hasattr(self, "advanced_query_error"):
                 self.advanced_query_error.clear()
@@ -5107,7 +5238,6 @@ class TSVWatcherWindow(QMainWindow):
             return
         
         # Build mapping of question set -> group from QuestionSetGroup.json
-        groups = {}
         qs_to_group = {}
         group_order = []
         if hasattr(self, "question_set_group_service") and self.question_set_group_service:
@@ -5121,43 +5251,47 @@ class TSVWatcherWindow(QMainWindow):
         all_qs_names = {q.get("question_set_name", "Unknown") for q in self.all_questions} if hasattr(self, "all_questions") else set()
         others_sets = all_qs_names - set(qs_to_group.keys())
 
-        # Group questions using mapping; unmapped go to Others
-        for question in filtered:
-            qs_name = question.get("question_set_name", "Unknown")
-            group_key = qs_to_group.get(qs_name, "Others")
-            groups.setdefault(group_key, []).append(question)
+        # Group questions using mapping; unmapped go to Others. Groups keep the
+        # questions' order, so ranked search results stay best match first.
+        groups = group_questions(
+            filtered, lambda question: qs_to_group.get(question.get("question_set_name", "Unknown"), "Others")
+        )
 
         # Apply tag filtering (multiple tags)
         if self.selected_tag_filters:
             filtered_groups = {}
-            for group_key, group_questions in groups.items():
+            for group_key, members in groups.items():
                 tags = self.question_set_group_tags.get(group_key, [])
                 # Check if any of the selected filter tags match any of the group's tags
                 if any(filter_tag in tags for filter_tag in self.selected_tag_filters):
-                    filtered_groups[group_key] = group_questions
+                    filtered_groups[group_key] = members
             groups = filtered_groups
         
-        # Build display order: Others first, then config order, then any remaining groups alpha
-        ordered_keys = []
-        if "Others" in groups:
-            ordered_keys.append("Others")
-        for g in group_order:
-            if g in groups and g != "Others":
-                ordered_keys.append(g)
-        # Add any remaining groups not in config
-        for g in sorted(groups.keys()):
-            if g not in ordered_keys:
-                ordered_keys.append(g)
+        if ranked:
+            # Search results: the group holding the best match comes first
+            ordered_keys = list(groups)
+        else:
+            # Build display order: Others first, then config order, then any remaining groups alpha
+            ordered_keys = []
+            if "Others" in groups:
+                ordered_keys.append("Others")
+            for g in group_order:
+                if g in groups and g != "Others":
+                    ordered_keys.append(g)
+            # Add any remaining groups not in config
+            for g in sorted(groups.keys()):
+                if g not in ordered_keys:
+                    ordered_keys.append(g)
         
         # Populate card view with accordion groups
         if hasattr(self, "question_card_view"):
             total_questions = len(filtered)
             for group_key in ordered_keys:
-                group_questions = groups.get(group_key, [])
-                if not group_questions:
+                members = groups.get(group_key, [])
+                if not members:
                     continue
                 tags = self.question_set_group_tags.get(group_key, [])
-                self.question_card_view.add_group(group_key, group_questions, tags, self.tag_colors, show_page_range=False)
+                self.question_card_view.add_group(group_key, members, tags, self.tag_colors, show_page_range=False)
         
         # Restore scroll position if it was saved
         if scroll_value is not None and hasattr(self, "question_card_view"):
@@ -5407,8 +5541,8 @@ class TSVWatcherWindow(QMainWindow):
         except Exception as exc:
             QMessageBox.critical(self, "Update Failed", f"Unable to update database: {exc}")
             return
-        self.log(f"Question '{qno}' moved to '{target_group}'. Reloading data...")
-        self.load_subject_from_db()
+        self.log(f"Question '{qno}' moved to '{target_group}'.")
+        self.apply_dataset_changes(DatasetChanges.chapter_move([row_number], target_group))
 
     def reassign_questions(self, questions: list[dict], target_group: str) -> None:
         """Reassign multiple questions to a different chapter in bulk."""
@@ -5452,8 +5586,8 @@ class TSVWatcherWindow(QMainWindow):
             QMessageBox.critical(self, "Update Failed", f"Unable to update database: {exc}")
             return
         
-        self.log(f"{count} question(s) moved to '{target_group}'. Reloading data...")
-        self.load_subject_from_db()
+        self.log(f"{count} question(s) moved to '{target_group}'.")
+        self.apply_dataset_changes(DatasetChanges.chapter_move(ids, target_group))
 
     def on_chapter_selected(self, chapter_key: str) -> None:
         if not chapter_key:
@@ -5708,29 +5842,27 @@ class TSVWatcherWindow(QMainWindow):
         self.question_lists_metadata.clear()
         self.saved_list_entries_all = []
         
-        lists_data = {}
-        metadata = {}
+        summaries = []
         if self.db_service:
             try:
-                lists_data, metadata = self.db_service.load_question_lists()
+                summaries = self.db_service.load_question_list_summaries()
             except Exception as exc:
                 self.log(f"Error loading lists from database: {exc}")
 
-        for list_name, questions in sorted(lists_data.items(), key=lambda kv: kv[0].lower()):
-            meta = metadata.get(list_name, {})
-            self.question_lists[list_name] = questions
+        summaries.sort(key=lambda summary: summary["name"].lower())
+        # Items are fetched per list on first access (e.g. when the list is selected).
+        self.question_lists.reset(
+            (summary["name"] for summary in summaries),
+            loader=self._load_question_list_items,
+        )
+        for summary in summaries:
+            list_name = summary["name"]
+            meta = summary["metadata"]
             self.question_lists_metadata[list_name] = meta
-            created_at = meta.get("_created_at") or ""
+            created_at = summary["created_at"]
             magazine = meta.get("magazine", "")
-            archived_flag = bool(meta.get("archived"))
-            # Collect magazines from question data
-            q_mags = []
-            for q in questions:
-                raw_mag = q.get("magazine", "") or ""
-                base = raw_mag.split("|")[0].strip()
-                if base:
-                    q_mags.append(base)
-            mags_unique = sorted(set(q_mags if q_mags else ([magazine] if magazine else [])))
+            archived_flag = summary["archived"]
+            mags_unique = summary["magazine_names"] or ([magazine] if magazine else [])
             created_month_tag = ""
             if created_at:
                 try:
@@ -5738,7 +5870,7 @@ class TSVWatcherWindow(QMainWindow):
                 except Exception:
                     created_month_tag = created_at[:7]
 
-            display_text = f"{list_name} ({len(questions)})"
+            display_text = f"{list_name} ({summary['count']})"
             if magazine:
                 display_text += f" - {magazine}"
 
@@ -5764,6 +5896,32 @@ class TSVWatcherWindow(QMainWindow):
         self.drag_drop_panel.update_list_selector(self.question_lists)
         self._refresh_compare_options()
 
+    def _load_question_list_items(self, list_name: str) -> list[dict]:
+        """Fetch a saved list's questions from the database (LazyQuestionLists loader)."""
+        if not self.db_service:
+            return []
+        try:
+            items = self.db_service.load_question_list_items(list_name)
+        except Exception as exc:
+            self.log(f"Error loading list '{list_name}' from database: {exc}")
+            return []
+        self._prime_image_presence(
+            item.get("QuestionID") or item.get("question_id") or item.get("id") for item in items
+        )
+        return items
+
+    def _prime_image_presence(self, question_ids) -> None:
+        """Bulk-load image counts so question cards read them from the cache."""
+        if not self.db_service or question_ids is None:
+            return
+        ids = [int(x) for x in question_ids if str(x).strip().isdigit()]
+        if not ids:
+            return
+        try:
+            self.db_service.prime_image_counts(ids)
+        except Exception as exc:
+            self.log(f"Error loading image counts: {exc}")
+
     def _filtered_saved_list_entries(self, include_archived: bool = False) -> list[dict]:
         """Return saved list entries matching current filters."""
         mag = ""
@@ -6239,39 +6397,11 @@ class TSVWatcherWindow(QMainWindow):
     
     def _highlight_question_card(self, question_data: dict):
         """Highlight the corresponding question card with yellow background."""
-        from PySide6.QtCore import QTimer
-        
-        # Find and highlight the card in the question card view
-        for group in self.question_card_view.accordion_groups:
-            for card in group.get_all_cards():
-                if card.question_data.get("row_number") == question_data.get("row_number"):
-                    # Expand accordion group if collapsed
-                    if not group.is_expanded:
-                        group.toggle_expanded()
-                    
-                    # Temporarily highlight with yellow
-                    card.setStyleSheet("""
-                        QLabel {
-                            background-color: #fef08a;
-                            border: 3px solid #eab308;
-                            border-radius: 8px;
-                            padding: 12px;
-                            margin: 4px;
-                        }
-                    """)
-                    
-                    # Reset after 2 seconds
-                    def reset_card_style():
-                        if card.is_selected:
-                            card.set_selected(True)
-                        else:
-                            card.setStyleSheet(card.original_stylesheet)
-                    
-                    QTimer.singleShot(2000, reset_card_style)
-                    
-                    # Scroll to make the card visible
-                    self.question_card_view.ensureWidgetVisible(card)
-                    return
+        found = self.question_card_view.find_question("row_number", question_data.get("row_number"))
+        if found:
+            group, row = found
+            # Expands the group, flashes the card for 2 seconds and scrolls to it
+            self.question_card_view.highlight_question(group, row)
     
     def _remove_question_from_list(self, question: dict) -> None:
         """Remove a single question from current list (called from remove button on card)."""
@@ -7162,8 +7292,7 @@ class TSVWatcherWindow(QMainWindow):
         # Collect questions from card view instead of tree
         if hasattr(self, 'question_card_view'):
             for group in self.question_card_view.accordion_groups:
-                for card in group.get_all_cards():
-                    question_data = card.question_data
+                for question_data in group.questions:
                     if question_data:
                         visible_questions.append(question_data)
         else:
@@ -7344,24 +7473,16 @@ class TSVWatcherWindow(QMainWindow):
         timestamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{source_label}_{timestamp}.tsv"
         self.update_file_status(filename, "Processing", "Validating TSV...")
-        tmp_path: Path | None = None
         try:
-            with tempfile.NamedTemporaryFile(
-                "w",
-                delete=False,
-                suffix=".tsv",
-                newline="",
-                encoding="utf-8",
-            ) as tmp_file:
-                tmp_file.write(tsv_text)
-                tmp_path = Path(tmp_file.name)
-
             self.set_status(f'Importing data from "{filename}"', "importing")
-            result_message = process_tsv(tmp_path, self.db_service, subject)
+            ok, result_message, inserted_ids = process_tsv_text(tsv_text, self.db_service, subject, filename)
+            if inserted_ids:
+                self.apply_dataset_changes(DatasetChanges(inserted=inserted_ids))
+            if not ok:
+                raise ValueError(result_message)
             self.update_file_status(filename, "Completed", result_message)
             self.log(f"Imported TSV ({filename}): {result_message}")
             self.set_status(f'TSV imported from "{filename}" {result_message}', "success")
-            self.load_subject_from_db()
             QMessageBox.information(self, "Import Complete", f"TSV imported.\n{result_message}")
         except Exception as exc:
             error_message = str(exc)
@@ -7369,17 +7490,6 @@ class TSVWatcherWindow(QMainWindow):
             self.log(f"Error importing TSV ({filename}): {error_message}")
             self.set_status(f"Error importing TSV: {error_message}", "error")
             QMessageBox.critical(self, "Import Failed", f"Could not import TSV:\n{error_message}")
-            if tmp_path and tmp_path.exists():
-                try:
-                    tmp_path.unlink()
-                except Exception:
-                    pass
-        finally:
-            if tmp_path and tmp_path.exists():
-                try:
-                    tmp_path.unlink()
-                except Exception:
-                    pass
 
     def refresh_file_list(self) -> None:
         input_path = Path(self.input_edit.text().strip())
@@ -7478,6 +7588,8 @@ class TSVWatcherWindow(QMainWindow):
 
     def stop_watching(self) -> None:
         self.stop_event.set()
+        if self.folder_watcher is not None:
+            self.folder_watcher.stop()
         if self.watch_thread and self.watch_thread.is_alive():
             self.watch_thread.join(timeout=0.1)
         self.start_button.setEnabled(True)
@@ -7490,34 +7602,132 @@ class TSVWatcherWindow(QMainWindow):
         return
 
     def _watch_loop(self, input_dir: Path) -> None:
-        poll_interval = 3.0
-        while not self.stop_event.is_set():
-            tsv_files = sorted(input_dir.glob("*.tsv"))
-            if not tsv_files:
-                time.sleep(poll_interval)
-                continue
+        """
+        Import TSV files as the folder watcher reports them complete (blocks while idle).
 
-            for tsv_file in tsv_files:
+        Files that become ready together are imported as one batch: parsed in
+        parallel, committed in one transaction, followed by a single refresh.
+        Files of LARGE_TSV_IMPORT_BYTES or more are imported one at a time in
+        resumable chunks, with progress shown in the file table.
+        """
+        watcher = FolderWatcher(input_dir, "*.tsv")
+        self.folder_watcher = watcher
+        watcher.start()
+        self.event_queue.put(("log", f"Watching {input_dir} ({watcher.backend_name})."))
+        if self.stop_event.is_set():
+            watcher.stop()
+        batch_window = 0.3  # seconds to let files that land together join one batch
+        while not self.stop_event.is_set():
+            first = watcher.next_ready()
+            if first is None:
+                break
+            self.stop_event.wait(batch_window)
+            batch = [first, *watcher.drain_ready()]
+            large = [tsv_file for tsv_file in batch if self._is_large_tsv(tsv_file)]
+            small = [tsv_file for tsv_file in batch if tsv_file not in large]
+            subject = self.current_subject or (self.subject_combo.currentText() if hasattr(self, "subject_combo") else "")
+            try:
+                if small:
+                    self._import_watched_batch(small, subject)
+            except Exception as exc:
+                self._report_watch_error(small, exc)
+            finally:
+                for tsv_file in small:
+                    watcher.done(tsv_file)
+            for tsv_file in large:
                 if self.stop_event.is_set():
-                    break
-                self.event_queue.put(("status", tsv_file.name, "Processing", "Validating..."))
-                self.event_queue.put(("status_importing", tsv_file.name))
+                    continue
                 try:
-                    subject = self.current_subject or (self.subject_combo.currentText() if hasattr(self, "subject_combo") else "")
-                    result_message = process_tsv(tsv_file, self.db_service, subject)
+                    finished = self._import_large_tsv(tsv_file, subject)
                 except Exception as exc:
-                    self.event_queue.put(("status", tsv_file.name, "Error", str(exc)))
-                    self.event_queue.put(("log", f"Error processing {tsv_file.name}: {exc}"))
-                    self.event_queue.put(("status_error", f"Failed to import {tsv_file.name}: {exc}"))
-                else:
-                    self.event_queue.put(("status", tsv_file.name, "Completed", result_message))
-                    self.event_queue.put(("log", f"Processed {tsv_file.name}: {result_message}"))
-                    self.event_queue.put(("rowcount",))
-                    self.event_queue.put(("status_success", tsv_file.name, result_message))
+                    self._report_watch_error([tsv_file], exc)
+                    finished = True
+                if not finished:
+                    # Interrupted: keep the file claimed so it resumes on the next start, not in a retry loop.
+                    continue
+                watcher.done(tsv_file)
+        watcher.stop()
+        if self.folder_watcher is watcher:
+            self.folder_watcher = None
+        self.db_service.connections.close_thread_connection()
+
+    def _report_watch_error(self, files: list[Path], exc: Exception) -> None:
+        """Show an unexpected import failure and keep the watcher running."""
+        for tsv_file in files:
+            self.event_queue.put(("status", tsv_file.name, "Error", str(exc)))
+            self.event_queue.put(("log", f"Error processing {tsv_file.name}: {exc}"))
+        label = files[0].name if len(files) == 1 else f"{len(files)} files"
+        self.event_queue.put(("status_error", f"Failed to import {label}: {exc}"))
+
+    @staticmethod
+    def _is_large_tsv(tsv_file: Path) -> bool:
+        try:
+            return tsv_file.stat().st_size >= LARGE_TSV_IMPORT_BYTES
+        except OSError:
+            return False
+
+    def _import_watched_batch(self, batch: list[Path], subject: str) -> None:
+        for tsv_file in batch:
+            self.event_queue.put(("status", tsv_file.name, "Processing", "Validating..."))
+        label = batch[0].name if len(batch) == 1 else f"{len(batch)} files"
+        self.event_queue.put(("status_importing", label))
+        results = process_tsv_batch(batch, self.db_service, subject)
+        imported = 0
+        inserted_ids: list[int] = []
+        for tsv_file, ok, message, file_ids in results:
+            inserted_ids.extend(file_ids)
+            if ok:
+                imported += 1
+                self.event_queue.put(("status", tsv_file.name, "Completed", message))
+                self.event_queue.put(("log", f"Processed {tsv_file.name}: {message}"))
+            else:
+                self.event_queue.put(("status", tsv_file.name, "Error", message))
+                self.event_queue.put(("log", f"Error processing {tsv_file.name}: {message}"))
+        if inserted_ids:
+            self.event_queue.put(("dataset_changes", DatasetChanges(inserted=inserted_ids)))
+        failed = [(tsv_file, message) for tsv_file, ok, message, _ in results if not ok]
+        if failed:
+            tsv_file, message = failed[-1]
+            self.event_queue.put(("status_error", f"Failed to import {tsv_file.name}: {message}"))
+        elif len(results) == 1:
+            self.event_queue.put(("status_success", results[0][0].name, results[0][2]))
+        else:
+            self.event_queue.put(("status_success", label, f"{imported} files imported"))
+
+    def _import_large_tsv(self, tsv_file: Path, subject: str) -> bool:
+        """Import one large file in resumable chunks; False when it was interrupted."""
+        name = tsv_file.name
+        self.event_queue.put(("status", name, "Processing", "Validating..."))
+        self.event_queue.put(("status_importing", name))
 
-            time.sleep(poll_interval)
+        def progress(done: int, total: int) -> None:
+            percent = int(done * 100 / total) if total else 100
+            self.event_queue.put(("status", name, "Importing", f"{done}/{total} rows committed ({percent}%)"))
+
+        try:
+            ok, message, inserted_ids = process_tsv_resumable(
+                tsv_file, self.db_service, subject, progress_callback=progress, stop_event=self.stop_event
+            )
+        except ImportInterrupted as exc:
+            message = str(exc)
+            self.event_queue.put(("status", name, "Interrupted", message))
+            self.event_queue.put(("log", message))
+            self.event_queue.put(("status_error", message))
+            return False
+        if inserted_ids:
+            self.event_queue.put(("dataset_changes", DatasetChanges(inserted=inserted_ids)))
+        if ok:
+            self.event_queue.put(("status", name, "Completed", message))
+            self.event_queue.put(("log", f"Processed {name}: {message}"))
+            self.event_queue.put(("status_success", name, message))
+        else:
+            self.event_queue.put(("status", name, "Error", message))
+            self.event_queue.put(("log", f"Error processing {name}: {message}"))
+            self.event_queue.put(("status_error", f"Failed to import {name}: {message}"))
+        return True
 
     def _process_queue(self) -> None:
+        pending_changes = DatasetChanges()
         while True:
             try:
                 event = self.event_queue.get_nowait()
@@ -7553,6 +7763,7 @@ class TSVWatcherWindow(QMainWindow):
                     f"Tracked editions: {total_editions}",
                 )
                 
+                self.magazine_details = details
                 self.mag_page_ranges = self._compute_page_ranges_for_editions(self.Database_df, details)
                 self._populate_magazine_heatmap(details, self.mag_page_ranges)
                 self._populate_question_sets([])
@@ -7621,8 +7832,11 @@ class TSVWatcherWindow(QMainWindow):
             elif event_type == "status_success":
                 _, filename, result_msg = event
                 self.set_status(f'Data imported from "{filename}"  {result_msg}', "success")
-            elif event_type == "rowcount":
-                self.load_subject_from_db()
+            elif event_type == "dataset_changes":
+                # Coalesce: several imports finishing in one tick are applied together.
+                pending_changes.merge(event[1])
+        if not pending_changes.is_empty():
+            self.apply_dataset_changes(pending_changes)
         # Timer will trigger this method again; no manual reschedule needed.
 
     # ============================================================================
@@ -7790,4 +8004,5 @@ class TSVWatcherWindow(QMainWindow):
 
     def closeEvent(self, event) -> None:
         self.stop_watching()
+        self.db_service.close()
         super().closeEvent(event)
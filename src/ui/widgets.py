@@ -22,6 +22,8 @@ This module contains all custom widget classes used throughout the application:
 
 - QuestionCardWidget: Individual question card with inline preview
 
+- QuestionCardModel / QuestionCardDelegate / QuestionCardListView: Painted question card grid for accordion groups
+
 - QuestionAccordionGroup: Collapsible group for question cards
 
 - QuestionListCardView: Scrollable container for accordion groups
@@ -43,8 +45,8 @@ import os
 import base64
 from pathlib import Path
 
-from PySide6.QtCore import Qt, QMimeData, Signal, QRect, QPoint, QTimer, QSize, QByteArray, QBuffer
-from PySide6.QtGui import QColor, QDrag, QDragEnterEvent, QDropEvent, QPixmap, QPainter, QFont, QGuiApplication, QPen, QImage, QCursor
+from PySide6.QtCore import Qt, QMimeData, Signal, QRect, QRectF, QPoint, QTimer, QSize, QByteArray, QBuffer, QEvent, QAbstractListModel, QModelIndex
+from PySide6.QtGui import QColor, QDrag, QDragEnterEvent, QDropEvent, QPixmap, QPainter, QFont, QFontMetrics, QGuiApplication, QPen, QImage, QCursor
 from PySide6.QtWidgets import (
     QLabel,
     QPushButton,
@@ -67,9 +69,15 @@ from PySide6.QtWidgets import (
     QDialog,
     QTabWidget,
     QGraphicsDropShadowEffect,
+    QListView,
+    QStyledItemDelegate,
+    QToolTip,
+    QFrame,
+    QSizePolicy,
 )
 
 from ui.icon_utils import load_icon
+from utils.edition_index import EditionIndex, page_number_series
 from utils.helpers import normalize_magazine_edition
 
 # Load camera icon as base64 for inline HTML in question cards
@@ -703,6 +711,18 @@ class ChapterCardWidget(QWidget):
 
     
 
+    def set_question_count(self, question_count: int):
+
+        """Update the badge count"""
+
+        if question_count != self.question_count:
+
+            self.question_count = question_count
+
+            self.update()
+
+    
+
     def paintEvent(self, event):
 
         """Custom paint event to draw card with text and badge in one rectangle"""
@@ -947,6 +967,52 @@ class ChapterCardView(QWidget):
 
     
 
+    def sync_chapters(self, chapters: list[tuple[str, int]]):
+
+        """Match the stack to ordered (chapter_key, question_count) pairs, reusing existing cards"""
+
+        wanted = dict(chapters)
+
+        for chapter_key in [key for key in self.chapter_cards if key not in wanted]:
+
+            card = self.chapter_cards.pop(chapter_key)
+
+            self.cards_layout.removeWidget(card)
+
+            card.deleteLater()
+
+            if self.selected_chapter == chapter_key:
+
+                self.selected_chapter = None
+
+        
+
+        for index, (chapter_key, question_count) in enumerate(chapters):
+
+            card = self.chapter_cards.get(chapter_key)
+
+            if card is None:
+
+                card = ChapterCardWidget(chapter_key, chapter_key, question_count)
+
+                card.clicked.connect(self._on_card_clicked)
+
+                self.chapter_cards[chapter_key] = card
+
+            else:
+
+                card.set_question_count(question_count)
+
+                if self.cards_layout.indexOf(card) == index:
+
+                    continue
+
+                self.cards_layout.removeWidget(card)
+
+            self.cards_layout.insertWidget(index, card)
+
+    
+
     def clear_chapters(self):
 
         """Clear all chapter cards"""
@@ -1888,8 +1954,7 @@ class QuestionCardWithRemoveButton(QWidget):
         has_images = False
         if self.db_service and self.question_id:
             try:
-                counts = self.db_service.get_image_counts(int(self.question_id))
-                has_images = bool(counts and any(v > 0 for v in counts.values()))
+                has_images = self.db_service.has_images(int(self.question_id))
                 if has_images:
                     icon = load_icon("image_filled.svg")
             except Exception:
@@ -1966,7 +2031,7 @@ class QuestionCardWithRemoveButton(QWidget):
                     if item.widget():
                         item.widget().deleteLater()
                 try:
-                    images = self.db_service.get_images(int(self.question_id), kind)
+                    images = self.db_service.get_image_thumbnails(int(self.question_id), kind)
                 except Exception as exc:
                     err = QLabel(f"Failed to load images: {exc}")
                     err.setStyleSheet("color: #dc2626;")
@@ -2121,11 +2186,12 @@ class SimilarQuestionCard(QWidget):
         if not files:
             return
 
-        for file_path in files:
-            try:
-                self.db_service.add_question_image(int(self.question_id), kind, Path(file_path))
-            except Exception:
-                QMessageBox.warning(self, "Save Failed", f"Could not save image: {file_path}")
+        try:
+            _, failed = self.db_service.add_question_images(int(self.question_id), kind, [Path(p) for p in files])
+        except Exception:
+            failed = files
+        for file_path in failed:
+            QMessageBox.warning(self, "Save Failed", f"Could not save image: {file_path}")
 
         if refresh_callback:
             refresh_callback()
@@ -2186,6 +2252,37 @@ class SimilarQuestionCard(QWidget):
 
 
 
+# Item data roles used by QuestionCardModel
+QUESTION_ROLE = Qt.UserRole
+SELECTED_ROLE = Qt.UserRole + 1
+FLASH_ROLE = Qt.UserRole + 2
+
+
+def question_clipboard_text(question, copy_mode: str) -> str:
+    """Text a question card copies on double-click for the given copy mode."""
+    qno = question.get("qno", "?")
+    page = question.get("page", "?")
+    question_set = question.get("question_set_name", "Unknown")
+    magazine = question.get("magazine", "Unknown")
+    chapter = question.get("chapter", "Unknown")
+    tags = question.get("tags", "")
+    question_text = question.get("text", "")
+    if copy_mode == "Copy: Metadata":
+        # Metadata only: Q15 | P34 | Chapter | Question set name | Magazine edition
+        return f"Q{qno} | P{page} | {chapter} | {question_set} | {magazine}"
+    if copy_mode == "Copy: Both":
+        # Both: Full formatted text with question and metadata
+        tags_str = f" | Tags: {tags}" if tags else ""
+        return (
+            f"Q{qno} - {question_set}\n"
+            f"Chapter: {chapter} | Page: {page}{tags_str}\n"
+            f"Magazine: {magazine}\n\n"
+            f"{question_text}"
+        )
+    # "Copy: Text" - default: just the question
+    return question_text
+
+
 class QuestionCardWidget(QLabel):
 
     """
@@ -2367,8 +2464,7 @@ class QuestionCardWidget(QLabel):
         if not (self.db_service and self.question_id):
             return False
         try:
-            counts = self.db_service.get_image_counts(int(self.question_id))
-            return bool(counts and any(v > 0 for v in counts.values()))
+            return self.db_service.has_images(int(self.question_id))
         except Exception:
             return False
 
@@ -2676,8 +2772,7 @@ class QuestionCardWidget(QLabel):
         has_images = False
         if self.db_service and self.question_id:
             try:
-                counts = self.db_service.get_image_counts(int(self.question_id))
-                has_images = bool(counts and any(v > 0 for v in counts.values()))
+                has_images = self.db_service.has_images(int(self.question_id))
                 if has_images:
                     icon = load_icon("image_filled.svg")
             except Exception:
@@ -2743,7 +2838,7 @@ class QuestionCardWidget(QLabel):
                     if item.widget():
                         item.widget().deleteLater()
                 try:
-                    images = self.db_service.get_images(int(self.question_id), kind)
+                    images = self.db_service.get_image_thumbnails(int(self.question_id), kind)
                 except Exception as exc:
                     err = QLabel(f"Failed to load images: {exc}")
                     err.setStyleSheet("color: #dc2626;")
@@ -2792,11 +2887,12 @@ class QuestionCardWidget(QLabel):
         if not files:
             return
 
-        for file_path in files:
-            try:
-                self.db_service.add_question_image(int(self.question_id), kind, Path(file_path))
-            except Exception:
-                QMessageBox.warning(self, "Save Failed", f"Could not save image: {file_path}")
+        try:
+            _, failed = self.db_service.add_question_images(int(self.question_id), kind, [Path(p) for p in files])
+        except Exception:
+            failed = files
+        for file_path in failed:
+            QMessageBox.warning(self, "Save Failed", f"Could not save image: {file_path}")
 
         if refresh_callback:
             refresh_callback()
@@ -2879,24 +2975,6 @@ class QuestionCardWidget(QLabel):
 
         if event.button() == Qt.LeftButton:
 
-            q = self.question_data
-
-            qno = q.get("qno", "?")
-
-            page = q.get("page", "?")
-
-            question_set = q.get("question_set_name", "Unknown")
-
-            magazine = q.get("magazine", "Unknown")
-
-            chapter = q.get("chapter", "Unknown")
-
-            tags = q.get("tags", "")
-
-            question_text = q.get("text", "")
-
-            
-
             # Get copy mode from parent window
 
             parent_window = self._get_parent_window()
@@ -2917,45 +2995,11 @@ class QuestionCardWidget(QLabel):
 
             
 
-            # Build clipboard text based on selected mode
-
-            if copy_mode == "Copy: Metadata":
-
-                # Metadata only: Q15 | P34 | Chapter | Question set name | Magazine edition
-
-                clipboard_text = f"Q{qno} | P{page} | {chapter} | {question_set} | {magazine}"
-
-            elif copy_mode == "Copy: Both":
-
-                # Both: Full formatted text with question and metadata
-
-                tags_str = f" | Tags: {tags}" if tags else ""
-
-                clipboard_text = (
-
-                    f"Q{qno} - {question_set}\n"
-
-                    f"Chapter: {chapter} | Page: {page}{tags_str}\n"
-
-                    f"Magazine: {magazine}\n\n"
-
-                    f"{question_text}"
-
-                )
-
-            else:  # "Copy: Text" - default
-
-                # Text only: Just the question
-
-                clipboard_text = question_text
-
-            
-
             # Copy to clipboard
 
             clipboard = QGuiApplication.clipboard()
 
-            clipboard.setText(clipboard_text)
+            clipboard.setText(question_clipboard_text(self.question_data, copy_mode))
 
             
 
@@ -3023,7 +3067,7 @@ class QuestionCardWidget(QLabel):
 
             if not hasattr(self, '_cached_question_json'):
 
-                self._cached_question_json = json.dumps(self.question_data)
+                self._cached_question_json = json.dumps(dict(self.question_data))
 
             
 
@@ -3177,6 +3221,542 @@ class QuestionCardWidget(QLabel):
 
 
 
+class QuestionCardModel(QAbstractListModel):
+    """
+    List model over the questions of one accordion group.
+
+    Rows are read from the underlying sequence (a list of question dicts or a
+    QuestionView) only when the view asks for them, so a group costs the same
+    whether it holds 10 or 10,000 questions. Rows are exposed FETCH_BATCH at
+    a time through canFetchMore/fetchMore so a large group is laid out in
+    slices. Selection and the short-lived copy/highlight flashes are per-row
+    state kept here for the delegate.
+    """
+
+    FETCH_BATCH = 256
+
+    def __init__(self, questions, parent=None):
+        super().__init__(parent)
+        self._questions = questions
+        self._loaded = 0
+        self._selected: set[int] = set()
+        self._flash: dict[int, str] = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def question_count(self) -> int:
+        """All questions of the group, including rows not fetched yet."""
+        return len(self._questions)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < len(self._questions)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not parent.isValid():
+            self.fetch_until(self._loaded + self.FETCH_BATCH)
+
+    def fetch_until(self, count: int):
+        """Expose rows up to `count` (e.g. to reach a row that must be shown now)."""
+        count = min(count, len(self._questions))
+        if count <= self._loaded:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, count - 1)
+        self._loaded = count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == QUESTION_ROLE:
+            return self._questions[row]
+        if role == Qt.DisplayRole:
+            return f"Q{self._questions[row].get('qno', '?')}"
+        if role == SELECTED_ROLE:
+            return row in self._selected
+        if role == FLASH_ROLE:
+            return self._flash.get(row)
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsDragEnabled
+
+    def mimeTypes(self):
+        return ["application/x-question-data"]
+
+    def mimeData(self, indexes):
+        mime_data = QMimeData()
+        if indexes:
+            question = self._questions[indexes[0].row()]
+            mime_data.setData("application/x-question-data", json.dumps(dict(question)).encode())
+        return mime_data
+
+    def question(self, row: int) -> dict:
+        return self._questions[row]
+
+    def is_selected(self, row: int) -> bool:
+        return row in self._selected
+
+    def set_selected(self, row: int, selected: bool):
+        if selected == (row in self._selected):
+            return
+        if selected:
+            self._selected.add(row)
+        else:
+            self._selected.discard(row)
+        self._row_changed(row)
+
+    def flash(self, row: int, kind: str, msecs: int):
+        """Show a 'copied' or 'highlight' state on a row for `msecs` milliseconds."""
+        self._flash[row] = kind
+        self._row_changed(row)
+        # Timer is a child of the model so it dies with it when the view is rebuilt
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(lambda: self._end_flash(row, kind, timer))
+        timer.start(msecs)
+
+    def _end_flash(self, row: int, kind: str, timer: QTimer):
+        timer.deleteLater()
+        if self._flash.get(row) == kind:
+            del self._flash[row]
+            self._row_changed(row)
+
+    def _row_changed(self, row: int):
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+
+class QuestionCardDelegate(QStyledItemDelegate):
+    """
+    Paints one question card; looks the same as QuestionCardWidget.
+
+    Nothing is built per question: the header, preview, source line and tag
+    badges are drawn straight from the row's question dict at paint time,
+    and the hover image/edit buttons are painted for the hovered card only.
+    """
+
+    DEFAULT_TAG_COLORS = {
+        "important": "#ef4444",
+        "previous year": "#f59e0b",
+        "prev-year": "#f59e0b",
+        "conceptual": "#8b5cf6",
+        "numerical": "#10b981",
+        "difficult": "#dc2626",
+        "easy": "#22c55e",
+    }
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        self._group_tags: dict[str, tuple[list, dict]] = {}
+        self._image_icon = load_icon("image.svg")
+        self._image_filled_icon = load_icon("image_filled.svg")
+        self._edit_icon = load_icon("edit.svg")
+        self._check_font = self._font(18, True)
+        self._qno_font = self._font(16, True)
+        self._page_font = self._font(12)
+        self._text_font = self._font(13)
+        self._meta_font = self._font(11)
+        self._badge_font = self._font(9, True)
+
+    @staticmethod
+    def _font(pixel_size: int, bold: bool = False) -> QFont:
+        font = QFont()
+        font.setPixelSize(pixel_size)
+        font.setBold(bold)
+        return font
+
+    @staticmethod
+    def card_rect(cell: QRect) -> QRect:
+        """Card frame inside a grid cell (the old card margin and row spacing)."""
+        return cell.adjusted(4, 4, -4, -8)
+
+    @staticmethod
+    def button_rects(cell: QRect) -> tuple[QRect, QRect]:
+        """(image button, edit button) rects, anchored top-right as on QuestionCardWidget."""
+        image_rect = QRect(cell.right() - 32, cell.top() + 4, 28, 28)
+        edit_rect = QRect(cell.right() - 64, cell.top() + 4, 28, 28)
+        return image_rect, edit_rect
+
+    def sizeHint(self, option, index):
+        return self.view.gridSize()
+
+    def _card_tags(self, question) -> list[tuple[str, str]]:
+        """Question tags plus its question-set-group tags, with badge colors."""
+        tags = list(question.get("tags", []) or [])
+        group_tags = list(question.get("group_tags", []) or [])
+        group_colors = question.get("group_tag_colors", {}) or {}
+        set_group = question.get("question_set_group")
+        if set_group and not group_tags:
+            if set_group not in self._group_tags:
+                self._group_tags[set_group] = self._lookup_group_tags(set_group)
+            group_tags, group_colors = self._group_tags[set_group]
+        colors = dict(self.DEFAULT_TAG_COLORS)
+        colors.update(group_colors)
+        return [
+            (tag, colors.get(tag, colors.get(tag.lower(), "#6b7280")))
+            for tag in dict.fromkeys(tags + group_tags)
+        ]
+
+    def _lookup_group_tags(self, set_group: str) -> tuple[list, dict]:
+        tag_service = self.view.find_service("tag_service")
+        if not tag_service:
+            return [], {}
+        try:
+            tags = tag_service.get_group_tags(set_group) or []
+            return tags, {t: tag_service.get_or_assign_tag_color(t) for t in tags}
+        except Exception:
+            return [], {}
+
+    @staticmethod
+    def _preview(text: str, max_words: int = 18) -> str:
+        words = text.split()
+        if len(words) <= max_words:
+            return text
+        return " ".join(words[:max_words]) + "..."
+
+    def paint(self, painter, option, index):
+        question = index.data(QUESTION_ROLE)
+        if question is None:
+            return
+        row = index.row()
+        hovered = row == self.view.hover_row
+        selected = bool(index.data(SELECTED_ROLE))
+        flash = index.data(FLASH_ROLE)
+
+        if flash == "highlight":
+            background, border, border_width = "#fef08a", "#eab308", 3
+        elif flash == "copied":
+            background, border, border_width = "#d1fae5", "#10b981", 2
+        elif selected:
+            background, border, border_width = "#bfdbfe", "#10b981", 3
+        elif hovered:
+            background, border, border_width = "#ffffff", "#3b82f6", 2
+        else:
+            background, border, border_width = "#f8fafc", "#e2e8f0", 1
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        card = self.card_rect(option.rect)
+        inset = border_width / 2
+        painter.setPen(QPen(QColor(border), border_width))
+        painter.setBrush(QColor(background))
+        painter.drawRoundedRect(QRectF(card).adjusted(inset, inset, -inset, -inset), 8, 8)
+
+        content = card.adjusted(12, 12, -12, -12)
+        has_images = self.view.question_has_images(question)
+
+        # Header: [checkmark] Qno  Page N [camera]
+        header_height = 22
+        x = content.left()
+        pieces = []
+        if selected:
+            pieces.append(("✓", self._check_font, "#10b981", 8))
+        pieces.append((str(question.get("qno", "?")), self._qno_font, "#1e40af", 12))
+        pieces.append((f"Page {question.get('page', '?')}", self._page_font, "#64748b", 6))
+        if has_images:
+            pieces.append(("\U0001F4F7", self._page_font, "#0ea5e9", 0))
+        for text, font, color, gap in pieces:
+            painter.setFont(font)
+            painter.setPen(QColor(color))
+            width = QFontMetrics(font).horizontalAdvance(text)
+            painter.drawText(QRect(x, content.top(), width + 1, header_height), Qt.AlignLeft | Qt.AlignVCenter, text)
+            x += width + gap
+
+        separator_y = content.top() + header_height + 8
+        painter.setPen(QPen(QColor("#cbd5e1"), 1))
+        painter.drawLine(content.left(), separator_y, content.right(), separator_y)
+
+        # Bottom up: tag badges, then the source line
+        bottom = content.bottom()
+        tags = self._card_tags(question)
+        if tags:
+            badge_font = self._badge_font
+            badge_metrics = QFontMetrics(badge_font)
+            badge_top = bottom - 16
+            painter.setFont(badge_font)
+            x = content.left()
+            for tag, color in tags[:5]:
+                width = badge_metrics.horizontalAdvance(tag) + 12
+                if x + width > content.right():
+                    break
+                badge = QRect(x, badge_top, width, 16)
+                painter.setPen(Qt.NoPen)
+                painter.setBrush(QColor(color))
+                painter.drawRoundedRect(badge, 2, 2)
+                painter.setPen(QColor("white"))
+                painter.drawText(badge, Qt.AlignCenter, tag)
+                x += width + 6
+            bottom = badge_top - 4
+
+        meta_font = self._meta_font
+        meta_metrics = QFontMetrics(meta_font)
+        question_set = question.get("question_set_group") or question.get("question_set_name", "Unknown")
+        meta_text = meta_metrics.elidedText(
+            f"{question_set} | {question.get('magazine', 'Unknown')}", Qt.ElideRight, content.width()
+        )
+        meta_top = bottom - meta_metrics.height()
+        painter.setFont(meta_font)
+        painter.setPen(QColor("#475569"))
+        painter.drawText(QRect(content.left(), meta_top, content.width(), meta_metrics.height()), Qt.AlignLeft | Qt.AlignVCenter, meta_text)
+
+        # Preview fills whole lines between the separator and the source line
+        text_font = self._text_font
+        line_height = int(QFontMetrics(text_font).lineSpacing() * 1.2)
+        text_top = separator_y + 8
+        lines = max(0, (meta_top - 6 - text_top) // line_height)
+        if lines:
+            preview = self._preview(str(question.get("text", question.get("question_text", "No question text available"))))
+            painter.setFont(text_font)
+            painter.setPen(QColor("#1f2937"))
+            text_rect = QRect(content.left(), text_top, content.width(), lines * line_height)
+            painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignTop | Qt.TextWordWrap, preview)
+
+        if hovered:
+            image_rect, edit_rect = self.button_rects(option.rect)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor("#16a34a" if has_images else "#0ea5e9"))
+            painter.drawEllipse(image_rect)
+            icon = self._image_filled_icon if has_images else self._image_icon
+            icon.paint(painter, image_rect.adjusted(6, 6, -6, -6))
+            painter.setBrush(QColor("#f59e0b"))
+            painter.drawEllipse(edit_rect)
+            self._edit_icon.paint(painter, edit_rect.adjusted(7, 7, -7, -7))
+        painter.restore()
+
+
+class QuestionCardListView(QListView):
+    """
+    Two-column grid of question cards painted by QuestionCardDelegate.
+
+    The view never scrolls itself: it is sized to its full content height and
+    lives inside QuestionListCardView's scroll area, so only the cards in the
+    visible part of that area are painted. The height covers every question
+    from the start while the model's rows are fetched one batch per
+    event-loop turn, so the scroll range does not jump as cards fill in.
+    Clicks, double-click copy, drag and the hover image/edit buttons behave
+    as on QuestionCardWidget.
+    """
+
+    card_clicked = Signal(int)  # Emits the model row of the clicked card
+
+    CELL_HEIGHT = 194  # 190px card (margins included) + 4px row spacing
+
+    def __init__(self, model: QuestionCardModel, parent=None):
+        super().__init__(parent)
+        self.hover_row = -1
+        self._press_pos = None
+        self._press_row = -1
+        self._press_button = None
+        self._services = {}
+
+        self.setModel(model)
+        self.setItemDelegate(QuestionCardDelegate(self))
+        self.setViewMode(QListView.ListMode)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.Adjust)
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setFrameShape(QFrame.NoFrame)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.setMouseTracking(True)
+        self.viewport().setCursor(Qt.PointingHandCursor)
+        self.setStyleSheet("QListView { background: transparent; border: none; }")
+        self.setGridSize(self._cell_size())
+
+        model.modelReset.connect(self._update_height)
+        self._update_height()
+
+        # Rows arrive in batches, one per event-loop turn
+        self._fill_timer = QTimer(self)
+        self._fill_timer.setInterval(0)
+        self._fill_timer.timeout.connect(self._fetch_batch)
+        self._fill_timer.start()
+
+    @classmethod
+    def content_height(cls, question_count: int) -> int:
+        """Height of the two-column grid for `question_count` cards."""
+        return (question_count + 1) // 2 * cls.CELL_HEIGHT
+
+    def _cell_size(self) -> QSize:
+        # The list wraps once a cell would reach the last pixel column, so two
+        # cells must fit in width - 1.
+        return QSize(max(1, (self.viewport().width() - 1) // 2), self.CELL_HEIGHT)
+
+    def _update_height(self, *args):
+        self.setFixedHeight(self.content_height(self.model().question_count()) + 2 * self.frameWidth())
+
+    def _fetch_batch(self):
+        model = self.model()
+        if model.canFetchMore(QModelIndex()):
+            model.fetchMore(QModelIndex())
+        if not model.canFetchMore(QModelIndex()):
+            self._fill_timer.stop()
+
+    def resizeEvent(self, event):
+        """Keep two cards per row as the width changes."""
+        self.setGridSize(self._cell_size())
+        super().resizeEvent(event)
+
+    def wheelEvent(self, event):
+        """Let the enclosing scroll area scroll."""
+        event.ignore()
+
+    def find_service(self, name: str):
+        """Walk parents to find a service (db_service, tag_service) if available."""
+        if name not in self._services:
+            parent = self.parent()
+            while parent and not hasattr(parent, name):
+                parent = parent.parent()
+            self._services[name] = getattr(parent, name) if parent else None
+        return self._services[name]
+
+    def question_has_images(self, question) -> bool:
+        db_service = self.find_service("db_service")
+        question_id = question.get("question_id") or question.get("id")
+        if not (db_service and question_id):
+            return False
+        try:
+            return db_service.has_images(int(question_id))
+        except Exception:
+            return False
+
+    def _get_parent_window(self):
+        """Traverse up widget hierarchy to find the main window."""
+        parent = self.parent()
+        while parent:
+            if hasattr(parent, 'copy_mode'):
+                return parent
+            parent = parent.parent()
+        return None
+
+    def _button_at(self, index, pos):
+        """Name of the card action under `pos` on the hovered card, if any."""
+        if not index.isValid() or index.row() != self.hover_row:
+            return None
+        image_rect, edit_rect = QuestionCardDelegate.button_rects(self.visualRect(index))
+        if image_rect.contains(pos):
+            return "_show_image_popover"
+        if edit_rect.contains(pos):
+            return "_show_edit_dialog"
+        return None
+
+    def _set_hover_row(self, row: int):
+        if row == self.hover_row:
+            return
+        previous, self.hover_row = self.hover_row, row
+        for changed in (previous, row):
+            if changed >= 0:
+                self.viewport().update(self.visualRect(self.model().index(changed)))
+
+    def _run_card_action(self, row: int, action: str):
+        """Run a QuestionCardWidget image/edit action for one row."""
+        # A hidden, throwaway card reuses the card's dialogs; edits write back
+        # through the row's question dict.
+        card = QuestionCardWidget(self.model().question(row), self)
+        try:
+            getattr(card, action)()
+        finally:
+            card.deleteLater()
+        self.viewport().update(self.visualRect(self.model().index(row)))
+
+    def viewportEvent(self, event):
+        """Tooltips for the hover buttons."""
+        if event.type() == QEvent.ToolTip:
+            pos = event.pos()
+            action = self._button_at(self.indexAt(pos), pos)
+            if action == "_show_image_popover":
+                QToolTip.showText(event.globalPos(), "View / add question & answer images", self)
+            elif action == "_show_edit_dialog":
+                QToolTip.showText(event.globalPos(), "Edit question", self)
+            else:
+                QToolTip.hideText()
+            return True
+        return super().viewportEvent(event)
+
+    def leaveEvent(self, event):
+        """Hide hover buttons when leaving."""
+        self._set_hover_row(-1)
+        super().leaveEvent(event)
+
+    def mousePressEvent(self, event):
+        """Select the clicked card, or arm one of its hover buttons."""
+        if event.button() != Qt.LeftButton:
+            super().mousePressEvent(event)
+            return
+        index = self.indexAt(event.pos())
+        self._press_pos = event.pos()
+        self._press_row = index.row() if index.isValid() else -1
+        self._press_button = self._button_at(index, event.pos())
+        if self._press_row >= 0 and not self._press_button:
+            self.card_clicked.emit(self._press_row)
+
+    def mouseReleaseEvent(self, event):
+        """Run the hover button action when released over the same button."""
+        if event.button() != Qt.LeftButton:
+            super().mouseReleaseEvent(event)
+            return
+        action, row = self._press_button, self._press_row
+        self._press_pos = None
+        self._press_button = None
+        index = self.indexAt(event.pos())
+        if action and index.row() == row and self._button_at(index, event.pos()) == action:
+            self._run_card_action(row, action)
+
+    def mouseDoubleClickEvent(self, event):
+        """Handle double-click - copy based on selected mode."""
+        if event.button() != Qt.LeftButton:
+            super().mouseDoubleClickEvent(event)
+            return
+        index = self.indexAt(event.pos())
+        if not index.isValid() or self._button_at(index, event.pos()):
+            return
+        parent_window = self._get_parent_window()
+        copy_mode = parent_window.copy_mode if parent_window else "Copy: Text"
+        QGuiApplication.clipboard().setText(question_clipboard_text(self.model().question(index.row()), copy_mode))
+        self.model().flash(index.row(), "copied", 500)
+
+    def mouseMoveEvent(self, event):
+        """Track the hovered card and start drags."""
+        index = self.indexAt(event.pos())
+        self._set_hover_row(index.row() if index.isValid() else -1)
+        if not (event.buttons() & Qt.LeftButton) or self._press_pos is None or self._press_row < 0 or self._press_button:
+            return
+        if (event.pos() - self._press_pos).manhattanLength() < QApplication.startDragDistance():
+            return
+        row = self._press_row
+        self._press_pos = None
+        question = self.model().question(row)
+
+        drag = QDrag(self)
+        drag.setMimeData(self.model().mimeData([self.model().index(row)]))
+
+        # Simplified drag pixmap, same as QuestionCardWidget
+        pixmap = QPixmap(200, 80)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        painter.setOpacity(0.8)
+        painter.fillRect(pixmap.rect(), QColor("#f8fafc"))
+        painter.setPen(QColor("#1e40af"))
+        painter.setFont(QFont("Arial", 10, QFont.Bold))
+        painter.drawRect(0, 0, pixmap.width() - 1, pixmap.height() - 1)
+        painter.drawText(10, 20, f"Q{question.get('qno', '?')}")
+        painter.setFont(QFont("Arial", 8))
+        painter.drawText(10, 40, str(question.get('text', ''))[:40] + "...")
+        painter.end()
+        drag.setPixmap(pixmap)
+        drag.setHotSpot(QPoint(100, 40))
+        drag.exec(Qt.MoveAction | Qt.CopyAction)
+
+
 class QuestionAccordionGroup(QWidget):
 
     """
@@ -3193,7 +3773,9 @@ class QuestionAccordionGroup(QWidget):
 
     - Tag badges for group tags
 
-    - Contains multiple QuestionCardWidget children
+    - Cards are painted by a QuestionCardListView over a QuestionCardModel,
+
+      built only once the group is expanded and near the visible area
 
     - Smooth expand/collapse animation
 
@@ -3209,11 +3791,9 @@ class QuestionAccordionGroup(QWidget):
 
         GGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGGG
 
-        [QuestionCardWidget]
-
-        [QuestionCardWidget]
+        [card] [card]
 
-        [QuestionCardWidget]
+        [card] [card]
 
     """
 
@@ -3255,7 +3835,7 @@ class QuestionAccordionGroup(QWidget):
 
         self.is_expanded = False
 
-        self.question_cards = []
+        self._owner = parent  # QuestionListCardView; parent() becomes its container once added
 
         
 
@@ -3281,7 +3861,7 @@ class QuestionAccordionGroup(QWidget):
 
         
 
-        # Content container (collapsible) with 2-column grid
+        # Content container (collapsible) with the 2-column card grid
 
         self.content_widget = QWidget()
 
@@ -3293,41 +3873,13 @@ class QuestionAccordionGroup(QWidget):
 
         
 
-        # Add question cards in 2-column grid layout
-
-        row_layout = None
-
-        for i, question in enumerate(questions):
+        # The card grid is built by build_cards() once the group is expanded
 
-            card = QuestionCardWidget(question, self)
+        # and near the visible area; until then the content only reserves its height.
 
-            card.clicked.connect(self._on_card_clicked)
+        self.card_model = None
 
-            self.question_cards.append(card)
-
-            
-
-            # Create new row every 2 cards
-
-            if i % 2 == 0:
-
-                row_layout = QHBoxLayout()
-
-                row_layout.setSpacing(8)
-
-                self.content_layout.addLayout(row_layout)
-
-            
-
-            row_layout.addWidget(card)
-
-            
-
-            # Add stretch to last row if odd number of cards
-
-            if i == len(questions) - 1 and len(questions) % 2 == 1:
-
-                row_layout.addStretch()
+        self.card_view = None
 
         
 
@@ -3589,30 +4141,50 @@ class QuestionAccordionGroup(QWidget):
 
         self.is_expanded = not self.is_expanded
 
+        if self.is_expanded and self.card_view is None:
+
+            self.content_widget.setMinimumHeight(QuestionCardListView.content_height(len(self.questions)) + 16)
+
         self.content_widget.setVisible(self.is_expanded)
 
         icon = QStyle.SP_ArrowDown if self.is_expanded else QStyle.SP_ArrowRight
         self.expand_btn.setIcon(self.style().standardIcon(icon))
 
+        if self.is_expanded and self.card_view is None and hasattr(self._owner, 'schedule_build_cards'):
+
+            self._owner.schedule_build_cards()
+
     
 
-    def _on_card_clicked(self, question_data: dict):
+    def build_cards(self):
 
-        """Handle click on a question card."""
+        """Create the card model and view; rows are then filled in batches."""
 
-        # Forward to parent window for handling
+        if self.card_view is not None:
 
-        if hasattr(self.parent(), 'on_question_card_clicked'):
+            return
 
-            self.parent().on_question_card_clicked(question_data)
+        self.card_model = QuestionCardModel(self.questions, self)
+
+        self.card_view = QuestionCardListView(self.card_model, self.content_widget)
+
+        self.card_view.card_clicked.connect(self._on_card_clicked)
+
+        self.content_layout.addWidget(self.card_view)
+
+        self.content_widget.setMinimumHeight(0)
 
     
 
-    def get_all_cards(self) -> list:
+    def _on_card_clicked(self, row: int):
+
+        """Handle click on a question card."""
 
-        """Return all question card widgets."""
+        # Forward to the card view for selection handling
 
-        return self.question_cards
+        if hasattr(self._owner, 'on_question_card_clicked'):
+
+            self._owner.on_question_card_clicked(self, row)
 
     
 
@@ -3620,9 +4192,9 @@ class QuestionAccordionGroup(QWidget):
 
         """Show context menu for group operations."""
 
-        if hasattr(self.parent(), 'show_group_context_menu'):
+        if hasattr(self._owner, 'show_group_context_menu'):
 
-            self.parent().show_group_context_menu(self.group_key, self.header.mapToGlobal(position))
+            self._owner.show_group_context_menu(self.group_key, self.header.mapToGlobal(position))
 
     
 
@@ -3758,7 +4330,19 @@ class QuestionListCardView(QScrollArea):
 
         self.accordion_groups = []
 
-        self.selected_questions = []  # Track selected question data
+        self._selection = {}  # (group, row) -> question data, in click order
+
+        
+
+        # Expanded groups get their cards once they come near the viewport
+
+        self._build_timer = QTimer(self)
+
+        self._build_timer.setSingleShot(True)
+
+        self._build_timer.timeout.connect(self._build_visible_groups)
+
+        self.verticalScrollBar().valueChanged.connect(self.schedule_build_cards)
 
         
 
@@ -3796,7 +4380,51 @@ class QuestionListCardView(QScrollArea):
 
         self.accordion_groups.clear()
 
-        self.selected_questions.clear()
+        self._selection.clear()
+
+        self._build_timer.stop()
+
+    
+
+    def schedule_build_cards(self, *args):
+
+        """Build the cards of expanded groups near the viewport on the next event-loop turn."""
+
+        self._build_timer.start(0)
+
+    
+
+    def _build_visible_groups(self):
+
+        """Build cards for expanded groups within one viewport height of the visible area."""
+
+        self.container_layout.activate()
+
+        height = self.viewport().height()
+
+        top = self.verticalScrollBar().value() - height
+
+        bottom = top + 3 * height
+
+        for group in self.accordion_groups:
+
+            if group.is_expanded and group.card_view is None:
+
+                geometry = group.geometry()
+
+                if geometry.bottom() >= top and geometry.top() <= bottom:
+
+                    group.build_cards()
+
+    
+
+    def resizeEvent(self, event):
+
+        """More groups may fit after a resize."""
+
+        super().resizeEvent(event)
+
+        self.schedule_build_cards()
 
     
 
@@ -3832,7 +4460,7 @@ class QuestionListCardView(QScrollArea):
 
     
 
-    def on_question_card_clicked(self, question_data: dict):
+    def on_question_card_clicked(self, group: QuestionAccordionGroup, row: int):
 
         """
 
@@ -3842,7 +4470,9 @@ class QuestionListCardView(QScrollArea):
 
         Args:
 
-            question_data: Full question data dict
+            group: Accordion group containing the card
+
+            row: Row of the card in the group's card model
 
         """
 
@@ -3858,33 +4488,11 @@ class QuestionListCardView(QScrollArea):
 
         
 
-        # Find the card widget that was clicked
-
-        clicked_card = None
-
-        for group in self.accordion_groups:
-
-            for card in group.get_all_cards():
-
-                if card.question_data == question_data:
-
-                    clicked_card = card
-
-                    break
-
-            if clicked_card:
-
-                break
-
-        
-
-        if not clicked_card:
-
-            # Emit signal for detail display even if card not found
+        model = group.card_model
 
-            self.question_selected.emit(question_data)
+        question_data = model.question(row)
 
-            return
+        key = (group, row)
 
         
 
@@ -3894,43 +4502,31 @@ class QuestionListCardView(QScrollArea):
 
             # Toggle selection (multi-select)
 
-            if clicked_card.is_selected:
+            if key in self._selection:
 
-                clicked_card.set_selected(False)
+                model.set_selected(row, False)
 
-                if question_data in self.selected_questions:
-
-                    self.selected_questions.remove(question_data)
+                del self._selection[key]
 
             else:
 
-                clicked_card.set_selected(True)
-
-                if question_data not in self.selected_questions:
+                model.set_selected(row, True)
 
-                    self.selected_questions.append(question_data)
+                self._selection[key] = question_data
 
         else:
 
             # Single selection - clear others
 
-            for group in self.accordion_groups:
-
-                for card in group.get_all_cards():
+            for other_group, other_row in self._selection:
 
-                    if card != clicked_card:
+                other_group.card_model.set_selected(other_row, False)
 
-                        card.set_selected(False)
-
-            
+            self._selection.clear()
 
-            # Clear selection list and add only this one
+            model.set_selected(row, True)
 
-            self.selected_questions.clear()
-
-            clicked_card.set_selected(True)
-
-            self.selected_questions.append(question_data)
+            self._selection[key] = question_data
 
         
 
@@ -3956,9 +4552,9 @@ class QuestionListCardView(QScrollArea):
 
         """
 
-        if hasattr(self.parent(), 'show_group_context_menu_for_card'):
+        if hasattr(self.main_window, 'show_group_context_menu_for_card'):
 
-            self.parent().show_group_context_menu_for_card(group_key, position)
+            self.main_window.show_group_context_menu_for_card(group_key, position)
 
     
 
@@ -3976,7 +4572,77 @@ class QuestionListCardView(QScrollArea):
 
         """
 
-        return self.selected_questions
+        return list(self._selection.values())
+
+    
+
+    def find_question(self, field: str, value) -> tuple[QuestionAccordionGroup, int] | None:
+
+        """
+
+        Locate the first card whose question has `field` == `value`.
+
+        
+
+        Returns:
+
+            (group, row) or None when no group shows such a question
+
+        """
+
+        for group in self.accordion_groups:
+
+            for row, question in enumerate(group.questions):
+
+                if question.get(field) == value:
+
+                    return group, row
+
+        return None
+
+    
+
+    def highlight_question(self, group: QuestionAccordionGroup, row: int, msecs: int = 2000):
+
+        """Expand the group, flash the card yellow for `msecs` and scroll it into view."""
+
+        if not group.is_expanded:
+
+            group.toggle_expanded()
+
+        group.build_cards()
+
+        group.card_model.fetch_until(row + 1)
+
+        group.card_model.flash(row, "highlight", msecs)
+
+        # Wait for the expanded group to be laid out before scrolling
+
+        QTimer.singleShot(0, lambda: self.ensure_question_visible(group, row))
+
+    
+
+    def ensure_question_visible(self, group: QuestionAccordionGroup, row: int):
+
+        """Scroll so the card at `row` of `group` is visible."""
+
+        if group not in self.accordion_groups or group.card_view is None:
+
+            return
+
+        # Lay out the container and update the scroll range now, not on the next event
+
+        self.container_layout.activate()
+
+        QApplication.sendEvent(self, QEvent(QEvent.LayoutRequest))
+
+        card_view = group.card_view
+
+        rect = card_view.visualRect(group.card_model.index(row))
+
+        center = card_view.viewport().mapTo(self.container, rect.center())
+
+        self.ensureVisible(center.x(), center.y(), rect.width() // 2, rect.height() // 2)
 
     
 
@@ -4562,35 +5228,15 @@ class DashboardView(QWidget):
 
         
 
-        pages = []
-
-        for mag_val, page_val in zip(df[magazine_col], df[page_col]):
-
-            if mag_val is None or page_val is None:
-
-                continue
-
-            normalized = normalize_magazine_edition(str(mag_val))
+        positions = EditionIndex.for_frame(df).positions(normalized_magazine)
 
-            if normalized != normalized_magazine:
+        pages = page_number_series(df[page_col].iloc[positions]).dropna()
 
-                continue
-
-            try:
-
-                page_num = int(float(str(page_val).strip()))
-
-                pages.append(page_num)
-
-            except ValueError:
-
-                continue
-
-        if not pages:
+        if pages.empty:
 
             return ("", "")
 
-        return (str(min(pages)), str(max(pages)))
+        return (str(int(pages.min())), str(int(pages.max())))
 
             
 
@@ -0,0 +1,102 @@
+"""
+Vectorized edition and page derivations for question DataFrames.
+
+normalize_magazine_edition runs once per distinct edition string instead of
+once per row, page numbers are parsed with a single pd.to_numeric call and
+page ranges come from one groupby. EditionIndex maps each normalized edition
+to its row positions, so selecting an edition is a dictionary lookup rather
+than a scan of the whole DataFrame.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from config.constants import NORMALIZED_EDITION_COLUMN
+from utils.helpers import _find_magazine_column
+from utils.normalization import normalize_magazine_edition
+
+
+def normalize_edition_series(values: pd.Series) -> pd.Series:
+    """Categorical Series of normalized edition keys; missing values stay missing."""
+    editions = values.astype("category")
+    mapping = {value: normalize_magazine_edition(str(value)) for value in editions.cat.categories}
+    return editions.map(mapping).astype("category")
+
+
+def page_number_series(values: pd.Series) -> pd.Series:
+    """Float page numbers parsed from page text; NaN where the text is not a number."""
+    # Parse each distinct page string once, then broadcast through the category codes.
+    pages = values.astype("category")
+    numbers = pd.to_numeric(pages.cat.categories.astype(str).str.strip(), errors="coerce")
+    lookup = np.append(np.asarray(numbers, dtype=float), np.nan)
+    codes = pages.cat.codes.to_numpy()
+    return pd.Series(lookup[np.where(codes >= 0, codes, len(lookup) - 1)], index=values.index)
+
+
+def edition_page_ranges(editions: pd.Series, pages: pd.Series) -> dict[str, tuple[str, str]]:
+    """Return {normalized edition: (min page, max page)} over rows with a numeric page."""
+    frame = pd.DataFrame({"edition": editions.to_numpy(), "page": pages.to_numpy()}).dropna()
+    if frame.empty:
+        return {}
+    bounds = frame.groupby("edition", sort=False, observed=True)["page"].agg(["min", "max"])
+    return {str(edition): (str(int(low)), str(int(high))) for edition, low, high in zip(bounds.index, bounds["min"], bounds["max"])}
+
+
+def frame_editions(df: pd.DataFrame) -> pd.Series | None:
+    """Normalized edition per row: the precomputed column when present, else derived from the magazine column."""
+    if NORMALIZED_EDITION_COLUMN in df.columns:
+        return df[NORMALIZED_EDITION_COLUMN]
+    header_row = [None if pd.isna(col) else str(col) for col in df.columns]
+    try:
+        magazine_col = _find_magazine_column(header_row)
+    except ValueError:
+        return None
+    return normalize_edition_series(df.iloc[:, magazine_col - 1])
+
+
+class EditionIndex:
+    """normalized edition -> positional row indices for one DataFrame."""
+
+    _cache_lock = threading.Lock()
+    _cached: tuple[weakref.ref, "EditionIndex"] | None = None
+
+    def __init__(self, editions: pd.Series | None):
+        self._positions: dict[str, np.ndarray] = {}
+        if editions is not None and len(editions):
+            grouped = editions.groupby(editions, sort=False, observed=True, dropna=True).indices
+            self._positions = {str(edition): positions for edition, positions in grouped.items()}
+
+    @classmethod
+    def for_frame(cls, df: pd.DataFrame) -> "EditionIndex":
+        """
+        Return the index for `df`, building it on first use.
+
+        The most recent frame's index is kept, keyed by object identity, so the
+        loaded dataset is indexed once. Frames must not be modified in place
+        after indexing (dataset updates produce a new DataFrame).
+        """
+        with cls._cache_lock:
+            cached = cls._cached
+            if cached is not None and cached[0]() is df:
+                return cached[1]
+        index = cls(frame_editions(df))
+        with cls._cache_lock:
+            cls._cached = (weakref.ref(df), index)
+        return index
+
+    def positions(self, normalized_edition: str) -> np.ndarray:
+        return self._positions.get(normalized_edition, np.empty(0, dtype=np.intp))
+
+    def editions(self) -> list[str]:
+        return list(self._positions)
+
+    def __contains__(self, normalized_edition: object) -> bool:
+        return normalized_edition in self._positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
@@ -4,12 +4,19 @@ These functions are used throughout the application for consistent data processi
 """
 
 import csv
-import re
 import datetime as dt
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
 
-from config.constants import MONTH_ALIASES
+# Text normalization lives in utils.normalization (memoized); re-exported here.
+from utils.normalization import (  # noqa: F401
+    normalize_magazine_edition,
+    normalize_month_year,
+    normalize_page,
+    normalize_qno,
+    normalize_question_set,
+    normalize_text,
+)
 
 
 # ============================================================================
@@ -40,146 +47,6 @@ def validate_tsv(tsv_path: Path) -> None:
                 )
 
 
-# ============================================================================
-# Text Normalization Functions
-# ============================================================================
-
-def normalize_text(value: str) -> str:
-    """
-    Normalize text by converting to lowercase and removing special characters.
-    
-    Args:
-        value: Input string to normalize
-        
-    Returns:
-        Normalized string with only lowercase alphanumeric characters and spaces
-    """
-    cleaned = re.sub(r"[^a-z0-9]+", " ", value.lower())
-    return " ".join(cleaned.split())
-
-
-def normalize_month_year(value: str) -> str:
-    """
-    Extract and normalize month-year from a text string.
-    Recognizes month names and year formats like '2023', '23, or '23'.
-    
-    Args:
-        value: Input string containing month and/or year
-        
-    Returns:
-        Normalized string in format 'YYYY-MM' or just year if month not found
-    """
-    lower = value.lower()
-    month = None
-    
-    # Find month using aliases
-    for alias, number in MONTH_ALIASES.items():
-        if alias in lower:
-            month = number
-            break
-
-    # Find year (supports formats: 2023, 1999, '23)
-    year_match = re.search(r"(20\d{2}|19\d{2}|'\d{2})", lower)
-    year = None
-    if year_match:
-        token = year_match.group(0)
-        if token.startswith("'"):
-            year = 2000 + int(token.strip("'"))
-        else:
-            year = int(token)
-
-    # Format result based on what was found
-    if month and year:
-        return f"{year:04d}-{month:02d}"
-    if year and not month:
-        return str(year)
-    return normalize_text(value)
-
-
-def normalize_magazine_edition(value: str) -> str:
-    """
-    Normalize magazine edition string.
-    Expected format: "Magazine Name | Month Year"
-    
-    Args:
-        value: Magazine edition string
-        
-    Returns:
-        Normalized string in format "normalized_name|YYYY-MM"
-    """
-    if not value:
-        return ""
-    
-    # Split by pipe separator
-    parts = value.split("|", 1)
-    magazine_name = parts[0].strip()
-    edition_part = parts[1].strip() if len(parts) > 1 else ""
-    
-    # Normalize both parts
-    normalized_mag_name = normalize_text(magazine_name)
-    normalized_edition = normalize_month_year(edition_part or magazine_name)
-    
-    return f"{normalized_mag_name}|{normalized_edition}"
-
-
-def normalize_question_set(value: str) -> str:
-    """
-    Normalize question set name for comparison.
-    
-    Args:
-        value: Question set name
-        
-    Returns:
-        Normalized question set name
-    """
-    return normalize_text(value)
-
-
-def normalize_qno(value) -> str:
-    """
-    Normalize question number for consistent comparison.
-    Handles numeric and text question numbers.
-    
-    Args:
-        value: Question number (can be int, float, or string)
-        
-    Returns:
-        Normalized question number as string
-    """
-    if value is None:
-        return ""
-    
-    # Handle numeric types
-    if isinstance(value, (int, float)):
-        try:
-            return str(int(round(value)))
-        except (TypeError, ValueError):
-            pass
-    
-    # Handle string types
-    text = str(value).strip()
-    if text.isdigit():
-        return str(int(text))
-    
-    cleaned = re.sub(r"[^a-z0-9]+", " ", text.lower())
-    return " ".join(cleaned.split())
-
-
-def normalize_page(value) -> str:
-    """
-    Normalize page number for consistent comparison.
-    
-    Args:
-        value: Page number
-        
-    Returns:
-        Normalized page number as string
-    """
-    if value is None:
-        return ""
-    return normalize_text(str(value))
-
-
 # ============================================================================
 # Excel Column Finding Functions
 # ============================================================================
@@ -0,0 +1,194 @@
+"""
+Memoized normalization of magazine editions, question numbers and pages.
+
+A question bank contains only a few hundred distinct edition strings and
+page/question numbers, but these functions run once per row during imports,
+magazine summaries, page-range computation and PDF sorting. Each function is
+wrapped in a bounded LRU cache and uses precompiled patterns; results are
+identical to the original uncached implementations.
+
+normalization_cache_info() reports hit/miss counts per function and
+clear_normalization_caches() empties every cache.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict
+
+from config.constants import MONTH_ALIASES
+
+NORMALIZATION_CACHE_SIZE = 4096
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+# One pass finds every month alias (overlapping, via lookahead) and years like 2023, 1999, '23.
+# Aliases are listed in MONTH_ALIASES order so the first alternative that matches
+# at a position is also the earliest alias in the table.
+_MONTH_YEAR_RE = re.compile(
+    "(?=(" + "|".join(re.escape(alias) for alias in MONTH_ALIASES) + r"))|(20\d{2}|19\d{2}|'\d{2})"
+)
+_MONTH_ALIAS_RANK = {alias: index for index, alias in enumerate(MONTH_ALIASES)}
+
+_CACHES: Dict[str, Any] = {}
+
+
+def _memoized(func: Callable) -> Callable:
+    """LRU-cache `func`, calling it directly for unhashable arguments."""
+    cached = lru_cache(maxsize=NORMALIZATION_CACHE_SIZE, typed=True)(func)
+
+    @wraps(func)
+    def wrapper(value):
+        try:
+            return cached(value)
+        except TypeError:
+            return func(value)
+
+    _CACHES[func.__name__] = cached
+    return wrapper
+
+
+def normalization_cache_info() -> Dict[str, Dict[str, int]]:
+    """Return {function name: {hits, misses, maxsize, currsize}} for every cache."""
+    return {name: cached.cache_info()._asdict() for name, cached in _CACHES.items()}
+
+
+def clear_normalization_caches() -> None:
+    for cached in _CACHES.values():
+        cached.cache_clear()
+
+
+@_memoized
+def normalize_text(value: str) -> str:
+    """
+    Normalize text by converting to lowercase and removing special characters.
+
+    Args:
+        value: Input string to normalize
+
+    Returns:
+        Normalized string with only lowercase alphanumeric characters and spaces
+    """
+    return " ".join(_NON_ALNUM_RE.sub(" ", value.lower()).split())
+
+
+@_memoized
+def normalize_month_year(value: str) -> str:
+    """
+    Extract and normalize month-year from a text string.
+    Recognizes month names and year formats like '2023', '23, or '23'.
+
+    Args:
+        value: Input string containing month and/or year
+
+    Returns:
+        Normalized string in format 'YYYY-MM' or just year if month not found
+    """
+    lower = value.lower()
+    month_alias = None
+    year_token = None
+    for match in _MONTH_YEAR_RE.finditer(lower):
+        alias, token = match.groups()
+        if alias is not None:
+            if month_alias is None or _MONTH_ALIAS_RANK[alias] < _MONTH_ALIAS_RANK[month_alias]:
+                month_alias = alias
+        elif year_token is None:
+            year_token = token
+
+    month = MONTH_ALIASES[month_alias] if month_alias else None
+    year = None
+    if year_token:
+        year = 2000 + int(year_token.strip("'")) if year_token.startswith("'") else int(year_token)
+
+    # Format result based on what was found
+    if month and year:
+        return f"{year:04d}-{month:02d}"
+    if year and not month:
+        return str(year)
+    return normalize_text(value)
+
+
+@_memoized
+def normalize_magazine_edition(value: str) -> str:
+    """
+    Normalize magazine edition string.
+    Expected format: "Magazine Name | Month Year"
+
+    Args:
+        value: Magazine edition string
+
+    Returns:
+        Normalized string in format "normalized_name|YYYY-MM"
+    """
+    if not value:
+        return ""
+
+    # Split by pipe separator
+    parts = value.split("|", 1)
+    magazine_name = parts[0].strip()
+    edition_part = parts[1].strip() if len(parts) > 1 else ""
+
+    # Normalize both parts
+    normalized_mag_name = normalize_text(magazine_name)
+    normalized_edition = normalize_month_year(edition_part or magazine_name)
+
+    return f"{normalized_mag_name}|{normalized_edition}"
+
+
+def normalize_question_set(value: str) -> str:
+    """
+    Normalize question set name for comparison.
+
+    Args:
+        value: Question set name
+
+    Returns:
+        Normalized question set name
+    """
+    return normalize_text(value)
+
+
+@_memoized
+def normalize_qno(value) -> str:
+    """
+    Normalize question number for consistent comparison.
+    Handles numeric and text question numbers.
+
+    Args:
+        value: Question number (can be int, float, or string)
+
+    Returns:
+        Normalized question number as string
+    """
+    if value is None:
+        return ""
+
+    # Handle numeric types
+    if isinstance(value, (int, float)):
+        try:
+            return str(int(round(value)))
+        except (TypeError, ValueError):
+            pass
+
+    # Handle string types
+    text = str(value).strip()
+    if text.isdigit():
+        return str(int(text))
+
+    return normalize_text(text)
+
+
+@_memoized
+def normalize_page(value) -> str:
+    """
+    Normalize page number for consistent comparison.
+
+    Args:
+        value: Page number
+
+    Returns:
+        Normalized page number as string
+    """
+    if value is None:
+        return ""
+    return normalize_text(str(value))
@@ -0,0 +1,80 @@
+"""
+Word-level text search terms shared by the FTS5 index and the in-memory query index.
+
+Text is split into lowercase runs of letters and digits with accents
+removed, the same words SQLite's unicode61 tokenizer produces with
+remove_diacritics 2 (how questions_fts is built), so a search gives the same
+matches whether it runs against questions_fts or against loaded questions.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import List, Sequence, Tuple
+
+_WORD_RE = re.compile(r"[^\W_]+")
+_PHRASE_RE = re.compile(r'"([^"]*)"(\*?)|(\S+)')
+
+# (words, last word is a prefix)
+SearchTerm = Tuple[Tuple[str, ...], bool]
+
+
+def fold_diacritics(text: str) -> str:
+    """Remove accents ("Schrödinger" -> "Schrodinger") the way unicode61 remove_diacritics 2 does."""
+    if text.isascii():
+        return text
+    # NFD splits off the combining marks; NFC re-composes what is left (e.g. Hangul).
+    stripped = "".join(char for char in unicodedata.normalize("NFD", text) if not unicodedata.combining(char))
+    return unicodedata.normalize("NFC", stripped)
+
+
+def tokenize_text(text: str) -> List[str]:
+    """Lowercase, accent-folded words of `text` in order."""
+    return _WORD_RE.findall(fold_diacritics(text.lower())) if text else []
+
+
+def phrase_term(text: str) -> SearchTerm | None:
+    """One phrase from `text`; a trailing * makes the last word a prefix."""
+    words = tuple(tokenize_text(text))
+    if not words:
+        return None
+    return words, text.rstrip().endswith("*")
+
+
+def parse_search_terms(text: str) -> List[SearchTerm]:
+    """
+    Split free search text into terms that must all match.
+
+    Bare words match whole words, "quoted words" match as a phrase and a
+    trailing * (word* or "quoted phrase"*) matches a prefix of the last word.
+    """
+    terms: List[SearchTerm] = []
+    for match in _PHRASE_RE.finditer(text or ""):
+        quoted, quoted_star, bare = match.groups()
+        if bare is not None:
+            # Punctuation inside a bare word splits it, e.g. x^2 -> phrase "x 2".
+            term = phrase_term(bare)
+        else:
+            term = phrase_term(quoted + quoted_star)
+        if term is not None:
+            terms.append(term)
+    return terms
+
+
+def fts_match_expression(terms: Sequence[SearchTerm]) -> str:
+    """FTS5 MATCH expression requiring every term (phrases quoted, prefixes starred)."""
+    return " ".join(f'"{" ".join(words)}"{"*" if prefix else ""}' for words, prefix in terms)
+
+
+def phrase_in_words(words: Sequence[str], term: SearchTerm) -> bool:
+    """True when `words` (tokenize_text output) contains the phrase `term`."""
+    phrase, prefix = term
+    size = len(phrase)
+    last = size - 1
+    for start in range(len(words) - size + 1):
+        if all(words[start + offset] == phrase[offset] for offset in range(last)):
+            word = words[start + last]
+            if word == phrase[last] or (prefix and word.startswith(phrase[last])):
+                return True
+    return False
@@ -0,0 +1,60 @@
+"""Shared fixtures: a throwaway question bank with the pre-migration schema."""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services.db_service import DatabaseService  # noqa: E402
+
+# Tables the migrations expect to exist already (created by the original app).
+BASE_SCHEMA = """
+CREATE TABLE subjects (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE COLLATE NOCASE
+);
+CREATE TABLE questions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    subject_id INTEGER REFERENCES subjects(id),
+    source TEXT,
+    magazine TEXT,
+    normalized_magazine TEXT,
+    edition TEXT,
+    issue_year INTEGER,
+    issue_month INTEGER,
+    page_range TEXT,
+    question_set TEXT,
+    question_set_name TEXT,
+    chapter TEXT,
+    high_level_chapter TEXT,
+    question_number TEXT,
+    question_text TEXT,
+    answer_text TEXT,
+    explanation TEXT,
+    metadata_json TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE images (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    question_id INTEGER REFERENCES questions(id) ON DELETE CASCADE,
+    kind TEXT,
+    mime_type TEXT,
+    data BLOB,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+
+@pytest.fixture
+def db_service(tmp_path):
+    db_path = tmp_path / "question_bank.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(BASE_SCHEMA)
+    conn.close()
+    service = DatabaseService(db_path)
+    yield service
+    service.close()
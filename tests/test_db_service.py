@@ -0,0 +1,159 @@
+"""DatabaseService behaviour against a throwaway question bank."""
+
+import io
+
+import pandas as pd
+import pytest
+from PIL import Image
+
+from models.question_query import compile_query
+from models.question_store import QuestionStore
+
+
+def _record(magazine: str, qno: str, page: str) -> dict:
+    return {
+        "magazine": magazine,
+        "question_number": qno,
+        "page_range": page,
+        "question_set_name": "Set A",
+        "chapter": "Kinematics",
+        "high_level_chapter": "Mechanics",
+        "question_text": f"Question {qno}",
+    }
+
+
+def _row(db_service, question_id: int) -> dict:
+    with db_service.transaction() as conn:
+        row = conn.execute("SELECT * FROM questions WHERE id = ?", (question_id,)).fetchone()
+    return {key: row[key] for key in row.keys()}
+
+
+def test_magazine_edit_rederives_edition_columns(db_service):
+    (question_id,), _ = db_service.insert_questions_from_tsv(
+        "Physics", [_record("Physics For You March 2023", "1", "10")]
+    )
+    before = _row(db_service, question_id)
+    assert (before["edition"], before["issue_year"], before["issue_month"]) == ("2023-03", 2023, 3)
+
+    db_service.update_question_fields(question_id, {"magazine": "Physics For You July 2024"})
+
+    after = _row(db_service, question_id)
+    assert after["normalized_magazine"] == "physics for you july 2024|2024-07"
+    assert (after["edition"], after["issue_year"], after["issue_month"]) == ("2024-07", 2024, 7)
+
+
+def test_magazine_edit_without_issue_keeps_edition_columns(db_service):
+    (question_id,), _ = db_service.insert_questions_from_tsv(
+        "Physics", [_record("Physics For You March 2023", "1", "10")]
+    )
+    db_service.update_question_fields(question_id, {"magazine": "Physics For You Special Issue"})
+
+    after = _row(db_service, question_id)
+    assert after["magazine"] == "Physics For You Special Issue"
+    assert (after["edition"], after["issue_year"], after["issue_month"]) == ("2023-03", 2023, 3)
+
+
+def test_edit_colliding_with_another_question_raises(db_service):
+    ids, _ = db_service.insert_questions_from_tsv(
+        "Physics",
+        [_record("Physics For You March 2023", "1", "10"), _record("Physics For You March 2023", "2", "10")],
+    )
+    with pytest.raises(ValueError, match=f"question id {ids[0]}"):
+        db_service.update_question_fields(ids[1], {"question_number": "1"})
+
+
+def test_text_search_ranks_phrases_and_prefixes_within_subject(db_service):
+    texts = [
+        "Newton's second law for a block on an incline.",
+        "The second block obeys the law of cooling.",
+        "Velocity and velocities: second law, second law, second law.",
+    ]
+    records = [_record("Physics For You March 2023", str(qno), "10") for qno in (1, 2, 3)]
+    for record, text in zip(records, texts):
+        record["question_text"] = text
+    ids, _ = db_service.insert_questions_from_tsv("Physics", records)
+    other_ids, _ = db_service.insert_questions_from_tsv("Chemistry", [dict(records[0], question_text=texts[2])])
+
+    phrase = db_service.search_question_text('"second law"', "Physics", limit=None)
+    assert [result["question_id"] for result in phrase] == [ids[2], ids[0]]
+    assert [result["question_id"] for result in db_service.search_question_text("velo*", "Physics")] == [ids[2]]
+    assert len(db_service.search_question_text('"second law"', limit=None)) == 3
+    assert db_service.search_question_text('"second law"', "Physics", limit=1)[0]["question_id"] == ids[2]
+    assert other_ids[0] not in {result["question_id"] for result in phrase}
+
+
+
+@pytest.mark.parametrize("immediate", [False, True])
+def test_write_inside_transaction_scope_raises(db_service, immediate):
+    (question_id,), _ = db_service.insert_questions_from_tsv("Physics", [_record("Physics For You March 2023", "1", "10")])
+    with pytest.raises(RuntimeError, match="writer"):
+        with db_service.transaction(immediate=immediate):
+            db_service.update_question_fields(question_id, {"chapter": "Optics"})
+    db_service.update_question_fields(question_id, {"chapter": "Optics"})
+    assert _row(db_service, question_id)["chapter"] == "Optics"
+
+
+def test_missing_thumbnail_is_built_once_off_the_calling_thread(db_service):
+    (question_id,), _ = db_service.insert_questions_from_tsv("Physics", [_record("Physics For You March 2023", "1", "10")])
+    buffer = io.BytesIO()
+    Image.new("RGB", (800, 600), (30, 120, 200)).save(buffer, "PNG")
+    db_service.add_question_image_bytes(question_id, "question", buffer.getvalue(), "image/png")
+    with db_service.transaction() as conn:
+        blob_hash, data = conn.execute("SELECT hash, data FROM image_blobs").fetchone()
+
+    def drop_thumbnails():  # as left behind by the image_blobs migration
+        with db_service.transaction() as conn:
+            conn.execute("UPDATE image_blobs SET thumb = NULL, thumb_mime = NULL")
+
+    db_service.submit_write(drop_thumbnails).result()
+
+    (first,) = db_service.get_image_thumbnails(question_id, "question")
+    assert first["data"] == data
+    job = db_service._thumbnail_jobs[blob_hash]
+    db_service.get_image_thumbnails(question_id, "question")
+    assert db_service._thumbnail_jobs[blob_hash] is job
+    job.result(timeout=10)
+
+    (second,) = db_service.get_image_thumbnails(question_id, "question")
+    assert len(second["data"]) < len(data)
+    with db_service.transaction() as conn:
+        assert conn.execute("SELECT thumb IS NOT NULL FROM image_blobs").fetchone()[0]
+
+
+def test_has_images_sees_images_added_after_priming(db_service):
+    ids, _ = db_service.insert_questions_from_tsv(
+        "Physics", [_record("Physics For You March 2023", str(qno), "10") for qno in (1, 2, 3)]
+    )
+    db_service.prime_image_counts(ids)
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8)).save(buffer, "PNG")
+    db_service.add_question_image_bytes(ids[1], "question", buffer.getvalue(), "image/png")
+    frame = pd.DataFrame({"id": ids, "chapter": "Kinematics", "qno": ["1", "2", "3"], "page": "10"})
+    store = QuestionStore.from_columns(frame["chapter"], frame["qno"], frame["page"], question_id=frame["id"])
+    view = store.view(range(len(store)))
+
+    def filtered(query: str) -> list:
+        compiled = compile_query(query, ids_with_images=db_service.question_ids_with_images)
+        return [record["question_id"] for record in compiled.filter(view)]
+
+    assert filtered("has_images") == [ids[1]]
+    assert filtered("has_images = false") == [ids[0], ids[2]]
+    db_service.delete_images(ids[1])
+    assert filtered("has_images") == []
+
+
+@pytest.mark.parametrize("text_index", [True, False])
+def test_accented_words_match_the_same_in_fts_and_loaded_questions(db_service, text_index):
+    record = dict(_record("Physics For You March 2023", "1", "10"), question_text="The Schrödinger equation, naïvely")
+    (question_id,), _ = db_service.insert_questions_from_tsv("Physics", [record])
+    db_service._has_text_index = db_service._has_text_index and text_index
+    frame = pd.DataFrame({"id": [question_id], "chapter": "Quantum", "text": [record["question_text"]]})
+    store = QuestionStore.from_columns(
+        frame["chapter"], frame["chapter"], frame["chapter"], text=frame["text"], question_id=frame["id"]
+    )
+    view = store.view([0])
+
+    for search in ("schrodinger", "Schrödinger", '"schrodinger equation"', "naive*"):
+        in_memory = [row["question_id"] for row in compile_query(f"text : '{search}'").filter(view)]
+        assert in_memory == [question_id], search
+        assert [hit["question_id"] for hit in db_service.search_question_text(search)] == [question_id], search
@@ -0,0 +1,60 @@
+"""Chunked, resumable TSV imports."""
+
+import threading
+
+import pytest
+
+from services.excel_service import ImportInterrupted, process_tsv_resumable
+
+HEADER = "Magazine Edition\tQuestion Set\tQno\tPage No\tHigh Level Chapter\tQuestion Text\n"
+
+
+def _write_tsv(path, rows: int):
+    lines = [HEADER]
+    for qno in range(1, rows + 1):
+        lines.append(f"Physics For You March 2023\tSet A\t{qno}\t{10 + qno}\tMechanics\tQuestion {qno}\n")
+    path.write_text("".join(lines), encoding="utf-8")
+    return path
+
+
+def _interrupt_after_first_chunk(tsv_path, db_service, subject: str) -> None:
+    stop = threading.Event()
+    with pytest.raises(ImportInterrupted):
+        process_tsv_resumable(
+            tsv_path, db_service, subject, chunk_size=2, progress_callback=lambda done, total: stop.set(), stop_event=stop
+        )
+
+
+def _subject_counts(db_service) -> dict:
+    with db_service.transaction() as conn:
+        rows = conn.execute(
+            "SELECT s.name, COUNT(q.id) FROM questions q JOIN subjects s ON s.id = q.subject_id GROUP BY s.name"
+        ).fetchall()
+    return {name: count for name, count in rows}
+
+
+def test_resume_continues_after_last_committed_chunk(tmp_path, db_service):
+    tsv_path = _write_tsv(tmp_path / "batch.tsv", 5)
+    _interrupt_after_first_chunk(tsv_path, db_service, "Physics")
+    assert tsv_path.exists()
+    assert _subject_counts(db_service) == {"Physics": 2}
+
+    ok, message, inserted_ids = process_tsv_resumable(tsv_path, db_service, "Physics", chunk_size=2)
+
+    assert ok, message
+    assert message.startswith("Resumed after line 3")
+    assert len(inserted_ids) == 3
+    assert _subject_counts(db_service) == {"Physics": 5}
+    assert not tsv_path.exists()
+
+
+def test_checkpoint_from_another_subject_is_ignored(tmp_path, db_service):
+    tsv_path = _write_tsv(tmp_path / "batch.tsv", 5)
+    _interrupt_after_first_chunk(tsv_path, db_service, "Physics")
+
+    ok, message, inserted_ids = process_tsv_resumable(tsv_path, db_service, "Chemistry", chunk_size=2)
+
+    assert ok, message
+    assert not message.startswith("Resumed")
+    assert len(inserted_ids) == 5
+    assert _subject_counts(db_service) == {"Physics": 2, "Chemistry": 5}
@@ -0,0 +1,58 @@
+"""FolderWatcher delivery and shutdown."""
+
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services.folder_watcher import FolderWatcher  # noqa: E402
+
+
+def _fd_is_open(fd: int) -> bool:
+    try:
+        os.fstat(fd)
+    except OSError:
+        return False
+    return True
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_hands_out_stable_file_and_closes_pipe_on_stop(tmp_path, use_inotify):
+    watcher = FolderWatcher(tmp_path, settle_seconds=0.1, closed_settle_seconds=0.05, poll_interval=0.05, use_inotify=use_inotify)
+    watcher.start()
+    (tmp_path / "batch.tsv").write_text("a\tb\n", encoding="utf-8")
+
+    assert watcher.next_ready(timeout=5) == tmp_path / "batch.tsv"
+
+    wake_fds = (watcher._wake_r, watcher._wake_w)
+    watcher.stop()
+    assert not watcher._thread.is_alive()
+    assert not any(_fd_is_open(fd) for fd in wake_fds)
+    assert watcher.next_ready(timeout=0.1) is None
+
+
+def test_stop_leaves_pipe_to_a_thread_that_is_still_running(tmp_path, monkeypatch):
+    watcher = FolderWatcher(tmp_path, use_inotify=False)
+    busy, gate = threading.Event(), threading.Event()
+
+    def slow_rescan():
+        busy.set()
+        gate.wait(10)
+
+    # A watcher thread stuck in a rescan outlives stop()'s join timeout.
+    monkeypatch.setattr(watcher, "_rescan", slow_rescan)
+    watcher.start()
+    assert busy.wait(5)
+    monkeypatch.setattr(watcher._thread, "join", lambda timeout=None: None)
+
+    watcher.stop()
+    assert watcher._thread.is_alive()
+    assert _fd_is_open(watcher._wake_r) and _fd_is_open(watcher._wake_w)
+
+    gate.set()
+    threading.Thread.join(watcher._thread, 5)
+    assert not _fd_is_open(watcher._wake_r) and not _fd_is_open(watcher._wake_w)
@@ -0,0 +1,57 @@
+"""Ingest optimization of question images."""
+
+import io
+import sys
+from pathlib import Path
+
+from PIL import Image, ImageCms
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services.image_store import DEFAULT_OPTIMIZATION, optimize_image, strip_jpeg_metadata  # noqa: E402
+
+SETTINGS = {**DEFAULT_OPTIMIZATION, "enabled": True}
+
+
+def _jpeg_with_metadata(orientation: int = 1) -> bytes:
+    img = Image.new("RGB", (64, 48), (200, 30, 30))
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    exif[0x8825] = {1: "N", 2: (52.0, 31.0, 12.0)}  # GPS IFD
+    icc = ImageCms.ImageCmsProfile(ImageCms.createProfile("sRGB")).tobytes()
+    buffer = io.BytesIO()
+    img.save(buffer, "JPEG", quality=90, exif=exif, icc_profile=icc, comment=b"shot on a phone")
+    return buffer.getvalue()
+
+
+def _decoded(data: bytes) -> Image.Image:
+    with Image.open(io.BytesIO(data)) as img:
+        img.load()
+        return img.copy()
+
+
+def test_small_jpeg_loses_metadata_but_not_pixels():
+    original = _jpeg_with_metadata()
+
+    optimized, mime_type = optimize_image(original, "image/jpeg", SETTINGS)
+
+    assert mime_type == "image/jpeg"
+    result = _decoded(optimized)
+    assert not result.getexif()
+    assert "icc_profile" not in result.info
+    assert "comment" not in result.info
+    assert result.tobytes() == _decoded(original).tobytes()
+
+
+def test_rotated_jpeg_is_re_encoded_upright():
+    optimized, _ = optimize_image(_jpeg_with_metadata(orientation=6), "image/jpeg", SETTINGS)
+
+    result = _decoded(optimized)
+    assert result.size == (48, 64)
+    assert not result.getexif()
+
+
+def test_strip_jpeg_metadata_leaves_unparsable_input_alone():
+    assert strip_jpeg_metadata(b"not a jpeg") == b"not a jpeg"
+    truncated = _jpeg_with_metadata()[:40]
+    assert strip_jpeg_metadata(truncated) == truncated
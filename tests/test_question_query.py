@@ -0,0 +1,171 @@
+"""Advanced queries: the store-index path must agree with per-question matching."""
+
+import pandas as pd
+import pytest
+
+from models.question_query import QuerySyntaxError, compile_query, order_by_ids, parse_query
+from models.question_store import QuestionStore, group_questions
+
+QUESTIONS = [
+    # question_id, chapter, set name, magazine, qno, page, text
+    (1, "Kinematics", "Set A", "Physics For You | Jan 2020", "1", "10", "Find the roots of the velocity equation."),
+    (2, "Kinematics", "", "Physics For You | Feb 2020", "2", "12", "Newton's second law applies here."),
+    (3, "Laws of Motion", "Set B", "Physics For You | Mar 2020", "3", "15", "A block slides; state the second law."),
+    (4, "Laws of Motion", "Revision Set", "Chemistry Today | Jan 2021", "10", "20", "Velocity of the reaction front."),
+    (5, "Thermodynamics", "", "Chemistry Today | Dec 2021", "2a", "8", "Heat engines and roots of unity"),
+    (6, "Thermodynamics", "Set A", "Physics For You", "11", "x", "find THE ROOTS quickly"),
+    (7, "Optics", "Set C", "Mathematics Today | 2022", "4", "25", ""),
+]
+SET_TAGS = {"Set A": ["revision", "easy"], "Revision Set": ["revision"], "Set C": ["hard"]}
+IDS_WITH_IMAGES = {1, 4, 7}
+
+AGREEMENT_QUERIES = [
+    # text
+    'text ~ "roots"',
+    'text !~ "law"',
+    "text ^ find",
+    'text = "heat engines and roots of unity"',
+    'text ~ "second law"',
+    'text ~ "\'s"',
+    'text : "second law"',
+    "text : velo*",
+    'NOT text : "roots"',
+    # labels, including the set-name -> chapter fallback for empty set names
+    "magazine ~ physics",
+    'magazine = "physics for you | feb 2020"',
+    "magazine ^ chem",
+    'question_set = "Set A"',
+    'set ^ "kin"',
+    "set != laws",
+    'chapter = "laws of motion"',
+    "chapter !~ o",
+    # ranges and comparisons
+    "page = 10..20",
+    "page != 10..15",
+    "page >= 15",
+    "page = x",
+    "qno < 3",
+    "qno = 2",
+    "qno = 2a",
+    "qno ^ 1",
+    # editions
+    'edition = "Jan 2020".."Mar 2020"',
+    "edition >= 2021",
+    'edition < "Feb 2020"',
+    'edition != 2020',
+    # tags
+    "tag = revision",
+    "NOT tag ~ rev",
+    "tags ^ ha",
+    # images
+    "has_images",
+    "has_images = false",
+    "images != true",
+    # combinations
+    'text ~ "law" AND (magazine ~ chemistry OR NOT tag = revision)',
+    "page >= 10 AND qno ^ 1 OR has_images",
+    "NOT (edition >= 2021 OR text : roots) AND chapter ~ motion",
+    # free text
+    'roots',
+    'velo* "second law"',
+    "newton's law",
+    "the ROOTS",
+    'roots AND magazine ~ chemistry',
+    'NOT "second law" OR has_images',
+]
+
+MALFORMED_QUERIES = [
+    "text ~",
+    "(text ~ roots",
+    "text ~ roots)",
+    "colour = red",
+    "text < 3",
+    "text ~ roots magazine ~ physics",
+    'text ~ "unterminated',
+    "AND text ~ roots",
+    "page = a..b",
+    "magazine = a..b",
+    "page > abc",
+    "edition = sometime",
+    "has_images = maybe",
+    'text : "!!"',
+    "text ~ roots #",
+]
+
+
+@pytest.fixture
+def view():
+    frame = pd.DataFrame(
+        QUESTIONS, columns=["question_id", "chapter", "set_name", "magazine", "qno", "page", "text"]
+    )
+    store = QuestionStore.from_columns(
+        frame["chapter"],
+        frame["qno"],
+        frame["page"],
+        text=frame["text"],
+        question_set_name=frame["set_name"],
+        magazine=frame["magazine"],
+        question_id=frame["question_id"],
+    )
+    return store.view(range(len(store)))
+
+
+def _compile(query: str):
+    return compile_query(query, tags_for_set=lambda name: SET_TAGS.get(name, ()), ids_with_images=lambda: IDS_WITH_IMAGES)
+
+
+@pytest.mark.parametrize("query", AGREEMENT_QUERIES)
+def test_filter_agrees_with_matches(view, query):
+    compiled = _compile(query)
+    expected = [record["question_id"] for record in view if compiled.matches(record)]
+    assert [record["question_id"] for record in compiled.filter(view)] == expected
+
+
+def test_filter_sees_text_edits(view):
+    compiled = _compile('text : "roots"')
+    assert len(compiled.filter(view)) == 3
+    view[1]["text"] = "No roots here either."
+    expected = [record["question_id"] for record in view if compiled.matches(record)]
+    assert [record["question_id"] for record in compiled.filter(view)] == expected == [1, 2, 5, 6]
+
+
+def test_empty_query_compiles_to_none():
+    assert _compile("   ") is None
+
+
+@pytest.mark.parametrize("query", MALFORMED_QUERIES)
+def test_malformed_query_raises_syntax_error(query):
+    with pytest.raises(QuerySyntaxError):
+        _compile(query)
+
+
+@pytest.mark.parametrize(
+    "query, search_text",
+    [
+        ('newton "second law" velo*', 'newton "second law" velo*'),
+        ("  newton's law ", "newton's law"),
+        ("images", "images"),
+        ("tag", "tag"),
+        ("has_images", None),
+        ("text ~ roots", None),
+        ("roots AND tag = revision", None),
+    ],
+)
+def test_free_text_is_decided_by_the_parser(query, search_text):
+    assert _compile(query).search_text == search_text
+
+
+def test_bare_words_inside_a_query_search_the_text():
+    assert parse_query("images AND page > 3") == ("AND", ("TERM", "text", ":", "images"), ("TERM", "page", ">", "3"))
+    assert parse_query('NOT "second law"') == ("NOT", ("TERM", "text", ":", "second law"))
+
+
+def test_ranked_order_survives_grouping(view):
+    matches = _compile("roots").filter(view)
+    ranked = order_by_ids(matches, [6, 5, 1])
+    assert [record["question_id"] for record in ranked] == [6, 5, 1]
+    assert [record["question_id"] for record in order_by_ids(matches, [5])] == [5, 1, 6]
+
+    groups = group_questions(ranked, lambda record: record["question_set"])
+    assert list(groups) == ["Thermodynamics", "Kinematics"]
+    assert [record["question_id"] for record in groups["Thermodynamics"]] == [6, 5]
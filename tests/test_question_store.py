@@ -0,0 +1,51 @@
+"""QuestionStore edits and incremental updates, as seen by compiled queries."""
+
+import pandas as pd
+
+from models.question_query import compile_query
+from models.question_store import QuestionStore
+
+
+def _store(rows) -> QuestionStore:
+    frame = pd.DataFrame(rows, columns=["question_id", "chapter", "qno", "page", "text"])
+    return QuestionStore.from_columns(
+        frame["chapter"], frame["qno"], frame["page"], text=frame["text"], question_id=frame["question_id"]
+    )
+
+
+def _ids(query: str, view, ids_with_images=None) -> list:
+    compiled = compile_query(query, ids_with_images=ids_with_images)
+    return [record["question_id"] for record in compiled.filter(view)]
+
+
+def test_non_string_edits_reach_the_columns():
+    store = _store([(1, "Optics", "1", "10", "Lens"), (2, "Optics", "2", "12", "Mirror")])
+    view = store.view(range(len(store)))
+    assert _ids("page >= 10", view) == [1, 2]
+
+    view[0]["page"] = None
+    view[1]["qno"] = 7
+    view[1]["question_id"] = 20
+
+    assert view[0]["page"] == ""
+    assert store.extras(0) is None
+    assert _ids("page >= 10", view) == [20]
+    assert _ids("qno = 7", view) == [20]
+    assert _ids("has_images", view, ids_with_images=lambda: {20}) == [20]
+
+
+def test_extend_replaces_rows_of_known_questions():
+    store = _store([(1, "Optics", "1", "10", "Lens"), (2, "Optics", "2", "12", "Mirror")])
+    view = store.view(range(len(store)))
+    assert _ids('text : "mirror"', view) == [2]
+    view[1]["tags"] = ["old"]
+
+    handles = store.extend(_store([(2, "Waves", "2", "12", "Prism"), (3, "Waves", "3", "14", "Mirror")]))
+
+    assert handles.tolist() == [1, 2]
+    assert len(store) == 3
+    assert store.record(1).copy()["question_set"] == "Waves"
+    assert "tags" not in store.record(1)
+    view = store.view(range(len(store)))
+    assert _ids('text : "mirror"', view) == [3]
+    assert _ids('text : "prism"', view) == [2]
@@ -0,0 +1,83 @@
+"""Snapshot/restore round trips against a WAL database."""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services.snapshot_service import SnapshotService  # noqa: E402
+
+
+def _rows(db_path: Path) -> list[tuple]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT id, body FROM notes ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+
+def _make_db(tmp_path: Path) -> tuple[Path, sqlite3.Connection]:
+    db_path = tmp_path / "bank.db"
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    assert conn.execute("PRAGMA journal_mode = WAL").fetchone()[0] == "wal"
+    conn.execute("PRAGMA wal_autocheckpoint = 0")
+    conn.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+    conn.execute("BEGIN")
+    conn.executemany("INSERT INTO notes(body) VALUES (?)", [(f"note {i} " * 20,) for i in range(2000)])
+    conn.execute("COMMIT")
+    return db_path, conn
+
+
+def test_restore_chunked_snapshot_of_wal_database(tmp_path):
+    db_path, conn = _make_db(tmp_path)
+    snapshots = SnapshotService(db_path)
+    expected = _rows(db_path)
+
+    manifest = snapshots.create("before edit")
+    conn.execute("UPDATE notes SET body = 'edited' WHERE id <= 10")
+    conn.execute("DELETE FROM notes WHERE id > 1500")
+
+    snapshots.restore(manifest)
+
+    assert _rows(db_path) == expected
+    assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    snapshots.close()
+    conn.close()
+
+
+def test_incremental_snapshots_restore_their_own_state(tmp_path):
+    db_path, conn = _make_db(tmp_path)
+    snapshots = SnapshotService(db_path)
+
+    states = []
+    for step in range(3):
+        states.append((snapshots.create(f"step {step}"), _rows(db_path)))
+        conn.execute("UPDATE notes SET body = ? WHERE id % 7 = ?", (f"step {step}", step))
+        conn.executemany("INSERT INTO notes(body) VALUES (?)", [(f"extra {step}",)] * 50)
+
+    assert len({manifest for manifest, _ in states}) == len(states)
+    for manifest, expected in reversed(states):
+        snapshots.restore(manifest)
+        assert _rows(db_path) == expected
+    snapshots.close()
+    conn.close()
+
+
+def test_snapshot_after_small_edit_writes_only_changed_chunks(tmp_path):
+    db_path, conn = _make_db(tmp_path)
+    snapshots = SnapshotService(db_path, chunk_pages=4)
+    first = snapshots.create("initial")
+    conn.close()  # the snapshot service keeps the WAL alive on its own
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA wal_autocheckpoint = 0")
+    conn.execute("UPDATE notes SET body = 'edited' WHERE id = 1")
+    conn.close()
+    second = snapshots.create("edit one row")
+
+    listed = {Path(s["meta_file"]): s for s in snapshots.list()}
+    assert listed[second]["stored_bytes"] < listed[first]["stored_bytes"] / 10
+    snapshots.restore(first)
+    assert _rows(db_path)[0][1].startswith("note 0")
+    snapshots.close()
@@ -0,0 +1,61 @@
+"""WriteQueue failure handling on the writer thread."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from services.connection_manager import ConnectionManager  # noqa: E402
+from services.write_queue import WriteQueue  # noqa: E402
+
+
+def _insert(connections: ConnectionManager, body: str) -> int:
+    conn = connections.connection()
+    return conn.execute("INSERT INTO notes(body) VALUES (?)", (body,)).lastrowid
+
+
+def _bodies(connections: ConnectionManager) -> list[str]:
+    return [row[0] for row in connections.connection().execute("SELECT body FROM notes ORDER BY id")]
+
+
+def test_failing_before_batch_fails_the_batch_and_keeps_the_writer(tmp_path):
+    connections = ConnectionManager(tmp_path / "bank.db")
+    connections.connection().execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+    calls = []
+
+    def before_batch(jobs):
+        calls.append(len(jobs))
+        if len(calls) == 1:
+            raise RuntimeError("checkpoint failed")
+
+    writer = WriteQueue(connections, before_batch=before_batch)
+    try:
+        with pytest.raises(RuntimeError, match="checkpoint failed"):
+            writer.submit(_insert, connections, "lost").result(timeout=3)
+
+        assert writer.submit(_insert, connections, "kept").result(timeout=3) > 0
+        assert _bodies(connections) == ["kept"]
+        assert calls == [1, 1]
+    finally:
+        writer.close()
+        connections.close_all()
+
+
+def test_failing_job_rolls_back_only_itself(tmp_path):
+    connections = ConnectionManager(tmp_path / "bank.db")
+    connections.connection().execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT UNIQUE)")
+    writer = WriteQueue(connections)
+    try:
+        first = writer.submit(_insert, connections, "a")
+        duplicate = writer.submit(_insert, connections, "a")
+        second = writer.submit(_insert, connections, "b")
+        assert first.result(timeout=3) > 0
+        with pytest.raises(Exception):
+            duplicate.result(timeout=3)
+        assert second.result(timeout=3) > 0
+        assert _bodies(connections) == ["a", "b"]
+    finally:
+        writer.close()
+        connections.close_all()